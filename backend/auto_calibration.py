@@ -0,0 +1,134 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+# Auto-calibration runs on a copy no wider/taller than this
+CALIBRATION_SIZE = 640
+
+
+def find_wheel_circles(small, scale, fallback=False):
+    """
+    Hough circle search on a downscaled BGR frame. With `fallback`, Canny +
+    contours are tried when Hough finds nothing. Returns (samples, best) in
+    full-resolution coordinates, samples being a list of (cx, cy, r) ints.
+    """
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape
+    border = 10 * scale
+    samples = []
+    for p2 in [15, 20, 25, 30]:
+        circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, 1.2, 100 * scale, param1=50, param2=p2,
+                                   minRadius=int(h*0.1), maxRadius=int(h*0.9))
+        if circles is not None:
+            for cx, cy, r in np.around(circles[0]):
+                if border < cx < w - border and border < cy < h - border:
+                    samples.append((int(cx / scale), int(cy / scale), int(r / scale)))
+            break
+
+    if fallback and not samples:
+        edges = cv2.Canny(gray, 30, 100)
+        contours, _ = cv2.findContours(cv2.dilate(edges, np.ones((3,3), np.uint8), iterations=1),
+                                       cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for cnt in contours:
+            area = cv2.contourArea(cnt)
+            if area > (h*w)*0.05:
+                (cx, cy), r = cv2.minEnclosingCircle(cnt)
+                perimeter = cv2.arcLength(cnt, True)
+                circularity = 4 * np.pi * (area / (perimeter * perimeter)) if perimeter > 0 else 0
+                if circularity > 0.4:
+                    samples.append((int(cx / scale), int(cy / scale), int(r / scale)))
+
+    return samples, (samples[0] if samples else None)
+
+
+class AutoCalibrator:
+    """
+    Runs find_wheel_circles on a background thread so the frame loop never
+    waits on Hough. submit() hands over a downscaled copy and returns at
+    once (dropping the frame if a search is already running); finished
+    searches are published as one immutable tuple in `result`:
+    (seq, epoch, samples, best). The epoch is whatever the caller tagged
+    the frame with, so results from a stale coordinate system can be told apart.
+    With threaded=False the search runs inline, for deterministic replays.
+    shutdown() stops the worker thread; a later submit() starts a new one.
+    """
+
+    def __init__(self, threaded=True):
+        self.threaded = threaded
+        self.result = None
+        # Seconds the last published search took
+        self.last_duration = 0.0
+        self._seq = 0
+        self._job = None
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = None
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def submit(self, frame, epoch=0, fallback=False):
+        """Queue a search on a downscaled copy of `frame`. Returns False if one is already running."""
+        if self._busy:
+            return False
+        scale = min(1.0, CALIBRATION_SIZE / max(frame.shape[:2]))
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR) if scale < 1.0 else frame.copy()
+        job = (small, scale, epoch, fallback)
+
+        if not self.threaded:
+            self._run(job)
+            return True
+
+        with self._cond:
+            self._busy = True
+            self._job = job
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._worker, args=(self._stop,), daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def wait(self, timeout=None):
+        """Block until the running search (if any) has been published"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._busy, timeout)
+
+    def shutdown(self, timeout=None):
+        """Drop any queued search, wake the worker and join it once the running search (if any) is done"""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._stop.set()
+            if self._job is not None:
+                self._job = None
+                self._busy = False
+            self._cond.notify_all()
+        thread.join(timeout)
+
+    def _run(self, job):
+        small, scale, epoch, fallback = job
+        start = time.perf_counter()
+        samples, best = find_wheel_circles(small, scale, fallback)
+        self.last_duration = time.perf_counter() - start
+        self._seq += 1
+        self.result = (self._seq, epoch, samples, best)
+
+    def _worker(self, stop):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._job is not None or stop.is_set())
+                if stop.is_set():
+                    return
+                job, self._job = self._job, None
+            try:
+                self._run(job)
+            except Exception as e:
+                print(f"[CALIBRATION] Auto-calibration failed: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
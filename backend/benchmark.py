@@ -0,0 +1,254 @@
+import sys
+import os
+import gc
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import Mock, patch
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_wheel import spin_frame
+
+RESOLUTIONS = [(1920, 1080), (2560, 1440)]
+
+
+def make_tracker(width, height):
+    """Tracker with the screen grabber stubbed out, calibrated on a centered wheel"""
+    with patch('main.mss.mss') as mock_mss:
+        monitor = {'top': 0, 'left': 0, 'width': width, 'height': height}
+        mock_mss_instance = Mock()
+        mock_mss_instance.monitors = [None, monitor]
+        mock_mss.return_value = mock_mss_instance
+
+        from main import ProfessionalRouletteTracker
+        tracker = ProfessionalRouletteTracker()
+        tracker.monitor = monitor
+
+    tracker.calibration_path = os.path.join(tempfile.gettempdir(), 'roulette_benchmark_calibration.npz')
+    tracker.calibrated = True
+    tracker.center = (width // 2, height // 2)
+    tracker.radius = int(height * 0.3)
+    return tracker
+
+
+def wheel_frame(i, width, height, size=0.3):
+    """Synthetic spin frame (wheel radius size * height), plus clutter outside the ring"""
+    return spin_frame(i, width, height, int(height * size), clutter=i % 2)
+
+
+def benchmark(width, height, frames=200, **settings):
+    """
+    Mean process_frame time in ms for a calibrated tracker at the given
+    resolution, and the fraction of timed frames where the ball was found.
+    """
+    tracker = make_tracker(width, height)
+    for name, value in settings.items():
+        setattr(tracker, name, value)
+    clips = [wheel_frame(i, width, height) for i in range(60)]
+
+    for i in range(20):
+        tracker.process_frame(clips[i % len(clips)], 1 / 60)
+    found = 0
+    start = time.perf_counter()
+    for i in range(frames):
+        found += tracker.process_frame(clips[i % len(clips)], 1 / 60)['ball_found']
+    return (time.perf_counter() - start) / frames * 1000, found / frames
+
+
+class FakeScreenshot:
+    """Stands in for an mss ScreenShot: a BGRA bytearray plus its size"""
+
+    def __init__(self, frame):
+        self.height, self.width = frame.shape[:2]
+        self.raw = bytearray(cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA).tobytes())
+
+
+def frame_path(width, height, frames=100):
+    """
+    Bytes allocated per frame by the grab -> BGR -> warp path, the old way
+    (np.array copy, cvtColor to a new image, warp, warped_frame copy) and
+    through the tracker's grabber and preprocess_frame (recycled buffers).
+    """
+    tracker = make_tracker(width, height)
+    tracker.M = cv2.getPerspectiveTransform(
+        np.float32([[width / 2, 0], [width, height / 2], [width / 2, height], [0, height / 2]]),
+        np.float32([[250, 0], [500, 250], [250, 500], [0, 250]]))
+    shot = FakeScreenshot(wheel_frame(0, width, height))
+
+    def old_path():
+        img = np.array(np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4))
+        frame = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        warped = cv2.warpPerspective(frame, tracker.M, (500, 500))
+        return warped.copy()
+
+    with patch('main.mss.mss') as mock_mss:
+        mock_mss.return_value.grab.return_value = shot
+        grab = tracker.frame_grabber()
+        buffer = [None]
+
+        def new_path():
+            buffer[0], _ = grab(buffer[0])
+            return tracker.preprocess_frame(buffer[0])
+
+        results = {}
+        for name, path in [('old', old_path), ('new', new_path)]:
+            path()
+            tracemalloc.start()
+            start = time.perf_counter()
+            for _ in range(frames):
+                path()
+            elapsed = (time.perf_counter() - start) / frames * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = (elapsed, peak)
+    return results
+
+
+def warp_timing(width, height, frames=300):
+    """(median, p99) ms of cv2.warpPerspective vs the tracker's cached remap tables"""
+    tracker = make_tracker(width, height)
+    tracker.set_calibration_points([[width / 2, height * 0.1], [width * 0.8, height / 2],
+                                    [width / 2, height * 0.9], [width * 0.2, height / 2]])
+    frame = wheel_frame(0, width, height)
+    results = {}
+    for name, warp in [('warpPerspective', lambda: cv2.warpPerspective(frame, tracker.M, (500, 500))),
+                       ('remap', lambda: tracker.preprocess_frame(frame))]:
+        times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            warp()
+            times.append((time.perf_counter() - start) * 1000)
+        results[name] = (np.median(times), np.percentile(times, 99))
+    return results
+
+
+def warp_mode_timing(width, height, frames=200, size=0.3):
+    """
+    Mean process_frame ms and ball-found rate on a perspective-calibrated
+    tracker: warping every frame vs mapping only centroids
+    """
+    clips = [wheel_frame(i, width, height, size) for i in range(60)]
+    r = height * size
+    results = {}
+    for mode in ['frame', 'points']:
+        tracker = make_tracker(width, height)
+        tracker.warp_mode = mode
+        tracker.set_calibration_points([[width / 2, height / 2 - r], [width / 2 + r, height / 2],
+                                        [width / 2, height / 2 + r], [width / 2 - r, height / 2]])
+        for i in range(20):
+            tracker.process_frame(clips[i % len(clips)], 1 / 60)
+        found = 0
+        start = time.perf_counter()
+        for i in range(frames):
+            found += tracker.process_frame(clips[i % len(clips)], 1 / 60)['ball_found']
+        results[mode] = ((time.perf_counter() - start) / frames * 1000, found / frames)
+    return results
+
+
+def allocations(width, height, frames=1000):
+    """
+    GC churn of process_frame: generation-0 collections per 1000 frames,
+    and memory blocks/bytes still held per frame by keeping the results
+    """
+    tracker = make_tracker(width, height)
+    clips = [wheel_frame(i, width, height) for i in range(60)]
+    for i in range(30):
+        tracker.process_frame(clips[i % len(clips)], 1 / 60)
+
+    collections = [0]
+    def count(phase, info):
+        if phase == 'start' and info['generation'] == 0:
+            collections[0] += 1
+    gc.callbacks.append(count)
+    try:
+        for i in range(frames):
+            tracker.process_frame(clips[i % len(clips)], 1 / 60)
+    finally:
+        gc.callbacks.remove(count)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [tracker.process_frame(clips[i % len(clips)], 1 / 60) for i in range(200)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = [d for d in after.compare_to(before, 'filename') if 'tracemalloc' not in d.traceback[0].filename]
+    return (collections[0] * 1000 / frames, sum(d.count_diff for d in diff) / len(kept),
+            sum(d.size_diff for d in diff) / len(kept))
+
+
+def stage_timing(width, height, frames=500):
+    """Mean process_frame ms with stage timers off and on, and the per-stage summary"""
+    clips = [wheel_frame(i, width, height) for i in range(60)]
+    results = {}
+    for enabled in [False, True]:
+        tracker = make_tracker(width, height)
+        tracker.timers.enabled = enabled
+        for i in range(20):
+            tracker.process_frame(clips[i % len(clips)], 1 / 60)
+        tracker.timers.reset()
+        start = time.perf_counter()
+        for i in range(frames):
+            tracker.process_frame(clips[i % len(clips)], 1 / 60)
+        results[enabled] = (time.perf_counter() - start) / frames * 1000
+    return results[False], results[True], tracker.timers
+
+
+def prediction_timing(states=((0.05, 0.2), (0.1, 0.5), (0.02, 1.0), (0.1, 1.5)), noise=(0.003, 0.01), rounds=200):
+    """Median ms of the stepwise predict loop vs a default predict_distribution batch, per (wheel, ball) speed"""
+    from physics import simulate_stepwise, predict_distribution
+
+    results = {}
+    for sw, sb in states:
+        times = {'stepwise': [], 'batch': []}
+        for _ in range(rounds):
+            for name, run in [('stepwise', lambda: simulate_stepwise(sw, sb)),
+                              ('batch', lambda: predict_distribution(sw, sb, 0.0, 0.0, *noise))]:
+                start = time.perf_counter()
+                run()
+                times[name].append((time.perf_counter() - start) * 1000)
+        results[(sw, sb)] = (np.median(times['stepwise']), np.median(times['batch']))
+    return results
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for (sw, sb), (stepwise, batch) in prediction_timing().items():
+        print(f"[BENCH] prediction at wheel {sw} / ball {sb} rad/frame: stepwise {stepwise:.3f} ms, "
+              f"default batch {batch:.3f} ms")
+
+    for width, height in RESOLUTIONS:
+        full, _ = benchmark(width, height, frames, annulus_masking=False)
+        masked, _ = benchmark(width, height, frames, annulus_masking=True)
+        print(f"[BENCH] {width}x{height}: full frame {full:.2f} ms, annulus {masked:.2f} ms ({full / masked:.2f}x)")
+
+        for detector in ['mog2', 'strip']:
+            ms, rate = benchmark(width, height, frames, ball_detector=detector)
+            print(f"[BENCH] {width}x{height}: ball detector {detector}: {ms:.2f} ms, ball found in {rate:.0%} of frames")
+
+        # Bytes copied per frame on the capture path: np.array(4wh) + cvtColor(3wh) + warped copy before,
+        # a single BGRA -> BGR conversion (3wh) into a recycled buffer now
+        before, after = width * height * 7 + 500 * 500 * 3, width * height * 3
+        paths = frame_path(width, height, frames)
+        print(f"[BENCH] {width}x{height}: frame path copies {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB per frame, "
+              f"peak allocation {paths['old'][1] / 1e6:.2f} MB -> {paths['new'][1] / 1e6:.2f} MB, "
+              f"{paths['old'][0]:.2f} ms -> {paths['new'][0]:.2f} ms")
+
+        warps = warp_timing(width, height)
+        print(f"[BENCH] {width}x{height}: warp median/p99 warpPerspective {warps['warpPerspective'][0]:.2f}/{warps['warpPerspective'][1]:.2f} ms, "
+              f"remap {warps['remap'][0]:.2f}/{warps['remap'][1]:.2f} ms")
+
+        for size in [0.1, 0.2, 0.3]:
+            modes = warp_mode_timing(width, height, frames, size)
+            print(f"[BENCH] {width}x{height}: wheel radius {int(height * size)} px, warp every frame {modes['frame'][0]:.2f} ms "
+                  f"(ball {modes['frame'][1]:.0%}), map centroids only {modes['points'][0]:.2f} ms (ball {modes['points'][1]:.0%})")
+
+        per_1000, blocks, size = allocations(width, height)
+        print(f"[BENCH] {width}x{height}: {per_1000:.0f} gen-0 collections per 1000 frames, "
+              f"{blocks:.1f} blocks / {size:.0f} bytes held per kept result")
+
+        off, on, timers = stage_timing(width, height, frames)
+        print(f"[BENCH] {width}x{height}: stage timers off {off:.3f} ms, on {on:.3f} ms per frame")
+        print(timers.report())
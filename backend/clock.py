@@ -0,0 +1,27 @@
+import time
+
+
+def wall_clock():
+    """Seconds since the epoch, for live capture"""
+    return time.time()
+
+
+class FrameClock:
+    """
+    Clock driven by frame timestamps instead of the wall: calling it returns
+    the timestamp of the frame being processed, set by whoever feeds the
+    frames (e.g. the video position in a replay). Spin timing then follows
+    the footage, however fast it is processed.
+    """
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def set(self, timestamp):
+        self.time = timestamp
+
+    def advance(self, dt):
+        self.time += dt
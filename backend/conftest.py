@@ -0,0 +1,40 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def monitor_size(request):
+    """(width, height) of the mocked screen; parametrize indirectly or override per module"""
+    return getattr(request, 'param', (1920, 1080))
+
+
+@pytest.fixture
+def make_tracker(tmp_path):
+    """
+    Factory for trackers on a mocked mss monitor of (width, height), with no
+    lookup table and a throwaway calibration file; `sct` is the mss mock
+    """
+    def make(width=1920, height=1080):
+        with patch('main.mss.mss') as mock_mss:
+            mock_monitor = {'top': 0, 'left': 0, 'width': width, 'height': height}
+            mock_mss_instance = Mock()
+            mock_mss_instance.monitors = [None, mock_monitor]
+            mock_mss.return_value = mock_mss_instance
+
+            from main import ProfessionalRouletteTracker
+            t = ProfessionalRouletteTracker()
+            t.monitor = mock_monitor
+            t.prediction_table = None
+            t.calibration_path = str(tmp_path / 'calibration.npz')
+            return t
+
+    return make
+
+
+@pytest.fixture
+def tracker(make_tracker, monitor_size):
+    return make_tracker(*monitor_size)
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+
+# Grab cadence of the capture thread
+CAPTURE_FPS = 60
+# Frames buffered between capture and processing
+CAPTURE_QUEUE_SIZE = 2
+
+
+class FrameCapture:
+    """
+    Capture thread feeding a bounded frame queue, so slow processing never
+    delays the next grab. `grab(out)` is called on the capture thread and
+    returns (frame, tag) or None. It should write into `out`, a recycled
+    frame buffer (None or possibly the wrong size at first), and return it;
+    otherwise it returns a new array, which joins the pool. Every frame is
+    queued as (seq, timestamp, frame, tag) with a time.monotonic() timestamp
+    taken right after the grab.
+
+    Buffers are recycled, so a frame from get() stays valid only until the
+    next get() call; copy anything that has to live longer. At most
+    capacity + 2 buffers exist: the queued frames, the one being processed
+    and the one being grabbed into.
+
+    When the queue is full, drop_policy 'oldest' evicts the oldest queued
+    frame and 'newest' discards the frame just grabbed. get() returns the
+    newest frame and discards the older ones by default, or with
+    latest=False the oldest one. Every frame that is never handed out counts
+    as dropped.
+
+    With `timers` (a StageTimers) enabled, each grab is timed as 'capture'.
+    """
+
+    def __init__(self, grab, capacity=CAPTURE_QUEUE_SIZE, drop_policy='oldest', fps=CAPTURE_FPS, timers=None):
+        if drop_policy not in ('oldest', 'newest'):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.grab = grab
+        self.capacity = max(1, capacity)
+        self.drop_policy = drop_policy
+        self.interval = 1.0 / fps if fps else 0.0
+        self.timers = timers
+
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.errors = 0
+
+        self._queue = deque()
+        self._free = []
+        self._held = None
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name='frame-capture', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get(self, timeout=None, latest=True):
+        """Next frame to process as (seq, timestamp, frame, tag), or None on timeout/stop"""
+        with self._cond:
+            # The previous frame is done with: recycle its buffer
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+            if not self._cond.wait_for(lambda: self._queue or not self._running, timeout):
+                return None
+            if not self._queue:
+                return None
+            if latest:
+                packet = self._queue.pop()
+                self.dropped += len(self._queue)
+                self._free.extend(p[2] for p in self._queue)
+                self._queue.clear()
+            else:
+                packet = self._queue.popleft()
+            self.processed += 1
+            self._held = packet[2]
+            return packet
+
+    def stats(self):
+        return {'captured': self.captured, 'dropped': self.dropped, 'processed': self.processed,
+                'queued': len(self._queue), 'errors': self.errors}
+
+    def _put(self, frame, tag, timestamp):
+        with self._cond:
+            self.captured += 1
+            packet = (self.captured, timestamp, frame, tag)
+            if len(self._queue) >= self.capacity:
+                self.dropped += 1
+                if self.drop_policy == 'newest':
+                    self._free.append(frame)
+                    return
+                self._free.append(self._queue.popleft()[2])
+            self._queue.append(packet)
+            self._cond.notify_all()
+
+    def _loop(self):
+        next_grab = time.monotonic()
+        while self._running:
+            with self._cond:
+                out = self._free.pop() if self._free else None
+            try:
+                start = time.perf_counter()
+                grabbed = self.grab(out)
+                timestamp = time.monotonic()
+                if self.timers is not None and self.timers.enabled:
+                    self.timers.record('capture', time.perf_counter() - start)
+                if grabbed is not None:
+                    self._put(grabbed[0], grabbed[1], timestamp)
+                elif out is not None:
+                    with self._cond:
+                        self._free.append(out)
+            except Exception as e:
+                # The buffer goes back to the pool even when the grab failed with it
+                if out is not None:
+                    with self._cond:
+                        self._free.append(out)
+                self.errors += 1
+                if self.errors % 100 == 1:
+                    print(f"[CAPTURE] Grab failed: {e}")
+                time.sleep(0.1)
+
+            # Fixed cadence: schedule against the previous slot, not the end of this grab
+            next_grab += self.interval
+            delay = next_grab - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_grab = time.monotonic()
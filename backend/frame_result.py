@@ -0,0 +1,82 @@
+class FrameResult:
+    """
+    What process_frame found in one frame. Slotted and built from plain
+    attributes, so a frame costs one small object instead of a dict of
+    tuples and converted lists; coordinates are in full-source pixels,
+    None when not found, and pocket_probabilities stays the tracker's
+    (38,) array. to_dict() gives the JSON-ready dict process_frame used to
+    return, and result['key'] / result.get('key') still work.
+
+    Frames from a capture also carry the capture's sequence number and
+    time.monotonic() timestamp, the capture-to-result latency in seconds
+    and whether processing overran the frame budget; seq, capture_time
+    and latency are None when the caller did not say when the frame was
+    grabbed.
+    """
+
+    __slots__ = ('ball_x', 'ball_y', 'zero_x', 'zero_y', 'confidence', 'prediction', 'wheel_rpm', 'ball_rpm',
+                 'is_spinning', 'spin_finished', 'pocket_probabilities', 'ball_found', 'wheel_found',
+                 'seq', 'capture_time', 'latency', 'over_budget')
+
+    KEYS = ('ball_coords', 'zero_coords', 'confidence', 'prediction', 'wheel_rpm', 'ball_rpm', 'is_spinning',
+            'spin_finished', 'pocket_probabilities', 'ball_found', 'wheel_found', 'seq', 'capture_time', 'latency',
+            'over_budget')
+
+    def __init__(self, ball_x, ball_y, zero_x, zero_y, confidence, prediction, wheel_rpm, ball_rpm,
+                 is_spinning, spin_finished, pocket_probabilities, ball_found, wheel_found,
+                 seq=None, capture_time=None, latency=None, over_budget=False):
+        self.ball_x = ball_x
+        self.ball_y = ball_y
+        self.zero_x = zero_x
+        self.zero_y = zero_y
+        self.confidence = confidence
+        self.prediction = prediction
+        self.wheel_rpm = wheel_rpm
+        self.ball_rpm = ball_rpm
+        self.is_spinning = is_spinning
+        self.spin_finished = spin_finished
+        self.pocket_probabilities = pocket_probabilities
+        self.ball_found = ball_found
+        self.wheel_found = wheel_found
+        self.seq = seq
+        self.capture_time = capture_time
+        self.latency = latency
+        self.over_budget = over_budget
+
+    @property
+    def ball_coords(self):
+        return (self.ball_x, self.ball_y)
+
+    @property
+    def zero_coords(self):
+        return (self.zero_x, self.zero_y)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        if key == 'pocket_probabilities':
+            return self.pocket_probabilities.tolist() if self.pocket_probabilities is not None else None
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def to_dict(self):
+        probabilities = self.pocket_probabilities
+        return {
+            'ball_coords': (self.ball_x, self.ball_y),
+            'zero_coords': (self.zero_x, self.zero_y),
+            'confidence': float(self.confidence),
+            'prediction': int(self.prediction),
+            'wheel_rpm': float(self.wheel_rpm),
+            'ball_rpm': float(self.ball_rpm),
+            'is_spinning': self.is_spinning,
+            'spin_finished': self.spin_finished,
+            'pocket_probabilities': probabilities.tolist() if probabilities is not None else None,
+            'ball_found': self.ball_found,
+            'wheel_found': self.wheel_found,
+            'seq': self.seq,
+            'capture_time': self.capture_time,
+            'latency': self.latency,
+            'over_budget': self.over_budget
+        }
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+try:
+    from .physics import (WHEEL_FRICTION, BALL_FRICTION, GRAVITY, MAX_STEPS, START_DIST, MIN_DIST,
+                          LOCK_DIST, LOCK_SPEED_DIFF, CENTRIFUGAL, lock_offsets)
+except ImportError:
+    from physics import (WHEEL_FRICTION, BALL_FRICTION, GRAVITY, MAX_STEPS, START_DIST, MIN_DIST,
+                         LOCK_DIST, LOCK_SPEED_DIFF, CENTRIFUGAL, lock_offsets)
+
+# Speed ranges covered by the table (rad/frame). Ball 1.2 rad/frame is ~690 RPM at 60fps.
+TABLE_WHEEL_MAX = 0.4
+TABLE_BALL_MAX = 1.2
+TABLE_SHAPE = (401, 1201)
+
+# Interpolated offsets agree with the closed-form engine to within this many radians.
+# Cells where the lock step jumps between branches fail this check at build time
+# and are answered by the closed-form engine instead.
+TABLE_TOLERANCE = 2 * LOCK_SPEED_DIFF
+
+DEFAULT_TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lut')
+
+
+def table_key():
+    """Hash of every constant the table depends on; a new key forces a rebuild"""
+    params = (WHEEL_FRICTION, BALL_FRICTION, GRAVITY, MAX_STEPS, START_DIST, MIN_DIST, LOCK_DIST,
+              LOCK_SPEED_DIFF, CENTRIFUGAL, TABLE_WHEEL_MAX, TABLE_BALL_MAX, TABLE_SHAPE)
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+
+
+def table_path(directory=None):
+    return os.path.join(directory or DEFAULT_TABLE_DIR, f'predict_lut_{table_key()}.npy')
+
+
+def build_table():
+    """
+    Fill the (wheel_speed, ball_speed) grid with the final relative angle offset.
+    Returns a float64 array of shape (2, *TABLE_SHAPE): [0] holds the offsets at
+    the grid nodes, [1] flags (1.0) cells whose centre interpolates to within
+    TABLE_TOLERANCE of the exact value.
+    """
+    wheel = np.linspace(0, TABLE_WHEEL_MAX, TABLE_SHAPE[0])
+    ball = np.linspace(0, TABLE_BALL_MAX, TABLE_SHAPE[1])
+    w_grid, b_grid = np.meshgrid(wheel, ball, indexing='ij')
+
+    table = np.zeros((2,) + TABLE_SHAPE)
+    offsets = table[0]
+    offsets[:] = lock_offsets(w_grid, b_grid)
+
+    centres = lock_offsets(w_grid[:-1, :-1] + wheel[1] / 2, b_grid[:-1, :-1] + ball[1] / 2)
+    bilinear = (offsets[:-1, :-1] + offsets[1:, :-1] + offsets[:-1, 1:] + offsets[1:, 1:]) / 4
+    table[1, :-1, :-1] = np.abs(centres - bilinear) < TABLE_TOLERANCE
+    return table
+
+
+def save_table(table, path):
+    """Write atomically so concurrent trackers never map a half-written file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, table)
+        os.replace(tmp_path, path)
+    except:
+        os.unlink(tmp_path)
+        raise
+
+
+class PredictionTable:
+    """
+    Memory-mapped lookup table answering the lock offset by bilinear interpolation.
+    Every tracker process that opens the same file shares its pages.
+    """
+
+    def __init__(self, table):
+        self.offsets = table[0]
+        self.smooth = table[1]
+        self.wheel_step = TABLE_WHEEL_MAX / (TABLE_SHAPE[0] - 1)
+        self.ball_step = TABLE_BALL_MAX / (TABLE_SHAPE[1] - 1)
+
+    @classmethod
+    def open(cls, directory=None, build=False):
+        """Map the table for the current constants. Builds it first if `build` is set, else returns None when missing."""
+        path = table_path(directory)
+        if not os.path.exists(path):
+            if not build:
+                return None
+            print(f"[LUT] Building prediction table {TABLE_SHAPE[0]}x{TABLE_SHAPE[1]}...")
+            save_table(build_table(), path)
+            print(f"[LUT] Saved to {path}")
+        # Plain ndarray view of the mapping: element access skips the np.memmap wrapper
+        return cls(np.asarray(np.load(path, mmap_mode='r')))
+
+    def relative_offset(self, w_speed, b_speed):
+        """
+        Interpolated ball-minus-wheel travel until lock, in radians.
+        Returns None outside the table or in cells flagged as not interpolable.
+        """
+        fw = abs(w_speed) / self.wheel_step
+        fb = abs(b_speed) / self.ball_step
+        i, j = int(fw), int(fb)
+        if i >= TABLE_SHAPE[0] - 1 or j >= TABLE_SHAPE[1] - 1 or not self.smooth.item(i, j):
+            return None
+
+        u, v = fw - i, fb - j
+        offsets = self.offsets
+        return ((offsets.item(i, j) * (1 - u) + offsets.item(i + 1, j) * u) * (1 - v) +
+                (offsets.item(i, j + 1) * (1 - u) + offsets.item(i + 1, j + 1) * u) * v)
+
+
+if __name__ == "__main__":
+    path = table_path()
+    if os.path.exists(path):
+        print(f"[LUT] Table already up to date: {path}")
+    else:
+        PredictionTable.open(build=True)
@@ -3,7 +3,15 @@ import numpy as np
 import mss
 import time
 import os
+import sys
 import platform
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
+import socketio
 
 try:
     if platform.system() == 'Darwin':
@@ -19,22 +27,74 @@ except:
     APPKIT_AVAILABLE = False
     print("Warning: Window selection not available on this platform")
 try:
-    import pytesseract
-    TESSERACT_AVAILABLE = True
+    from .physics import POCKETS, WHEEL_FRICTION, BALL_FRICTION, GRAVITY, final_relative_angle, pocket_from_angle, predict_distribution, DISTRIBUTION_SAMPLES
+    from .lookup import PredictionTable
+    from .track_strip import TrackStripDetector
+    from .auto_calibration import AutoCalibrator
+    from .result_reader import TESSERACT_AVAILABLE, DEBUG_OUTPUT_DIR, ResultReader, read_pocket_number
+    from .pocket_templates import PocketTemplateBank, DEFAULT_CALIBRATION_PATH, save_calibration, load_template_bank
+    from .frame_capture import FrameCapture, CAPTURE_QUEUE_SIZE, CAPTURE_FPS
+    from .ring_buffer import RingBuffer
+    from .frame_result import FrameResult
+    from .clock import wall_clock
+    from .stage_timers import StageTimers
+    from .metrics import TrackerMetrics, MetricsServer
+    from .telemetry import TelemetryHub
 except ImportError:
-    TESSERACT_AVAILABLE = False
-    print("Warning: pytesseract not available")
+    from physics import POCKETS, WHEEL_FRICTION, BALL_FRICTION, GRAVITY, final_relative_angle, pocket_from_angle, predict_distribution, DISTRIBUTION_SAMPLES
+    from lookup import PredictionTable
+    from track_strip import TrackStripDetector
+    from auto_calibration import AutoCalibrator
+    from result_reader import TESSERACT_AVAILABLE, DEBUG_OUTPUT_DIR, ResultReader, read_pocket_number
+    from pocket_templates import PocketTemplateBank, DEFAULT_CALIBRATION_PATH, save_calibration, load_template_bank
+    from frame_capture import FrameCapture, CAPTURE_QUEUE_SIZE, CAPTURE_FPS
+    from ring_buffer import RingBuffer
+    from frame_result import FrameResult
+    from clock import wall_clock
+    from stage_timers import StageTimers
+    from metrics import TrackerMetrics, MetricsServer
+    from telemetry import TelemetryHub
+
+# Capture region: wheel bounding box grown by this fraction of its size on each side
+CAPTURE_MARGIN = 0.15
+# Auto-calibration samples further than this fraction of the radius from the
+# locked center count as drift and widen the capture region
+CAPTURE_DRIFT = 0.1
+# Ring around the calibrated center (in radii) where the ball and zero marker can be
+RING_INNER, RING_OUTER = 0.3, 1.8
+def screenshot_view(shot):
+    """(h, w, 4) BGRA view of an mss screenshot's buffer, without copying it"""
+    raw = getattr(shot, 'raw', None)
+    if raw is None:
+        return np.asarray(shot)
+    return np.frombuffer(raw, np.uint8).reshape(shot.height, shot.width, 4)
 
 
-POCKETS = [0, 28, 9, 26, 30, 11, 7, 20, 32, 17, 5, 22, 34, 15, 3, 24, 36, 13, 1, 37, 27, 10, 25, 29, 12, 8, 19, 31, 18, 6, 21, 33, 16, 4, 23, 35, 14, 2]
-WHEEL_FRICTION, BALL_FRICTION, GRAVITY = 0.9985, 0.996, 0.012
-
 class ProfessionalRouletteTracker:
-    def __init__(self):
-        self.sct = mss.mss()
+    # Every attribute is declared: no per-instance __dict__, and a typo'd assignment fails loudly
+    __slots__ = (
+        'sct', 'selected_window', 'window_rect', 'monitor', 'center', 'radius', 'center_samples', 'calibrated',
+        'calibration_points', 'M', 'capture_roi', 'capture_offset', 'capture_margin', 'last_wheel_circle',
+        'auto_calibrator', 'calibration_epoch', '_calibration_seq', 'result_reader', 'pending_result',
+        'template_bank', 'calibration_path', 'persist_calibration', 'capture_queue_size', 'capture_drop_policy', 'frame_capture',
+        'annulus_masking', '_ring', '_ring_key', 'ball_detector', 'track_strip', 'backSub', 'state',
+        'last_ball_angle', 'last_wheel_angle', 'wheel_speed', 'ball_speed', 'wheel_speed_var', 'ball_speed_var',
+        'pocket_probabilities', 'prediction_table', 'predicted_ball_angle', 'missed_ball_frames',
+        'prediction_buffer', 'last_frame_time', 'frame_count', 'ball_drop_detected', 'last_prediction_time',
+        'spin_start_time', 'final_prediction', 'prediction_made', 'actual_result', 'settling_start_time',
+        'settling_frames', 'final_ball_angle', 'final_wheel_angle', 'settling_ball_positions', 'prev_gray',
+        'confidence_score', 'detection_history', 'ball_path', 'ball_history', '_history_center',
+        'frames_without_ball', 'debug_mode', 'warped_frame', '_warp_buffer', '_warp_maps', '_warp_maps_for',
+        'warp_mode', '_area_scale', 'clock', 'timers', 'metrics',
+        'frame_budget', 'frames_over_budget', 'frame_latency', 'telemetry', 'running', 'pending_source',
+    )
+
+    def __init__(self, monitor=None):
+        # Screen capture is only opened for live use; headless replays pass their frame size as `monitor`
+        self.sct = mss.mss() if monitor is None else None
         self.selected_window = None
         self.window_rect = None
-        self.monitor = self.sct.monitors[1]
+        self.monitor = self.sct.monitors[1] if monitor is None else monitor
 
         self.center = (self.monitor["width"] // 2, self.monitor["height"] // 2)
         self.radius = 300
@@ -43,6 +103,45 @@ class ProfessionalRouletteTracker:
         self.calibration_points = []
         self.M = None
 
+        # Sub-rectangle (x, y, w, h) of the window/monitor actually grabbed once
+        # calibration has locked; None grabs the whole source
+        self.capture_roi = None
+        self.capture_offset = (0, 0)
+        self.capture_margin = CAPTURE_MARGIN
+        self.last_wheel_circle = None
+
+        # Hough auto-calibration runs off the frame thread. Results are tagged with the
+        # epoch of the coordinate system they were found in; it bumps on every region change.
+        self.auto_calibrator = AutoCalibrator()
+        self.calibration_epoch = 0
+        self._calibration_seq = 0
+
+        # Winning-number OCR runs in a worker process; (future, angle fallback) while a read is pending
+        self.result_reader = ResultReader()
+        self.pending_result = None
+
+        # Pocket number templates cut from the warped wheel; saved with the calibration
+        self.template_bank = None
+        self.calibration_path = DEFAULT_CALIBRATION_PATH
+        # Calibration is only written to calibration_path when asked: the interactive
+        # calibration saves it and sets this, so templates built later are saved too
+        self.persist_calibration = False
+
+        # Capture thread -> bounded queue -> run(); see FrameCapture for the drop policies
+        self.capture_queue_size = CAPTURE_QUEUE_SIZE
+        self.capture_drop_policy = 'oldest'
+        self.frame_capture = None
+
+        # Detection only looks inside the calibrated ring; the mask is cached per calibration
+        self.annulus_masking = True
+        self._ring = None
+        self._ring_key = None
+
+        # Ball detection engine: 'mog2' (contours on a foreground mask) or 'strip'
+        # (1-D peak on the polar-unwrapped ball track, needs calibration)
+        self.ball_detector = 'mog2'
+        self.track_strip = TrackStripDetector()
+
         self.backSub = cv2.createBackgroundSubtractorMOG2(history=20, varThreshold=40, detectShadows=False)
 
         self.state = "IDLE"
@@ -50,13 +149,21 @@ class ProfessionalRouletteTracker:
         self.last_wheel_angle = None
         self.wheel_speed = 0
         self.ball_speed = 0
+        # Exponentially weighted variance of the per-frame speed samples
+        self.wheel_speed_var = 0.0
+        self.ball_speed_var = 0.0
+        self.pocket_probabilities = None
+        # Shared memory-mapped (wheel_speed, ball_speed) -> offset table, if one has been built
+        self.prediction_table = PredictionTable.open()
 
         # Predictive tracking
         self.predicted_ball_angle = None
         self.missed_ball_frames = 0
 
         self.prediction_buffer = []
-        self.last_frame_time = time.time()
+        # Everything the spin state machine times comes from this; replays swap in a FrameClock
+        self.clock = wall_clock
+        self.last_frame_time = self.clock()
         self.frame_count = 0
         self.ball_drop_detected = False
         self.last_prediction_time = 0
@@ -68,15 +175,45 @@ class ProfessionalRouletteTracker:
         self.settling_frames = 0
         self.final_ball_angle = None
         self.final_wheel_angle = None
-        self.settling_ball_positions = []
+        # Fixed-size histories with running statistics (see ring_buffer.py)
+        self.settling_ball_positions = RingBuffer(10)
         self.prev_gray = None
         self.confidence_score = 0.0
-        self.detection_history = []
-        self.ball_path = []
-        self.ball_history = []
+        self.detection_history = RingBuffer(60)
+        # (angle, distance, wrapped angle step from the previous entry)
+        self.ball_path = RingBuffer(5, 3)
+        # (x, y, angle, radius, step, turn): see add_history_point
+        self.ball_history = RingBuffer(30, 6)
+        self._history_center = None
         self.frames_without_ball = 0
         self.debug_mode = False
         self.warped_frame = None
+        self._warp_buffer = None
+        self._warp_maps = None
+        self._warp_maps_for = None
+
+        # With a homography: 'frame' warps every frame before detection, 'points' detects on
+        # the raw frame inside the wheel's preimage and maps only the centroids through M,
+        # 'auto' picks 'points' when that preimage is smaller than the flat view
+        self.warp_mode = 'auto'
+        self._area_scale = 1.0
+
+        # Per-stage latency of the frame loop; off until enabled (see StageTimers)
+        self.timers = StageTimers()
+        # TrackerMetrics fed by run() when a metrics endpoint is served
+        self.metrics = None
+
+        # Frames whose process_frame takes longer than this (seconds) are flagged over_budget
+        self.frame_budget = 1.0 / CAPTURE_FPS
+        self.frames_over_budget = 0
+        # Capture-to-result and capture-to-display latency of captured frames, always on
+        self.frame_latency = StageTimers(enabled=True)
+
+        # TelemetryHub that run() publishes every result to when the server is up
+        self.telemetry = None
+        self.running = False
+        # (window rect, title) picked through the API, switched to by run() between frames
+        self.pending_source = None
 
     def calibrate_perspective(self, frame):
         """
@@ -151,11 +288,14 @@ class ProfessionalRouletteTracker:
         M = cv2.getPerspectiveTransform(src_pts, dst_pts)
 
         # Update tracker state
+        self.capture_roi, self.capture_offset = None, (0, 0)
         self.M = M
         self.calibrated = True
         self.center = (250, 250)
         self.radius = 240
         self.calibration_points = src_pts
+        self.update_warp_maps()
+        self.load_saved_templates()
 
         print(f"\n[CALIBRATION] ✓ Perspective transform matrix calculated!")
         print(f"[CALIBRATION] Center: {self.center}, Radius: {self.radius}")
@@ -243,6 +383,8 @@ class ProfessionalRouletteTracker:
         else:
             print(f"[DEBUG] Capturing full screen: {sct_grab_params}")
 
+        if self.sct is None:
+            self.sct = mss.mss()
         sct_img = self.sct.grab(sct_grab_params)
         img = np.array(sct_img)
         frame = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
@@ -301,6 +443,8 @@ class ProfessionalRouletteTracker:
         M = self.calibrate_perspective(frame)
 
         if M is not None:
+            self.persist_calibration = True
+            self.save_calibration()
             print("[CALIBRATION] ✓ Calibration complete!")
         else:
             print("[CALIBRATION] Using auto-calibration mode")
@@ -308,7 +452,9 @@ class ProfessionalRouletteTracker:
     def set_calibration_points(self, points):
         """
         points: list of [x, y] in the order: top, right, bottom, left
+        (full window/monitor pixels)
         """
+        self.capture_roi, self.capture_offset = None, (0, 0)
         self.calibration_points = np.array(points, dtype=np.float32)
 
         # Target points: top-center, right-center, bottom-center, left-center of 500x500
@@ -323,8 +469,30 @@ class ProfessionalRouletteTracker:
         self.calibrated = True
         self.center = (250, 250)
         self.radius = 240
+        self.update_warp_maps()
+        self.load_saved_templates()
         print(f"[CALIBRATION] Homography matrix calculated. Center: {self.center}, Radius: {self.radius}")
 
+    def load_saved_templates(self):
+        """Reuse the saved template bank if it was built for these calibration points (read only)"""
+        self.template_bank = load_template_bank(self.calibration_path, self.calibration_points)
+        if self.template_bank is not None:
+            print(f"[TEMPLATES] Reusing saved pocket templates from {self.calibration_path}")
+
+    def save_calibration(self):
+        """Write the calibration points, homography and template bank (if built) to calibration_path"""
+        try:
+            save_calibration(self.calibration_path, self.calibration_points, self.M, self.template_bank)
+        except Exception as e:
+            print(f"[CALIBRATION] Could not save calibration: {e}")
+
+    def build_template_bank(self, warped_frame):
+        """Cut one template per pocket from the warped wheel, using the zero marker's current angle"""
+        self.template_bank = PocketTemplateBank.build(warped_frame, self.center, self.radius, self.last_wheel_angle)
+        print(f"[TEMPLATES] Built {len(self.template_bank.templates)} pocket templates")
+        if self.persist_calibration:
+            self.save_calibration()
+
     def show_physics_view(self, warped_frame):
         """
         Debug window showing the warped (flattened) wheel with:
@@ -350,17 +518,18 @@ class ProfessionalRouletteTracker:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
 
         # Draw ball's path history as red line
-        if len(self.ball_history) >= 2:
-            for i in range(1, len(self.ball_history)):
-                pt1 = self.ball_history[i-1]
-                pt2 = self.ball_history[i]
+        history = [tuple(p) for p in self.ball_history[:, :2].astype(int).tolist()]
+        if len(history) >= 2:
+            for i in range(1, len(history)):
+                pt1 = history[i-1]
+                pt2 = history[i]
                 # Draw with gradient (older = darker)
-                intensity = int(255 * (i / len(self.ball_history)))
+                intensity = int(255 * (i / len(history)))
                 cv2.line(debug_frame, pt1, pt2, (intensity, 0, 255 - intensity), 2)
 
         # Draw current ball position
-        if self.ball_history:
-            cv2.circle(debug_frame, self.ball_history[-1], 8, (0, 0, 255), -1)
+        if history:
+            cv2.circle(debug_frame, history[-1], 8, (0, 0, 255), -1)
 
         # Add info text
         info_y = 30
@@ -393,108 +562,218 @@ class ProfessionalRouletteTracker:
     def preprocess_frame(self, frame):
         """
         Apply homography transformation to fix 3D tilt.
-        Warps every frame using cv2.warpPerspective before ball detection.
+        Warps every frame with the precomputed remap tables before ball detection.
         Turns tilted oval wheel into flat circle for physics engine.
         """
         if self.M is not None:
-            return cv2.warpPerspective(frame, self.M, (500, 500))
+            if self._warp_maps_for is not self.M:
+                self.update_warp_maps()
+            # Warped into the same buffer every frame; nothing keeps it past process_frame
+            map1, map2 = self._warp_maps
+            self._warp_buffer = cv2.remap(frame, map1, map2, cv2.INTER_LINEAR, dst=self._warp_buffer)
+            return self._warp_buffer
         return frame
 
+    def update_warp_maps(self):
+        """
+        Turn the homography into fixed-point cv2.remap tables for the 500x500
+        output, so per-frame warping is a table lookup. Rebuilt only when M is
+        replaced (calibration or capture region change).
+        """
+        if self.M is None:
+            self._warp_maps, self._warp_maps_for = None, None
+            return
+        u, v = np.meshgrid(np.arange(500, dtype=np.float64), np.arange(500, dtype=np.float64))
+        src = cv2.perspectiveTransform(np.dstack([u, v]).reshape(-1, 1, 2), np.linalg.inv(self.M)).reshape(500, 500, 2)
+        self._warp_maps = cv2.convertMaps(src[..., 0].astype(np.float32), src[..., 1].astype(np.float32), cv2.CV_16SC2)
+        self._warp_maps_for = self.M
+        # Flat-wheel pixels per source pixel at the wheel center, for size filters in 'points' mode
+        du, dv = src[250, 251] - src[250, 250], src[251, 250] - src[250, 250]
+        self._area_scale = 1.0 / max(abs(float(du[0] * dv[1] - du[1] * dv[0])), 1e-9)
+
+    def apply_auto_calibration(self):
+        """Merge the latest published auto-calibration result, unless it was found in old coordinates"""
+        result = self.auto_calibrator.result
+        if result is None or result[0] == self._calibration_seq:
+            return
+        seq, epoch, samples, best = result
+        self._calibration_seq = seq
+        if self.timers.enabled:
+            self.timers.record('hough', self.auto_calibrator.last_duration)
+        if epoch != self.calibration_epoch:
+            return
+        self.center_samples.extend(samples)
+        if best:
+            self.last_wheel_circle = best
+
+    def detection_ring(self, frame_shape):
+        """
+        Bounding box and uint8 mask (x0, y0, x1, y1, mask) of the ring where the
+        ball and zero marker can be: RING_INNER..RING_OUTER radii around the center.
+        Rebuilt only when the calibration or frame size changes. None before
+        calibration (or with masking disabled), meaning the whole frame is searched.
+        """
+        if not self.calibrated or not self.annulus_masking:
+            return None
+        if self.source_homography() is not None:
+            return self.source_ring(frame_shape)
+        key = (self.center, self.radius, frame_shape[:2])
+        if key != self._ring_key:
+            h, w = frame_shape[:2]
+            cx, cy = self.center
+            inner, outer = self.radius * RING_INNER, self.radius * RING_OUTER
+            x0, y0 = max(int(cx - outer), 0), max(int(cy - outer), 0)
+            x1, y1 = min(int(np.ceil(cx + outer)) + 1, w), min(int(np.ceil(cy + outer)) + 1, h)
+            if x1 <= x0 or y1 <= y0:
+                self._ring = None
+            else:
+                yy, xx = np.ogrid[y0:y1, x0:x1]
+                d2 = (xx - cx) ** 2 + (yy - cy) ** 2
+                mask = ((d2 > inner * inner) & (d2 < outer * outer)).astype(np.uint8) * 255
+                self._ring = (x0, y0, x1, y1, mask)
+            self._ring_key = key
+        return self._ring
+
+    def source_homography(self):
+        """M when detection runs on raw frames ('points' mode, or 'auto' on a small wheel), else None"""
+        if self.M is None or self.warp_mode == 'frame':
+            return None
+        # 'auto': only worth it when the wheel covers fewer source pixels than the 500x500 flat view
+        return self.M if self.warp_mode == 'points' or self._area_scale > 1.0 else None
+
+    def to_flat(self, points):
+        """Map detected (x, y) centroids into the coordinates tracking runs in; one perspectiveTransform for all"""
+        M = self.source_homography()
+        if M is None or not points:
+            return points
+        flat = cv2.perspectiveTransform(np.array(points, dtype=np.float64).reshape(-1, 1, 2), M)
+        return [tuple(p) for p in flat.reshape(-1, 2)]
+
+    def flat_view(self, frame):
+        """The frame in flat-wheel coordinates, warping on demand in 'points' mode"""
+        return self.preprocess_frame(frame) if self.source_homography() is not None else frame
+
+    def source_ring(self, frame_shape):
+        """
+        detection_ring for 'points' mode: the raw-frame pixels that land inside
+        the warped 500x500 wheel and its ring, found by mapping the preimage's
+        bounding box through M once per calibration.
+        """
+        key = (self.M.tobytes(), self.center, self.radius, frame_shape[:2])
+        if key == self._ring_key:
+            return self._ring
+        self._ring_key, self._ring = key, None
+        h, w = frame_shape[:2]
+        M_inv = np.linalg.inv(self.M)
+        corners = cv2.perspectiveTransform(np.array([[[0, 0]], [[500, 0]], [[500, 500]], [[0, 500]]], np.float64), M_inv)
+        x0, y0 = (max(int(v), 0) for v in corners.reshape(-1, 2).min(axis=0))
+        x1, y1 = (int(np.ceil(v)) + 1 for v in corners.reshape(-1, 2).max(axis=0))
+        x1, y1 = min(x1, w), min(y1, h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        xx, yy = np.meshgrid(np.arange(x0, x1, dtype=np.float64), np.arange(y0, y1, dtype=np.float64))
+        flat = cv2.perspectiveTransform(np.dstack([xx, yy]).reshape(-1, 1, 2), self.M).reshape(y1 - y0, x1 - x0, 2)
+        fx, fy = flat[..., 0], flat[..., 1]
+        cx, cy = self.center
+        d2 = (fx - cx) ** 2 + (fy - cy) ** 2
+        inner, outer = self.radius * RING_INNER, self.radius * RING_OUTER
+        inside = (fx >= 0) & (fx < 500) & (fy >= 0) & (fy < 500) & (d2 > inner * inner) & (d2 < outer * outer)
+        self._ring = (x0, y0, x1, y1, inside.astype(np.uint8) * 255)
+        return self._ring
+
+    def add_history_point(self, x, y):
+        """
+        Append a ball position to ball_history along with what the arc check
+        needs: its polar coordinates around the current center and the step
+        (pixel distance, wrapped angle change) from the previous point.
+        """
+        if self.ball_history and self._history_center != self.center:
+            self._rederive_history()
+        cx, cy = self.center
+        angle, radius = np.arctan2(y - cy, x - cx), np.hypot(x - cx, y - cy)
+        if self.ball_history:
+            px, py, prev_angle = self.ball_history[-1][:3]
+            step, turn = np.hypot(x - px, y - py), (angle - prev_angle + np.pi) % (np.pi * 2) - np.pi
+        else:
+            step, turn = 0.0, 0.0
+        self.ball_history.append((x, y, angle, radius, step, turn))
+        self._history_center = self.center
+
+    def _rederive_history(self):
+        """
+        Calibration moved the center since the stored points were added: recompute
+        their angle, radius and turn around the new one. Steps are pixel distances
+        and stay as they are.
+        """
+        rows = np.array(self.ball_history)
+        cx, cy = self.center
+        dx, dy = rows[:, 0] - cx, rows[:, 1] - cy
+        rows[:, 2], rows[:, 3] = np.arctan2(dy, dx), np.hypot(dx, dy)
+        rows[1:, 5] = (np.diff(rows[:, 2]) + np.pi) % (np.pi * 2) - np.pi
+        self.ball_history.clear()
+        self.ball_history.extend(rows)
+        self._history_center = self.center
+
     def check_consistent_arc_with_declining_velocity(self):
         """
         Verify that the last 10 points in history form a consistent arc with declining velocity.
         Returns True only if the ball trajectory is stable and slowing down.
+        Works on the per-point polar coordinates and steps stored by add_history_point.
         """
         if len(self.ball_history) < 10:
             return False
 
-        # Get last 10 points
-        recent_points = self.ball_history[-10:]
-
-        # Calculate velocities between consecutive points
-        velocities = []
-        for i in range(1, len(recent_points)):
-            x1, y1 = recent_points[i-1]
-            x2, y2 = recent_points[i]
-            velocity = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-            velocities.append(velocity)
-
-        if len(velocities) < 5:
-            return False
-
-        # Check for declining velocity trend
-        velocity_diffs = []
-        for i in range(1, len(velocities)):
-            velocity_diffs.append(velocities[i] - velocities[i-1])
+        if self._history_center != self.center:
+            self._rederive_history()
 
-        # Count how many velocity changes are negative (declining)
-        declining_count = sum(1 for diff in velocity_diffs if diff < 0)
+        # Last 10 points; the steps and turns of the last 9 lead from one of them to the next
+        recent = self.ball_history[-10:]
+        radii, turns, velocities = recent[:, 3], recent[1:, 5], recent[1:, 4]
 
-        # At least 60% should be declining
-        is_declining = declining_count >= len(velocity_diffs) * 0.6
-
-        # Check arc consistency: points should follow circular path
-        center_x, center_y = self.center
-        angles = []
-        radii = []
-        for x, y in recent_points:
-            angle = np.arctan2(y - center_y, x - center_x)
-            radius = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-            angles.append(angle)
-            radii.append(radius)
+        # Declining velocity trend: at least 60% of the changes negative
+        is_declining = np.count_nonzero(np.diff(velocities) < 0) >= (len(velocities) - 1) * 0.6
 
         # Radial consistency: should stay roughly same distance from center
-        radial_std = np.std(radii)
         radial_threshold = self.radius * 0.08 if self.radius else 30
-        is_consistent_arc = radial_std < radial_threshold
+        is_consistent_arc = radii.std() < radial_threshold
 
         # Angular progression: should be monotonic (all increasing or all decreasing)
-        angle_diffs = []
-        for i in range(1, len(angles)):
-            diff = (angles[i] - angles[i-1] + np.pi) % (np.pi * 2) - np.pi
-            angle_diffs.append(diff)
-
-        same_direction = all(d > 0 for d in angle_diffs) or all(d < 0 for d in angle_diffs)
+        same_direction = bool((turns > 0).all() or (turns < 0).all())
 
-        result = is_declining and is_consistent_arc and same_direction
-
-        return result
+        return bool(is_declining and is_consistent_arc and same_direction)
 
     def predict(self, w_speed, b_speed, w_angle, b_angle):
-        sw, sb = abs(w_speed), abs(b_speed)
-        wa, ba = w_angle, b_angle
-        dist = 5.1
-        locked = False
-
-        # More accurate physics simulation
-        for step in range(5000):
-            if locked:
-                break
-
-            wa += sw
-            ba += sb
-
-            sw *= WHEEL_FRICTION
-            sb *= BALL_FRICTION
-
-            # More accurate distance calculation
-            centrifugal = sb * sb * dist * 0.0008
-            dist += centrifugal - GRAVITY
-            dist = max(dist, 4.0)
-
-            # Lock when speeds match and ball is close to wheel
-            if dist < 4.3 and abs(sb - sw) < 0.008:
-                locked = True
-
-        rel_angle = ((ba - wa) % (np.pi * 2) + (np.pi * 2)) % (np.pi * 2)
-        pocket_idx = int((rel_angle / (np.pi * 2 / 38)) + 0.5) % 38
-        return POCKETS[pocket_idx]
-
-    def detect_winning_number(self, frame, ball_angle, wheel_angle=0):
-        """Detect the actual winning number by reading it from the wheel pocket where ball stopped"""
+        """
+        Predict the landing pocket. Interpolates the precomputed lookup table when
+        one is mapped, otherwise solves the lock step in closed form from the
+        geometric friction decay (see physics.py).
+        """
+        offset = self.prediction_table.relative_offset(w_speed, b_speed) if self.prediction_table is not None else None
+        if offset is not None:
+            return pocket_from_angle(b_angle - w_angle + offset)
+        rel_angle = final_relative_angle(w_speed, b_speed, w_angle, b_angle)
+        return pocket_from_angle(rel_angle)
+
+    def speed_noise(self):
+        """Standard deviation of the smoothed (wheel, ball) speeds in rad/frame"""
+        # The 0.2-weighted EMA keeps sqrt(0.2 / 1.8) of the per-frame sample noise
+        scale = np.sqrt(0.2 / 1.8)
+        return np.sqrt(self.wheel_speed_var) * scale, np.sqrt(self.ball_speed_var) * scale
+
+    def predict_distribution(self, w_speeds, b_speeds, w_angles, b_angles, samples=DISTRIBUTION_SAMPLES):
+        """
+        Batched Monte Carlo prediction. Accepts scalars or arrays of states and
+        perturbs them with the measured speed noise.
+        Returns a 38-element probability vector aligned with POCKETS.
+        """
+        w_noise, b_noise = self.speed_noise()
+        return predict_distribution(w_speeds, b_speeds, w_angles, b_angles, w_noise, b_noise, samples)
 
+    def pocket_roi(self, frame, ball_angle):
+        """Copy of the region around the pocket where the ball stopped, or None"""
         if not self.calibrated or ball_angle is None:
-            return -1
+            return None
 
         center_x, center_y = self.center
 
@@ -511,68 +790,59 @@ class ProfessionalRouletteTracker:
         y2 = min(frame.shape[0], pocket_y + roi_size)
 
         if x2 <= x1 or y2 <= y1:
-            return -1
-
-        # Extract the pocket region
-        roi = frame[y1:y2, x1:x2]
-
-        # Save ROI for debugging
-        try:
-            cv2.imwrite('pocket_roi.jpg', roi)
-        except:
-            pass
-
-        # Convert to grayscale
-        roi_gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-
-        # Try multiple preprocessing approaches
-        detected_numbers = []
-
-        # Approach 1: Look for white text on dark background
-        _, thresh1 = cv2.threshold(roi_gray, 180, 255, cv2.THRESH_BINARY)
-        detected_numbers.extend(self._ocr_on_image(thresh1))
+            return None
+        return frame[y1:y2, x1:x2].copy()
 
-        # Approach 2: Look for dark text on white background
-        _, thresh2 = cv2.threshold(roi_gray, 100, 255, cv2.THRESH_BINARY_INV)
-        detected_numbers.extend(self._ocr_on_image(thresh2))
-
-        # Approach 3: Adaptive threshold
-        thresh3 = cv2.adaptiveThreshold(roi_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-        detected_numbers.extend(self._ocr_on_image(thresh3))
-
-        # Approach 4: Enhanced contrast
-        enhanced = cv2.equalizeHist(roi_gray)
-        _, thresh4 = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        detected_numbers.extend(self._ocr_on_image(thresh4))
-
-        # Find the most common detected number
-        if detected_numbers:
-            from collections import Counter
-            counter = Counter(detected_numbers)
-            most_common = counter.most_common(1)[0]
-            return most_common[0]
-
-        # Fallback: Use angle-based calculation
+    def angle_pocket(self, ball_angle, wheel_angle=0):
+        """Fallback result: the pocket under the ball from the angles alone"""
         rel_angle = ((ball_angle - wheel_angle) % (np.pi * 2) + (np.pi * 2)) % (np.pi * 2)
         pocket_idx = int(rel_angle / (np.pi * 2 / 38)) % 38
         return POCKETS[pocket_idx]
 
-    def _ocr_on_image(self, img):
-        """Helper to run OCR on preprocessed image"""
-        detected = []
-        if TESSERACT_AVAILABLE:
-            try:
-                # Try different PSM modes for number recognition
-                for psm in [7, 8, 10, 13]:
-                    text = pytesseract.image_to_string(img, config=f'--psm {psm} -c tessedit_char_whitelist=0123456789')
-                    text = text.strip().replace(' ', '').replace('\n', '')
-                    if text.isdigit():
-                        num = int(text)
-                        if 0 <= num <= 37:
-                            detected.append(num)
-            except:
-                pass
-        return detected
+    def debug_output_dir(self):
+        """Directory result reads save their images to: DEBUG_OUTPUT_DIR in debug mode, otherwise None (nothing saved)"""
+        return DEBUG_OUTPUT_DIR if self.debug_mode else None
+
+    def detect_winning_number(self, frame, ball_angle, wheel_angle=0):
+        """Detect the actual winning number by reading it from the wheel pocket where ball stopped (blocking)"""
+        number = self.match_pocket_template(frame, ball_angle)
+        if number != -1:
+            return number
+        roi = self.pocket_roi(frame, ball_angle)
+        if roi is None:
+            return -1
+        number = read_pocket_number(roi, self.debug_output_dir())
+        return number if number != -1 else self.angle_pocket(ball_angle, wheel_angle)
+
+    def match_pocket_template(self, frame, ball_angle):
+        """Pocket under the ball from the template bank, or -1 without a bank or a confident match"""
+        if self.template_bank is None or self.M is None or ball_angle is None:
+            return -1
+        number, _ = self.template_bank.match(frame, self.center, self.radius, ball_angle)
+        return number
+
+    def submit_result_reading(self, frame):
+        """Hand the settled frame to the OCR worker; returns (future, fallback) for the state machine to poll"""
+        if not self.settling_ball_positions:
+            future = Future()
+            future.set_result(-1)
+            return future, -1
+
+        avg_ball_angle = self.settling_ball_positions.mean()
+        number = self.match_pocket_template(frame, avg_ball_angle)
+        if number != -1:
+            future = Future()
+            future.set_result(number)
+            return future, number
+        roi = self.pocket_roi(frame, avg_ball_angle)
+        fallback = self.angle_pocket(avg_ball_angle, self.final_wheel_angle or 0) if roi is not None else -1
+        # The frame is only sent to be saved in debug mode; buffers are recycled, so the worker gets its own copy
+        debug_dir = self.debug_output_dir()
+        future = self.result_reader.submit(roi, frame.copy() if debug_dir is not None else None, debug_dir)
+        if self.timers.enabled:
+            submitted = time.perf_counter()
+            future.add_done_callback(lambda f: self.timers.record('ocr', time.perf_counter() - submitted))
+        return future, fallback
 
     def is_within_range(self, predicted, actual, range_size=3):
         """Check if predicted number is within range_size pockets of actual"""
@@ -587,53 +857,40 @@ class ProfessionalRouletteTracker:
         circular_diff = min(diff, 38 - diff)
         return circular_diff <= range_size
 
-    def process_frame(self, frame, dt=0.016):
+    def process_frame(self, frame, dt=0.016, seq=None, capture_time=None):
         """
         Standalone vision logic for a single frame.
-        Returns: {'ball_coords': (x,y), 'zero_coords': (x,y), 'confidence': float, 'prediction': int, 'spin_finished': dict}
+        Returns a FrameResult (ball/zero coords, confidence, prediction, RPMs, spin_finished, ...); to_dict() for JSON
+        `seq` and `capture_time` (time.monotonic() of the grab) identify a captured frame and are carried into the result
         """
-        now = time.time()
+        started = time.monotonic()
+        now = self.clock()
         fps = 1.0 / dt if dt > 0 else 60.0
+        timers = self.timers if self.timers.enabled else None
+        if timers is not None:
+            timers.begin()
 
-        # Apply homography transformation if calibrated
+        # Apply homography transformation if calibrated. In 'points' mode the frame stays in
+        # source pixels and only detected centroids are mapped into the flat 500x500 wheel.
         if self.M is not None:
-            frame = self.preprocess_frame(frame)
-            self.warped_frame = frame.copy()
+            if self.source_homography() is None:
+                frame = self.preprocess_frame(frame)
+                self.warped_frame = frame
+            else:
+                self.warped_frame = None
             self.center = (250, 250)
             self.radius = 240
             self.calibrated = True
-
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        area_scale = self._area_scale if self.source_homography() is not None else 1.0
+        if timers is not None:
+            timers.lap('warp')
 
         # --- STEP 1: AUTO-CALIBRATION ---
-        if self.M is None and (not self.calibrated or self.frame_count % 60 == 0):
-            best_circle = None
-            for p2 in [15, 20, 25, 30]:
-                circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, 1.2, 100, param1=50, param2=p2,
-                                         minRadius=int(frame.shape[0]*0.1), maxRadius=int(frame.shape[0]*0.9))
-                if circles is not None:
-                    circles = np.uint16(np.around(circles))
-                    for circle in circles[0]:
-                        cx, cy, r = circle[0], circle[1], circle[2]
-                        if 10 < cx < frame.shape[1]-10 and 10 < cy < frame.shape[0]-10:
-                            self.center_samples.append((cx, cy, r))
-                            if not best_circle: best_circle = (cx, cy, r)
-                    break
-
-            if not self.calibrated and not best_circle:
-                edges = cv2.Canny(gray, 30, 100)
-                contours, _ = cv2.findContours(cv2.dilate(edges, np.ones((3,3), np.uint8), iterations=1),
-                                             cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                for cnt in contours:
-                    area = cv2.contourArea(cnt)
-                    if area > (frame.shape[0]*frame.shape[1])*0.05:
-                        (cx, cy), r = cv2.minEnclosingCircle(cnt)
-                        perimeter = cv2.arcLength(cnt, True)
-                        circularity = 4 * np.pi * (area / (perimeter * perimeter)) if perimeter > 0 else 0
-                        if circularity > 0.4:
-                            self.center_samples.append((int(cx), int(cy), int(r)))
-                            if not best_circle: best_circle = (int(cx), int(cy), int(r))
+        # Hough runs on a background worker; the previous calibration stays in use until it publishes
+        if self.M is None:
+            if not self.calibrated or self.frame_count % 60 == 0:
+                self.auto_calibrator.submit(frame, self.calibration_epoch, fallback=not self.calibrated)
+            self.apply_auto_calibration()
 
         if self.M is None and not self.calibrated and len(self.center_samples) >= 2:
             avg_pts = np.mean(self.center_samples, axis=0)
@@ -641,6 +898,8 @@ class ProfessionalRouletteTracker:
             self.radius = int(avg_pts[2])
             self.calibrated = True
             print(f"[CALIBRATION] Locked: {self.center}, R={self.radius}")
+        if timers is not None:
+            timers.lap('calibration')
 
         # --- STEP 2: TRACKING ---
         wheel_found = False
@@ -651,46 +910,94 @@ class ProfessionalRouletteTracker:
         center_x, center_y = self.center if self.calibrated else (frame.shape[1] // 2, frame.shape[0] // 2)
         radius_check = self.radius if self.calibrated else int(min(frame.shape[0], frame.shape[1]) * 0.4)
 
+        # Restrict both detectors to the ring's bounding box and mask out everything else
+        ring = self.detection_ring(frame.shape)
+        if ring is not None:
+            x0, y0, x1, y1, ring_mask = ring
+            roi = frame[y0:y1, x0:x1]
+        else:
+            x0, y0, ring_mask, roi = 0, 0, None, frame
+        if timers is not None:
+            timers.lap('ring')
+
         # Green marker (zero) detection
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
         green_mask = cv2.inRange(hsv, np.array([30, 30, 30]), np.array([90, 255, 255]))
-        contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if ring_mask is not None:
+            cv2.bitwise_and(green_mask, ring_mask, dst=green_mask)
+        if timers is not None:
+            timers.lap('hsv')
+        contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
+        candidates = []
         for cnt in sorted(contours, key=cv2.contourArea, reverse=True):
-            if 15 < cv2.contourArea(cnt) < 10000:
+            if 15 < cv2.contourArea(cnt) * area_scale < 10000:
                 M = cv2.moments(cnt)
                 if M["m00"] > 0:
-                    gx, gy = int(M["m10"]/M["m00"]), int(M["m01"]/M["m00"])
-                    dist = np.sqrt((gx - center_x)**2 + (gy - center_y)**2)
-                    if radius_check * 0.3 < dist < radius_check * 1.7:
-                        wa = np.arctan2(gy - center_y, gx - center_x)
-                        if self.last_wheel_angle is not None:
-                            diff = (wa - self.last_wheel_angle + np.pi) % (np.pi * 2) - np.pi
-                            self.wheel_speed = self.wheel_speed * 0.8 + abs(diff) * 0.2
-                        self.last_wheel_angle = wa
-                        wheel_found = True
-                        break
-
-        # Ball Detection (Background Subtraction)
-        fgMask = self.backSub.apply(frame)
-        fgMask = cv2.morphologyEx(fgMask, cv2.MORPH_OPEN, np.ones((3,3), np.uint8))
-        fgMask = cv2.morphologyEx(fgMask, cv2.MORPH_CLOSE, np.ones((5,5), np.uint8))
-        contours, _ = cv2.findContours(fgMask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for cnt in sorted(contours, key=cv2.contourArea, reverse=True):
-            area = cv2.contourArea(cnt)
-            if 5 < area < 3000:
-                (cur_bx, cur_by), _ = cv2.minEnclosingCircle(cnt)
+                    candidates.append((M["m10"]/M["m00"], M["m01"]/M["m00"]))
+        for cand_x, cand_y in self.to_flat(candidates):
+            gx, gy = int(cand_x), int(cand_y)
+            dist = np.sqrt((gx - center_x)**2 + (gy - center_y)**2)
+            if radius_check * 0.3 < dist < radius_check * 1.7:
+                wa = np.arctan2(gy - center_y, gx - center_x)
+                if self.last_wheel_angle is not None:
+                    diff = (wa - self.last_wheel_angle + np.pi) % (np.pi * 2) - np.pi
+                    self.wheel_speed_var = 0.8 * (self.wheel_speed_var + 0.2 * (abs(diff) - self.wheel_speed) ** 2)
+                    self.wheel_speed = self.wheel_speed * 0.8 + abs(diff) * 0.2
+                self.last_wheel_angle = wa
+                wheel_found = True
+                break
+        if timers is not None:
+            timers.lap('zero')
+
+        # Templates are cut once per calibration from the first warped frame showing the zero marker
+        if wheel_found and self.M is not None and self.template_bank is None and self.state == "IDLE":
+            self.build_template_bank(self.flat_view(frame))
+            if timers is not None:
+                timers.lap('templates')
+
+        # Ball Detection: (angle, distance, x, y) of the ball, or None
+        ball_fix = None
+        if self.ball_detector == 'strip' and self.calibrated:
+            ball_fix = self.track_strip.detect(frame, (center_x, center_y), radius_check, self.source_homography())
+            if timers is not None:
+                timers.lap('strip')
+        else:
+            # Background Subtraction
+            fgMask = self.backSub.apply(roi)
+            if timers is not None:
+                timers.lap('mog2')
+            fgMask = cv2.morphologyEx(fgMask, cv2.MORPH_OPEN, np.ones((3,3), np.uint8))
+            fgMask = cv2.morphologyEx(fgMask, cv2.MORPH_CLOSE, np.ones((5,5), np.uint8))
+            if ring_mask is not None:
+                cv2.bitwise_and(fgMask, ring_mask, dst=fgMask)
+            if timers is not None:
+                timers.lap('morphology')
+            contours, _ = cv2.findContours(fgMask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
+            candidates = []
+            for cnt in sorted(contours, key=cv2.contourArea, reverse=True):
+                area = cv2.contourArea(cnt) * area_scale
+                if 5 < area < 3000:
+                    candidates.append(cv2.minEnclosingCircle(cnt)[0])
+            for cur_bx, cur_by in self.to_flat(candidates):
                 dist = np.sqrt(float(cur_bx-center_x)**2 + float(cur_by-center_y)**2)
-                if not self.calibrated or (radius_check * 0.3 < dist < radius_check * 1.8):
-                    ba = np.arctan2(cur_by - center_y, cur_bx - center_x)
-                    if self.last_ball_angle is not None:
-                        diff = (ba - self.last_ball_angle + np.pi) % (np.pi * 2) - np.pi
-                        if 0.005 < abs(diff) < 3.0:
-                            self.ball_speed = self.ball_speed * 0.8 + abs(diff) * 0.2
-                            self.ball_drop_detected = True
-                        else: self.ball_speed *= 0.98
-                    else: self.ball_speed = 0.1
-                    self.last_ball_angle, bx, by = ba, int(cur_bx), int(cur_by)
-                    ball_found = True
+                if not self.calibrated or (radius_check * RING_INNER < dist < radius_check * RING_OUTER):
+                    ball_fix = (np.arctan2(cur_by - center_y, cur_bx - center_x), dist, cur_bx, cur_by)
                     break
+            if timers is not None:
+                timers.lap('ball_contours')
+
+        if ball_fix is not None:
+            ba, dist, cur_bx, cur_by = ball_fix
+            if self.last_ball_angle is not None:
+                diff = (ba - self.last_ball_angle + np.pi) % (np.pi * 2) - np.pi
+                if 0.005 < abs(diff) < 3.0:
+                    self.ball_speed_var = 0.8 * (self.ball_speed_var + 0.2 * (abs(diff) - self.ball_speed) ** 2)
+                    self.ball_speed = self.ball_speed * 0.8 + abs(diff) * 0.2
+                    self.ball_drop_detected = True
+                else: self.ball_speed *= 0.98
+            else: self.ball_speed = 0.1
+            self.last_ball_angle, bx, by = ba, int(cur_bx), int(cur_by)
+            ball_found = True
 
         # Refined ball tracking history with strict noise filtering
         path_confidence = 1.0
@@ -700,7 +1007,7 @@ class ProfessionalRouletteTracker:
             # Calculate Delta: distance from previous position
             should_add = True
             if self.ball_history:
-                last_x, last_y = self.ball_history[-1]
+                last_x, last_y = self.ball_history[-1][:2]
                 delta = np.sqrt((bx - last_x)**2 + (by - last_y)**2)
 
                 # Strict noise filter: discard if > 30 pixels (ball can't teleport)
@@ -709,51 +1016,42 @@ class ProfessionalRouletteTracker:
                     path_confidence = 0.0
 
             if should_add:
-                self.ball_history.append((bx, by))
-                if len(self.ball_history) > 30:
-                    self.ball_history.pop(0)
+                self.add_history_point(bx, by)
 
                 # Track path in polar coordinates for physics
-                self.ball_path.append((ba, dist))
-                if len(self.ball_path) > 5:
-                    self.ball_path.pop(0)
+                step = (ba - self.ball_path[-1][0] + np.pi) % (np.pi * 2) - np.pi if self.ball_path else 0.0
+                self.ball_path.append((ba, dist, step))
 
             if len(self.ball_path) >= 2:
-                radii = [p[1] for p in self.ball_path]
-                angles = [p[0] for p in self.ball_path]
-
                 # Radial stability (distance from center should be constant)
-                radial_std = np.std(radii)
+                radial_std = self.ball_path.std()[1]
                 if radial_std > radius_check * 0.05:
                     path_confidence *= 0.5
                 if radial_std > radius_check * 0.15:
                     path_confidence = 0.0
 
-                # Angular consistency (no teleporting)
-                angle_diffs = []
-                for i in range(1, len(angles)):
-                    diff = (angles[i] - angles[i-1] + np.pi) % (np.pi * 2) - np.pi
-                    angle_diffs.append(abs(diff))
-
-                if len(angle_diffs) > 0 and max(angle_diffs) > 2.0:
+                # Angular consistency (no teleporting); the oldest entry's step is to a point already dropped
+                steps = self.ball_path.column(2)[1:]
+                if max(steps.max(), -steps.min()) > 2.0:
                     path_confidence = 0.0
         else:
             self.frames_without_ball += 1
 
             # Stricter reset: Clear history after 3 frames to avoid phantom predictions
             if self.frames_without_ball >= 3:
-                self.ball_history = []
-                self.ball_path = []
+                self.ball_history.clear()
+                self.ball_path.clear()
                 self.confidence_score = 0.0
-                self.detection_history = []
+                self.detection_history.clear()
 
             path_confidence = 0.0
 
         # Update detection history with path confidence
         current_detection = path_confidence if (ball_found and wheel_found) else (path_confidence * 0.5 if (ball_found or wheel_found) else 0.0)
         self.detection_history.append(current_detection)
-        if len(self.detection_history) > 60: self.detection_history.pop(0)
-        self.confidence_score = np.mean(self.detection_history) * 100
+        self.confidence_score = self.detection_history.mean() * 100
+        if timers is not None:
+            timers.lap('tracking')
 
         ball_rpm = self.ball_speed * fps * 60 / (np.pi * 2) if fps > 0 else 0
         wheel_rpm = abs(self.wheel_speed * fps * 60 / (np.pi * 2)) if fps > 0 else 0
@@ -777,12 +1075,19 @@ class ProfessionalRouletteTracker:
             if not self.prediction_made and int(spin_duration) % 2 == 0 and self.frame_count % 60 == 0:
                 print(f"[DEBUG] Prediction check: duration={spin_duration:.1f}s, confidence={self.confidence_score:.0f}%, history={len(self.ball_history)}, arc_ok={has_consistent_arc}")
 
+            if ball_found and self.last_ball_angle is not None:
+                wheel_angle = self.last_wheel_angle if wheel_found else self.last_ball_angle
+                wheel_spd = self.wheel_speed if wheel_found else self.ball_speed * 0.35
+                if timers is not None:
+                    timers.lap('state')
+                self.pocket_probabilities = self.predict_distribution(wheel_spd, self.ball_speed, wheel_angle, self.last_ball_angle)
+                if timers is not None:
+                    timers.lap('prediction')
+
             if not self.prediction_made and 1.0 <= spin_duration <= 3.0 and self.confidence_score > 50 and has_sufficient_history and has_consistent_arc:
                 if ball_found and self.last_ball_angle is not None:
-                    wheel_angle = self.last_wheel_angle if wheel_found else self.last_ball_angle
-                    wheel_spd = self.wheel_speed if wheel_found else self.ball_speed * 0.35
-                    preds = [self.predict(wheel_spd, self.ball_speed, wheel_angle, self.last_ball_angle) for _ in range(5)]
-                    self.final_prediction, self.prediction_made = max(set(preds), key=preds.count), True
+                    self.final_prediction = self.predict(wheel_spd, self.ball_speed, wheel_angle, self.last_ball_angle)
+                    self.prediction_made = True
                     print(f"🎯 [PREDICTION] {self.final_prediction} (confidence: {self.confidence_score:.0f}%, ball RPM: {ball_rpm:.0f})")
 
             if self.prediction_made:
@@ -790,150 +1095,365 @@ class ProfessionalRouletteTracker:
 
             if ball_rpm < 8 and wheel_rpm < 5 and spin_duration >= 1.0:
                 if self.settling_start_time == 0:
-                    self.settling_start_time, self.settling_ball_positions = now, []
+                    self.settling_start_time = now
+                    self.settling_ball_positions.clear()
                     print(f"[DEBUG] Ball settling... RPM: ball={ball_rpm:.0f}, wheel={wheel_rpm:.0f}")
                 if ball_found and self.last_ball_angle is not None:
                     self.settling_ball_positions.append(self.last_ball_angle)
-                    if len(self.settling_ball_positions) > 10: self.settling_ball_positions.pop(0)
                 if wheel_found: self.final_wheel_angle = self.last_wheel_angle
 
-                if now - self.settling_start_time > 1.5 and spin_duration >= 2.0:
+                if now - self.settling_start_time > 1.5 and spin_duration >= 2.0 and self.pending_result is None:
                     print(f"[DEBUG] Detecting final number... (settling samples: {len(self.settling_ball_positions)})")
-                    if self.settling_ball_positions:
-                        avg_ball_angle = np.mean(self.settling_ball_positions)
-
-                        # Try to detect from video
-                        self.actual_result = self.detect_winning_number(frame, avg_ball_angle, self.final_wheel_angle or 0)
-
-                        # Save the final frame for manual verification
-                        try:
-                            cv2.imwrite('last_spin_result.jpg', frame)
-                        except:
-                            pass
-
-                    final_num = self.actual_result if self.actual_result != -1 else self.final_prediction
-                    spin_finished_data = {'number': int(final_num), 'predicted': int(self.final_prediction), 'actual': int(self.actual_result)}
-
-                    # Calculate accuracy
-                    distance = -1
-                    status_icon = ""
-                    if self.final_prediction != -1 and self.actual_result != -1:
-                        pred_idx = POCKETS.index(self.final_prediction) if self.final_prediction in POCKETS else -1
-                        actual_idx = POCKETS.index(self.actual_result) if self.actual_result in POCKETS else -1
-                        if pred_idx != -1 and actual_idx != -1:
-                            diff = abs(pred_idx - actual_idx)
-                            distance = min(diff, 38 - diff)
-                            if distance == 0:
-                                status_icon = "✓"
-                            elif distance <= 2:
-                                status_icon = "✓"
-                            elif distance <= 5:
-                                status_icon = "~"
-                            else:
-                                status_icon = "✗"
-
-                    # Clean log output
-                    print(f"🎲 [RESULT] {status_icon} Predicted: {self.final_prediction} | Actual: {self.actual_result} | Distance: {distance if distance != -1 else 'N/A'} pockets\n")
-
-                    # Reset state
-                    self.state, self.prediction_made, self.final_prediction, self.actual_result, self.settling_start_time = "IDLE", False, -1, -1, 0
-                    self.ball_history = []
-                    self.ball_path = []
-                    self.frames_without_ball = 0
+                    # Try to detect from video, off the frame thread
+                    if timers is not None:
+                        timers.lap('state')
+                    self.pending_result = self.submit_result_reading(self.flat_view(frame))
+                    if timers is not None:
+                        timers.lap('ocr_submit')
+
+            # The spin finishes once the OCR worker answers; tracking keeps running meanwhile
+            if self.pending_result is not None and self.pending_result[0].done():
+                future, fallback = self.pending_result
+                self.pending_result = None
+                try:
+                    self.actual_result = future.result()
+                except Exception as e:
+                    print(f"[RESULT] Winning number read failed: {e}")
+                    self.actual_result = -1
+                if self.actual_result == -1:
+                    self.actual_result = fallback
+
+                final_num = self.actual_result if self.actual_result != -1 else self.final_prediction
+                spin_finished_data = {'number': int(final_num), 'predicted': int(self.final_prediction), 'actual': int(self.actual_result)}
+
+                # Calculate accuracy
+                distance = -1
+                status_icon = ""
+                if self.final_prediction != -1 and self.actual_result != -1:
+                    pred_idx = POCKETS.index(self.final_prediction) if self.final_prediction in POCKETS else -1
+                    actual_idx = POCKETS.index(self.actual_result) if self.actual_result in POCKETS else -1
+                    if pred_idx != -1 and actual_idx != -1:
+                        diff = abs(pred_idx - actual_idx)
+                        distance = min(diff, 38 - diff)
+                        if distance == 0:
+                            status_icon = "✓"
+                        elif distance <= 2:
+                            status_icon = "✓"
+                        elif distance <= 5:
+                            status_icon = "~"
+                        else:
+                            status_icon = "✗"
+
+                # Clean log output
+                print(f"🎲 [RESULT] {status_icon} Predicted: {self.final_prediction} | Actual: {self.actual_result} | Distance: {distance if distance != -1 else 'N/A'} pockets\n")
+
+                # Reset state
+                self.state, self.prediction_made, self.final_prediction, self.actual_result, self.settling_start_time = "IDLE", False, -1, -1, 0
+                self.pocket_probabilities = None
+                self.ball_history.clear()
+                self.ball_path.clear()
+                self.frames_without_ball = 0
+
+        if timers is not None:
+            timers.lap('state')
 
         # Show Physics View debug window if enabled
+        if self.debug_mode and self.source_homography() is not None:
+            self.warped_frame = self.preprocess_frame(frame)
         if self.debug_mode and self.warped_frame is not None:
             self.show_physics_view(self.warped_frame)
+        if timers is not None:
+            if self.debug_mode:
+                timers.lap('debug_view')
+            timers.end()
 
         self.frame_count += 1
-        return {
-            'ball_coords': (bx, by) if bx is not None else (None, None),
-            'zero_coords': (gx, gy) if gx is not None else (None, None),
-            'confidence': float(self.confidence_score),
-            'prediction': int(prediction),
-            'wheel_rpm': float(wheel_rpm),
-            'ball_rpm': float(ball_rpm),
-            'is_spinning': self.state == "SPINNING",
-            'spin_finished': spin_finished_data,
-            'ball_found': ball_found,
-            'wheel_found': wheel_found
-        }
-
-    def run(self):
-        """Main tracking loop - runs synchronously in terminal"""
+        finished = time.monotonic()
+        over_budget = finished - started > self.frame_budget
+        self.frames_over_budget += over_budget
+        latency = None
+        if capture_time is not None:
+            latency = finished - capture_time
+            self.frame_latency.record('capture_to_result', latency)
+        # Report unwarped coordinates in full-source pixels even when only the wheel region is grabbed
+        ox, oy = self.capture_offset if self.M is None else (0, 0)
+        return FrameResult(bx + ox if bx is not None else None, by + oy if bx is not None else None,
+                           gx + ox if gx is not None else None, gy + oy if gx is not None else None,
+                           self.confidence_score, prediction, wheel_rpm, ball_rpm, self.state == "SPINNING",
+                           spin_finished_data, self.pocket_probabilities, ball_found, wheel_found,
+                           seq, capture_time, latency, over_budget)
+
+    def capture_source(self):
+        """The selected window or monitor rect that frames are grabbed from"""
+        return self.window_rect if self.window_rect else self.monitor
+
+    def select_source(self, rect=None, title=None):
+        """Track `rect` (a window, in screen pixels) or, with None, the whole monitor, from the next frame on"""
+        self.pending_source = (rect, title)
+
+    def apply_source_selection(self):
+        """Switch to the selected source; calibration starts over there"""
+        if self.pending_source is None:
+            return
+        (self.window_rect, self.selected_window), self.pending_source = self.pending_source, None
+        self.capture_roi, self.capture_offset, self.capture_margin = None, (0, 0), CAPTURE_MARGIN
+        self.M, self.calibration_points, self.template_bank = None, [], None
+        self.update_warp_maps()
+        self.calibrated, self.center_samples, self.last_wheel_circle = False, [], None
+        self.calibration_epoch += 1
+        source = self.capture_source()
+        self.center = (source['width'] // 2, source['height'] // 2)
+        print(f"[CAPTURE] Tracking {self.selected_window or 'full screen'}")
+
+    def board_info(self):
+        """The board_detected payload: source name and wheel center/radius in source pixels; None before calibration"""
+        bounds = self.wheel_bounds()
+        if bounds is None:
+            return None
+        x0, y0, x1, y1 = bounds
+        return {'window': self.selected_window or 'Full Screen',
+                'center': {'x': int((x0 + x1) / 2), 'y': int((y0 + y1) / 2)},
+                'radius': int(max(x1 - x0, y1 - y0) / 2)}
+
+    def capture_rect(self):
+        """mss grab rect: the calibrated wheel region when locked, else the whole source"""
+        source = self.capture_source()
+        if self.capture_roi is None:
+            return source
+        x, y, w, h = self.capture_roi
+        return {'top': source.get('top', 0) + y, 'left': source.get('left', 0) + x, 'width': w, 'height': h}
+
+    def wheel_bounds(self):
+        """Wheel bounding box (x0, y0, x1, y1) in full-source pixels, or None before calibration"""
+        if self.M is not None:
+            if len(self.calibration_points) < 4:
+                return None
+            x0, y0 = np.min(self.calibration_points, axis=0)
+            x1, y1 = np.max(self.calibration_points, axis=0)
+            return float(x0), float(y0), float(x1), float(y1)
+        if not self.calibrated:
+            return None
+        cx, cy = self.center[0] + self.capture_offset[0], self.center[1] + self.capture_offset[1]
+        return cx - self.radius, cy - self.radius, cx + self.radius, cy + self.radius
+
+    def update_capture_region(self):
+        """
+        Shrink the grab to the wheel's bounding box plus margin once calibration
+        locks. Auto-calibration keeps sampling the wheel every 60 frames; when a
+        sample drifts off the locked center (or out of the region) the margin is
+        doubled and calibration re-locks inside the wider region.
+        """
+        source = self.capture_source()
+        if self.M is None and self.calibrated and self.capture_roi is not None and self.last_wheel_circle is not None:
+            sx, sy, sr = (float(v) for v in self.last_wheel_circle)
+            self.last_wheel_circle = None
+            _, _, w, h = self.capture_roi
+            drift = np.hypot(sx - self.center[0], sy - self.center[1])
+            if drift > self.radius * CAPTURE_DRIFT or sx - sr < 0 or sy - sr < 0 or sx + sr > w or sy + sr > h:
+                self.capture_margin *= 2
+                print(f"[CAPTURE] Wheel drifted {drift:.0f}px - widening margin to {self.capture_margin:.2f}")
+                bounds = self.wheel_bounds()
+                self.calibrated, self.center_samples = False, []
+                self._set_capture_roi(self._region_around(bounds, source))
+                return
+
+        bounds = self.wheel_bounds()
+        if bounds is None:
+            return
+        roi = self._region_around(bounds, source)
+        if roi != self.capture_roi:
+            self._set_capture_roi(roi)
+
+    def _region_around(self, bounds, source):
+        """Bounds grown by the capture margin and clipped to the source; None if that is the whole source"""
+        x0, y0, x1, y1 = bounds
+        pad = max(x1 - x0, y1 - y0) * self.capture_margin
+        x0, y0 = max(int(x0 - pad), 0), max(int(y0 - pad), 0)
+        x1, y1 = min(int(np.ceil(x1 + pad)), source['width']), min(int(np.ceil(y1 + pad)), source['height'])
+        if x1 - x0 >= source['width'] and y1 - y0 >= source['height']:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def _set_capture_roi(self, roi):
+        """Switch the grab region and move all frame-space state into the new frame coordinates"""
+        ox, oy = self.capture_offset
+        nx, ny = (roi[0], roi[1]) if roi is not None else (0, 0)
+        dx, dy = ox - nx, oy - ny
+        if self.M is not None:
+            # Homography maps grabbed-frame pixels: compose with the offset change
+            self.M = self.M @ np.array([[1, 0, -dx], [0, 1, -dy], [0, 0, 1]], dtype=np.float64)
+            self.update_warp_maps()
+        else:
+            self.center = (self.center[0] + dx, self.center[1] + dy)
+            self.center_samples = [(int(x) + dx, int(y) + dy, r) for x, y, r in self.center_samples]
+            self.last_wheel_circle = None
+            self.ball_history.shift((dx, dy, 0, 0, 0, 0))
+            if self._history_center is not None:
+                self._history_center = (self._history_center[0] + dx, self._history_center[1] + dy)
+        self.capture_roi, self.capture_offset = roi, (nx, ny)
+        self.calibration_epoch += 1
+        if roi is not None:
+            print(f"[CAPTURE] Grabbing wheel region {roi[2]}x{roi[3]} at ({roi[0]}, {roi[1]})")
+        else:
+            print("[CAPTURE] Grabbing full source")
+
+    def stop(self):
+        """Make run() return after the frame in progress (thread-safe; cancelling the run() task works too)"""
+        self.running = False
+
+    def shutdown_workers(self):
+        """Stop the result reader's pool and the auto-calibration thread; both restart on their next use"""
+        self.result_reader.shutdown()
+        self.auto_calibrator.shutdown()
+
+    async def run(self, headless=False):
+        """
+        Main tracking loop, as a coroutine: waiting for a frame and
+        process_frame run on a dedicated one-thread executor (OpenCV releases
+        the GIL), results are handed out on the event loop, so the loop can
+        share a thread with the server. The tracking view and keys stay on
+        the loop's thread, where calibration opened its windows.
+        headless=True (the server) opens no windows and takes no keys.
+        stop() ends it after the frame in progress; cancelling it ends it at
+        once. Either way capture is stopped and the executor drained.
+        """
         print(f"✓ Vision Engine Started")
         print(f"✓ Monitor: {self.monitor['width']}x{self.monitor['height']}")
         print(f"✓ Main tracking window will appear automatically")
-        print(f"✓ Press 'v' to toggle main view | 'd' for debug | 'q' to quit\n")
+        print(f"✓ Press 'v' to toggle main view | 'd' for debug | 'p' for capture stats | 't' for stage timings | 'q' to quit\n")
 
+        loop = asyncio.get_running_loop()
         consecutive_errors = 0
-        show_tracking_view = True  # Show by default
+        show_tracking_view = not headless  # Show by default
+        self.running = True
 
-        while True:
-            try:
-                now = time.time()
-                dt = max(now - self.last_frame_time, 0.001)
-                self.last_frame_time = now
-
-                # Capture screen
-                sct_grab_params = self.window_rect if self.window_rect else self.monitor
-                sct_img = self.sct.grab(sct_grab_params)
-                img = np.array(sct_img)
-
-                if img.size == 0:
-                    time.sleep(0.5)
-                    continue
-
-                frame = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-
-                # Process frame
-                result = self.process_frame(frame, dt)
-
-                # Show live tracking view
-                if show_tracking_view:
-                    try:
-                        self.show_tracking_view(frame, result)
-                    except Exception as e:
-                        print(f"[ERROR] Tracking view failed: {e}")
-                        show_tracking_view = False
-
-                # Check for keyboard input
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('d'):
-                    self.debug_mode = not self.debug_mode
-                    status = "ENABLED" if self.debug_mode else "DISABLED"
-                    print(f"[TOGGLE] Physics View {status}")
-                    if not self.debug_mode:
-                        cv2.destroyWindow('Physics View - Debug')
-                elif key == ord('v'):
-                    show_tracking_view = not show_tracking_view
-                    status = "ENABLED" if show_tracking_view else "DISABLED"
-                    print(f"[TOGGLE] Tracking View {status}")
-                    if not show_tracking_view:
-                        cv2.destroyWindow('Roulette Tracker - Live View')
-                elif key == ord('q'):
-                    print("\n[EXIT] Shutting down tracker...")
-                    cv2.destroyAllWindows()
-                    break
+        self.frame_capture = FrameCapture(self.frame_grabber(), self.capture_queue_size, self.capture_drop_policy,
+                                          timers=self.timers)
+        self.frame_capture.start()
+        vision = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vision')
+        last_timestamp = None
 
-                time.sleep(0.01)
+        try:
+            while self.running:
+                try:
+                    self.apply_source_selection()
+                    with self.timers.stage('wait'):
+                        packet = await loop.run_in_executor(vision, self.frame_capture.get, 0.5)
+                    if packet is None:
+                        continue
+                    seq, timestamp, frame, rect = packet
+
+                    # Grabbed before the capture region last changed: wrong coordinates
+                    if rect != self.capture_rect():
+                        continue
+
+                    # dt from capture timestamps, not from when processing got around to the frame
+                    dt = max(timestamp - last_timestamp, 0.001) if last_timestamp is not None else 1.0 / 60
+                    last_timestamp = timestamp
+                    self.last_frame_time = self.clock()
+
+                    # Process frame
+                    result = await loop.run_in_executor(vision, self.process_frame, frame, dt, seq, timestamp)
+                    if result.over_budget and self.frames_over_budget % 100 == 1:
+                        print(f"[BUDGET] Frame {seq} over the {self.frame_budget * 1000:.1f} ms budget, "
+                              f"{result.latency * 1000:.1f} ms after capture ({self.frames_over_budget} so far)")
+                    if self.metrics is not None:
+                        self.metrics.observe(result)
+                    if self.telemetry is not None:
+                        self.telemetry.publish(result, self.calibrated)
+                    with self.timers.stage('capture_region'):
+                        self.update_capture_region()
+
+                    # Show live tracking view
+                    with self.timers.stage('display'):
+                        if show_tracking_view:
+                            try:
+                                self.show_tracking_view(frame, result)
+                            except Exception as e:
+                                print(f"[ERROR] Tracking view failed: {e}")
+                                show_tracking_view = False
+
+                        # Check for keyboard input
+                        key = cv2.waitKey(1) & 0xFF if not headless else 0xFF
+                    # Glass to output: from the grab until the overlay for this frame is on screen
+                    self.frame_latency.record('capture_to_display', time.monotonic() - timestamp)
+                    if key == ord('d'):
+                        self.debug_mode = not self.debug_mode
+                        status = "ENABLED" if self.debug_mode else "DISABLED"
+                        print(f"[TOGGLE] Physics View {status}")
+                        if not self.debug_mode:
+                            cv2.destroyWindow('Physics View - Debug')
+                    elif key == ord('v'):
+                        show_tracking_view = not show_tracking_view
+                        status = "ENABLED" if show_tracking_view else "DISABLED"
+                        print(f"[TOGGLE] Tracking View {status}")
+                        if not show_tracking_view:
+                            cv2.destroyWindow('Roulette Tracker - Live View')
+                    elif key == ord('p'):
+                        print(f"[CAPTURE] {self.frame_capture.stats()}, {self.frames_over_budget} over budget")
+                        print(self.frame_latency.report())
+                    elif key == ord('t'):
+                        # First press starts timing, later presses print what has been collected
+                        if self.timers.enabled:
+                            print(self.timers.report())
+                        else:
+                            self.timers.enabled = True
+                            print("[TIMING] Stage timing ENABLED")
+                    elif key == ord('q'):
+                        print("\n[EXIT] Shutting down tracker...")
+                        if not headless:
+                            cv2.destroyAllWindows()
+                        break
 
-            except KeyboardInterrupt:
-                print("\n[EXIT] Interrupted by user")
-                cv2.destroyAllWindows()
-                break
-            except Exception as e:
-                consecutive_errors += 1
-                if consecutive_errors % 100 == 0:
-                    print(f"[ERROR] {str(e)}")
-                time.sleep(0.1)
+                except Exception as e:
+                    consecutive_errors += 1
+                    if consecutive_errors % 100 == 0:
+                        print(f"[ERROR] {str(e)}")
+                    await asyncio.sleep(0.1)
+        finally:
+            self.running = False
+
+            def shutdown():
+                # Stopping capture wakes a pending get(); the frame in progress finishes before run() returns
+                self.frame_capture.stop()
+                vision.shutdown()
+                self.shutdown_workers()
+
+            await asyncio.shield(loop.run_in_executor(None, shutdown))
+            print(f"[CAPTURE] {self.frame_capture.stats()}")
+            if self.timers.enabled:
+                print(self.timers.report())
+            print(f"[BUDGET] {self.frames_over_budget} of {self.frame_count} frames over the {self.frame_budget * 1000:.1f} ms budget")
+            print(self.frame_latency.report())
+
+    def frame_grabber(self):
+        """
+        Grab function for the capture thread. mss handles must stay on the
+        thread that opened them, so it opens its own on first use. Frames are
+        tagged with the rect they were grabbed from and are written into the
+        buffer FrameCapture recycles.
+        """
+        local = {}
+
+        def grab(out):
+            if 'sct' not in local:
+                local['sct'] = mss.mss()
+            rect = self.capture_rect()
+            bgra = screenshot_view(local['sct'].grab(rect))
+            if bgra.size == 0:
+                return None
+            # The only copy of the frame: BGRA -> BGR straight into a recycled buffer
+            if out is None or out.shape[:2] != bgra.shape[:2]:
+                out = np.empty(bgra.shape[:2] + (3,), np.uint8)
+            cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+            return out, rect
+
+        return grab
 
     def show_tracking_view(self, frame, result):
         """Show live tracking window with overlays"""
-        display = frame.copy()
-
-        # Resize to fit screen better
-        display = cv2.resize(display, (1280, 720))
+        # Resize to fit screen better (a new image, so the frame itself is never drawn on)
+        display = cv2.resize(frame, (1280, 720))
 
         # Calculate scaling factors
         scale_x = 1280 / frame.shape[1]
@@ -949,9 +1469,11 @@ class ProfessionalRouletteTracker:
             cv2.circle(display, (center_x, center_y), radius, (0, 255, 0), 2)
             cv2.circle(display, (center_x, center_y), 5, (0, 255, 0), -1)
 
-        # Draw ball position
-        ball_x, ball_y = result['ball_coords']
+        # Draw ball position (result coordinates are full-source pixels)
+        ball_x, ball_y = result.ball_x, result.ball_y
         if ball_x is not None and ball_y is not None:
+            if self.M is None:
+                ball_x, ball_y = ball_x - self.capture_offset[0], ball_y - self.capture_offset[1]
             scaled_x = int(ball_x * scale_x)
             scaled_y = int(ball_y * scale_y)
             cv2.circle(display, (scaled_x, scaled_y), 8, (0, 0, 255), -1)
@@ -960,25 +1482,25 @@ class ProfessionalRouletteTracker:
 
         # Status overlay
         y_pos = 30
-        status_color = (0, 255, 0) if result['is_spinning'] else (100, 100, 100)
+        status_color = (0, 255, 0) if result.is_spinning else (100, 100, 100)
         cv2.putText(display, f"State: {self.state}", (10, y_pos),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
         y_pos += 35
 
-        cv2.putText(display, f"Confidence: {result['confidence']:.0f}%", (10, y_pos),
+        cv2.putText(display, f"Confidence: {result.confidence:.0f}%", (10, y_pos),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         y_pos += 30
 
-        cv2.putText(display, f"Ball RPM: {result['ball_rpm']:.0f}", (10, y_pos),
+        cv2.putText(display, f"Ball RPM: {result.ball_rpm:.0f}", (10, y_pos),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         y_pos += 30
 
-        cv2.putText(display, f"Wheel RPM: {result['wheel_rpm']:.0f}", (10, y_pos),
+        cv2.putText(display, f"Wheel RPM: {result.wheel_rpm:.0f}", (10, y_pos),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         y_pos += 30
 
-        if result['prediction'] != -1:
-            cv2.putText(display, f"PREDICTION: {result['prediction']}", (10, y_pos),
+        if result.prediction != -1:
+            cv2.putText(display, f"PREDICTION: {result.prediction}", (10, y_pos),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
 
         # Instructions
@@ -1061,19 +1583,167 @@ def get_chrome_windows():
 
     return windows
 
+# --- Server: window selection over REST and live telemetry over Socket.IO, on SERVER_PORT ---
+SERVER_PORT = 8000
+
+
+class WindowSelection(BaseModel):
+    title: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+telemetry = TelemetryHub(sio)
+# Created by startup_event: importing main must not open the screen
+tracker = None
+vision_task = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+app_asgi = socketio.ASGIApp(sio, app)
+
+
+@app.get('/api/windows')
+async def list_windows():
+    try:
+        return {'windows': get_chrome_windows()}
+    except Exception as e:
+        print(f"[SERVER] Listing windows failed: {e}")
+        return {'windows': [], 'error': str(e)}
+
+
+def running_tracker():
+    """The tracker startup_event created; 503 before that, or when the app is mounted without its lifespan"""
+    if tracker is None:
+        raise HTTPException(status_code=503, detail='Tracker not started')
+    return tracker
+
+
+@app.post('/api/select-window')
+async def select_window(window: WindowSelection):
+    running_tracker().select_source({'top': window.y, 'left': window.x, 'width': window.width, 'height': window.height},
+                                    window.title)
+    return {'status': 'ok', 'window': window.title}
+
+
+@app.post('/api/reset-window')
+async def reset_window():
+    running_tracker().select_source(None, None)
+    return {'status': 'ok'}
+
+
+@app.get('/api/telemetry')
+async def telemetry_stats():
+    running_tracker()
+    return telemetry.stats()
+
+
+@sio.on('connect')
+async def client_connected(sid, environ, auth=None):
+    telemetry.add_client(sid)
+    if telemetry.board is not None:
+        await sio.emit('board_detected', telemetry.board, to=sid)
+
+
+@sio.on('disconnect')
+async def client_disconnected(sid, *args):
+    telemetry.remove_client(sid)
+
+
+@sio.on('telemetry_options')
+async def telemetry_options(sid, data):
+    """{'format': 'json' | 'msgpack', 'delta': bool, 'max_hz': float}; the ack says what is in effect"""
+    return telemetry.configure(sid, data)
+
+
+async def startup_event():
+    """Vision loop and telemetry broadcast as tasks on the server's event loop; frames are processed on the vision executor"""
+    global tracker, vision_task
+    if tracker is None:
+        tracker = ProfessionalRouletteTracker()
+    telemetry.bind(asyncio.get_running_loop())
+    telemetry.board_info = tracker.board_info
+    tracker.telemetry = telemetry
+    vision_task = asyncio.create_task(serve_vision(tracker))
+
+
+async def serve_vision(tracker):
+    broadcaster = asyncio.create_task(telemetry.run())
+    try:
+        await tracker.run(headless=True)
+    except Exception as e:
+        print(f"[SERVER] Vision loop stopped: {e}")
+    finally:
+        broadcaster.cancel()
+
+
+async def shutdown_event():
+    if tracker is not None:
+        tracker.stop()
+    if vision_task is not None:
+        try:
+            await asyncio.wait_for(vision_task, 5.0)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+
+
+def start_metrics(tracker):
+    """Unattended runs are watched through http://127.0.0.1:9108/metrics"""
+    tracker.timers.enabled = True
+    tracker.metrics = TrackerMetrics(tracker)
+    try:
+        MetricsServer(tracker.metrics).start()
+    except OSError as e:
+        print(f"[METRICS] Endpoint not started: {e}")
+
+
 if __name__ == "__main__":
+    if '--terminal' not in sys.argv:
+        import uvicorn
+        print("\n" + "="*60)
+        print(f"ROULETTE TRACKER - SERVER MODE (http://localhost:{SERVER_PORT}, --terminal for the local view)")
+        print("="*60)
+
+        tracker = ProfessionalRouletteTracker()
+        tracker.prediction_table = PredictionTable.open(build=True)
+        start_metrics(tracker)
+        uvicorn.run(app_asgi, host='127.0.0.1', port=SERVER_PORT)
+        sys.exit(0)
+
     print("\n" + "="*60)
     print("ROULETTE TRACKER - TERMINAL MODE")
     print("="*60)
 
     tracker = ProfessionalRouletteTracker()
+    tracker.prediction_table = PredictionTable.open(build=True)
     tracker.initialize_calibration()
+    start_metrics(tracker)
 
     print("\n" + "="*60)
     print("KEYBOARD SHORTCUTS:")
     print("  'v' - Toggle live tracking view")
     print("  'd' - Toggle Physics View (debug window)")
+    print("  'p' - Print capture counters (captured/dropped/processed) and capture-to-output latency")
+    print("  't' - Start stage timing / print per-stage latency (p50/p95/p99)")
     print("  'q' - Quit")
     print("="*60 + "\n")
 
-    tracker.run()
+    try:
+        asyncio.run(tracker.run())
+    except KeyboardInterrupt:
+        # asyncio.run has cancelled run(), which stopped capture on the way out
+        print("\n[EXIT] Interrupted by user")
+        cv2.destroyAllWindows()
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local scrape endpoint: http://127.0.0.1:METRICS_PORT/metrics
+METRICS_PORT = 9108
+# Frames the effective fps is measured over
+FPS_WINDOW = 120
+
+QUANTILES = [('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')]
+
+
+class TrackerMetrics:
+    """
+    Counters for one tracker, fed one FrameResult at a time by the frame
+    loop (observe() is a few integer updates) and rendered in Prometheus
+    text format on scrape. Capture counters and stage latencies are read
+    from the tracker's FrameCapture and StageTimers at scrape time.
+    """
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.frames = 0
+        self.ball_found = 0
+        self.wheel_found = 0
+        self.confidence = 0.0
+        self.spins_started = 0
+        self.spins_finished = 0
+        self.predictions = 0
+        self.over_budget = 0
+        self.transitions = {}
+        self.state = None
+        self._predicted = False
+        self._frame_times = deque(maxlen=FPS_WINDOW)
+
+    def observe(self, result):
+        self.frames += 1
+        self._frame_times.append(time.monotonic())
+        self.ball_found += bool(result.ball_found)
+        self.wheel_found += bool(result.wheel_found)
+        self.confidence = float(result.confidence)
+        self.over_budget += bool(result.over_budget)
+
+        state = "SPINNING" if result.is_spinning else "IDLE"
+        if state != self.state:
+            if self.state is not None:
+                key = (self.state, state)
+                self.transitions[key] = self.transitions.get(key, 0) + 1
+                if state == "SPINNING":
+                    self.spins_started += 1
+            self.state = state
+        if result.prediction != -1 and not self._predicted:
+            self.predictions += 1
+        self._predicted = result.prediction != -1
+        if result.spin_finished is not None:
+            self.spins_finished += 1
+            self._predicted = False
+
+    def fps(self):
+        times = self._frame_times
+        if len(times) < 2:
+            return 0.0
+        # A stalled loop shows as a falling rate, not the last good one
+        span = max(times[-1] - times[0], time.monotonic() - times[-1])
+        return (len(times) - 1) / span if span > 0 else 0.0
+
+    def render(self):
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP roulette_{name} {help_text}")
+            lines.append(f"# TYPE roulette_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"roulette_{name}{{{label_text}}} {value}" if label_text else f"roulette_{name} {value}")
+
+        capture = self.tracker.frame_capture.stats() if self.tracker.frame_capture is not None else {}
+        metric('frames_processed_total', 'counter', "Frames through process_frame", [({}, self.frames)])
+        metric('frames_captured_total', 'counter', "Frames grabbed by the capture thread", [({}, capture.get('captured', 0))])
+        metric('frames_dropped_total', 'counter', "Grabbed frames never processed", [({}, capture.get('dropped', 0))])
+        metric('capture_errors_total', 'counter', "Failed grabs", [({}, capture.get('errors', 0))])
+        metric('frames_over_budget_total', 'counter', "Frames whose processing overran the frame budget",
+               [({}, self.over_budget)])
+        metric('fps', 'gauge', f"Processed frames per second over the last {FPS_WINDOW} frames", [({}, f"{self.fps():.3f}")])
+        metric('ball_found_total', 'counter', "Frames where the ball was found", [({}, self.ball_found)])
+        metric('wheel_found_total', 'counter', "Frames where the zero marker was found", [({}, self.wheel_found)])
+        metric('confidence', 'gauge', "Tracking confidence of the last frame (0-100)", [({}, f"{self.confidence:.3f}")])
+        metric('spinning', 'gauge', "1 while a spin is being tracked", [({}, int(self.state == "SPINNING"))])
+        metric('state_transitions_total', 'counter', "Spin state machine transitions",
+               [({'from': a, 'to': b}, n) for (a, b), n in sorted(self.transitions.items())])
+        metric('spins_started_total', 'counter', "Spins detected", [({}, self.spins_started)])
+        metric('spins_finished_total', 'counter', "Spins that ended with a result", [({}, self.spins_finished)])
+        metric('predictions_total', 'counter', "Predictions made", [({}, self.predictions)])
+
+        # Capture timestamp to result / to display, per frame
+        paths = self.tracker.frame_latency.summary()
+        if paths:
+            lines.append("# HELP roulette_frame_latency_seconds Time since the frame was captured")
+            lines.append("# TYPE roulette_frame_latency_seconds summary")
+            for path, s in sorted(paths.items()):
+                for quantile, key in QUANTILES:
+                    lines.append(f'roulette_frame_latency_seconds{{path="{path}",quantile="{quantile}"}} {s[key] / 1000:.6f}')
+                lines.append(f'roulette_frame_latency_seconds_sum{{path="{path}"}} {s["sum"] / 1000:.6f}')
+                lines.append(f'roulette_frame_latency_seconds_count{{path="{path}"}} {s["count"]}')
+
+        stages = self.tracker.timers.summary()
+        if stages:
+            # Quantiles over the StageTimers window; sum and count are lifetime, as Prometheus expects
+            lines.append("# HELP roulette_stage_latency_seconds Frame loop stage latency")
+            lines.append("# TYPE roulette_stage_latency_seconds summary")
+            for stage, s in sorted(stages.items()):
+                for quantile, key in QUANTILES:
+                    lines.append(f'roulette_stage_latency_seconds{{stage="{stage}",quantile="{quantile}"}} {s[key] / 1000:.6f}')
+                lines.append(f'roulette_stage_latency_seconds_sum{{stage="{stage}"}} {s["sum"] / 1000:.6f}')
+                lines.append(f'roulette_stage_latency_seconds_count{{stage="{stage}"}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """
+    Serves `metrics.render()` at /metrics from a daemon thread, so scrapes
+    never touch the frame loop. Binds to localhost only; port=0 picks a
+    free port (see `port` after start()).
+    """
+
+    def __init__(self, metrics, host='127.0.0.1', port=METRICS_PORT):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        if self._server is not None:
+            return
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                try:
+                    body = metrics.render().encode()
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True)
+        self._thread.start()
+        print(f"[METRICS] Serving http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server, self._thread = None, None
@@ -0,0 +1,468 @@
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+import cv2
+import mss
+import numpy as np
+
+try:
+    from .main import ProfessionalRouletteTracker, screenshot_view
+    from .clock import FrameClock
+    from .frame_capture import CAPTURE_FPS
+    from .pocket_templates import DEFAULT_CALIBRATION_PATH
+    from .replay import SpinRecorder
+    from .result_reader import ResultReader
+except ImportError:
+    from main import ProfessionalRouletteTracker, screenshot_view
+    from clock import FrameClock
+    from frame_capture import CAPTURE_FPS
+    from pocket_templates import DEFAULT_CALIBRATION_PATH
+    from replay import SpinRecorder
+    from result_reader import ResultReader
+
+# Frame slots per table (or per union grab) in shared memory: one being processed, one being filled
+TABLE_SLOTS = 2
+# Events buffered for the consumer before the oldest are dropped
+EVENT_QUEUE_SIZE = 1024
+# Seconds a worker gets to exit before it is terminated
+WORKER_JOIN_TIMEOUT = 5.0
+
+
+def table_calibration_path(index):
+    """Each table keeps its templates apart from the others (and from the single-table calibration)"""
+    directory, name = os.path.split(DEFAULT_CALIBRATION_PATH)
+    base, ext = os.path.splitext(name)
+    return os.path.join(directory, f"{base}_table{index}{ext}")
+
+
+def union_region(regions):
+    """Smallest rect covering every region, in the same {'top', 'left', 'width', 'height'} form"""
+    top = min(r['top'] for r in regions)
+    left = min(r['left'] for r in regions)
+    bottom = max(r['top'] + r['height'] for r in regions)
+    right = max(r['left'] + r['width'] for r in regions)
+    return {'top': top, 'left': left, 'width': right - left, 'height': bottom - top}
+
+
+def table_worker(index, table, shm_name, shape, offset, tasks, results):
+    """
+    Worker process for one table. Frames arrive as (slot, seq, timestamp)
+    on `tasks`, the pixels already in shared-memory slot `slot`; every frame
+    is answered on `results` with ('frame', index, slot, seq, timestamp,
+    latency, result dict), plus ('spin', index, summary) when a spin ends.
+    The slot is free again once its answer is sent. None on `tasks` stops
+    the worker.
+
+    `shape` is the shape of one slot and `offset` the (top, left) of this
+    table's region inside it: (0, 0) when the slot holds just this table,
+    elsewhere when it holds a union grab shared with other tables. Either
+    way the tracker gets a view of the slot, never a copy.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = None
+    tracker = None
+    try:
+        frames = np.ndarray((TABLE_SLOTS,) + tuple(shape), np.uint8, buffer=shm.buf)
+        height, width = table['region']['height'], table['region']['width']
+        top, left = offset
+        frames = frames[:, top:top + height, left:left + width]
+        tracker = ProfessionalRouletteTracker(monitor={'top': 0, 'left': 0, 'width': width, 'height': height})
+        tracker.clock = FrameClock()
+        # The worker is daemonic and may not start the reader's process pool
+        tracker.result_reader = ResultReader(threads=True)
+        tracker.calibration_path = table.get('calibration_path') or table_calibration_path(index)
+        # A live table keeps its pocket templates across restarts, like the interactive calibration
+        tracker.persist_calibration = True
+        for name, value in table.get('settings', {}).items():
+            setattr(tracker, name, value)
+        if table.get('points') is not None:
+            tracker.set_calibration_points(table['points'])
+        spins = SpinRecorder()
+
+        last_timestamp = None
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, seq, timestamp = task
+            dt = max(timestamp - last_timestamp, 0.001) if last_timestamp is not None else 1.0 / CAPTURE_FPS
+            last_timestamp = timestamp
+            tracker.clock.set(timestamp)
+            try:
+                # time.monotonic() is system-wide, so the supervisor's capture timestamp holds here too
+                result = tracker.process_frame(frames[slot], dt, seq, timestamp)
+            except Exception as e:
+                print(f"[TABLE {index}] Frame {seq} failed: {e}")
+                results.put(('frame', index, slot, seq, timestamp, time.monotonic() - timestamp, None))
+                continue
+            results.put(('frame', index, slot, seq, timestamp, result.latency, result.to_dict()))
+            summary = spins.add(seq, timestamp, result)
+            if summary is not None:
+                results.put(('spin', index, summary))
+    finally:
+        if tracker is not None:
+            tracker.shutdown_workers()
+        del frames
+        shm.close()
+
+
+def screen_grabber():
+    """
+    Default grab for the supervisor's capture thread: each table's region
+    (or the union of them all) straight off the screen, BGRA -> BGR into
+    its shared-memory slot. A screenshot that does not match the slot
+    (HiDPI scaling, a region partly off-screen) raises ValueError.
+    """
+    local = {}
+
+    def grab(index, region, out):
+        if 'sct' not in local:
+            local['sct'] = mss.mss()
+        bgra = screenshot_view(local['sct'].grab(region))
+        if bgra.shape[:2] != out.shape[:2]:
+            raise ValueError(f"screenshot is {bgra.shape[1]}x{bgra.shape[0]}, "
+                             f"region is {out.shape[1]}x{out.shape[0]}")
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+        return True
+
+    return grab
+
+
+class FrameSlots:
+    """
+    TABLE_SLOTS frames of one region in shared memory. A slot handed to
+    several tables (a union grab) is free again once all of them are done.
+    """
+
+    def __init__(self, region):
+        self.region = region
+        self.shape = (region['height'], region['width'], 3)
+        size = TABLE_SLOTS * int(np.prod(self.shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.frames = np.ndarray((TABLE_SLOTS,) + self.shape, np.uint8, buffer=self.shm.buf)
+        self.free = list(range(TABLE_SLOTS))
+        self.pending = [0] * TABLE_SLOTS
+
+    def release(self, slot):
+        self.pending[slot] -= 1
+        if self.pending[slot] <= 0:
+            self.free.append(slot)
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class TableChannel:
+    """Supervisor-side state of one table: where its frames land, its queue, worker and counters"""
+
+    def __init__(self, index, table, context, slots=None):
+        self.index = index
+        self.table = table
+        self.region = table['region']
+        # Own slots, or a view into slots shared with every table (union capture)
+        self.owns_slots = slots is None
+        self.slots = FrameSlots(self.region) if slots is None else slots
+        self.offset = (self.region['top'] - self.slots.region['top'], self.region['left'] - self.slots.region['left'])
+        self.tasks = context.Queue()
+        self.process = None
+        # Slots queued to the worker and not yet answered, so a dead worker's can be released
+        self.held = []
+        self.dead = False
+
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+        self.grab_errors = 0
+        self.spins = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.over_budget = 0
+
+    def close(self):
+        if self.owns_slots:
+            self.slots.close()
+
+
+class MultiTableSupervisor:
+    """
+    Tracks several tables at once, one tracker per worker process so the
+    per-frame work runs on as many cores as there are tables.
+
+    `tables` is a list of dicts: 'region' (the {'top', 'left', 'width',
+    'height'} rect to grab), and optionally 'points' (calibration points
+    in region pixels), 'settings' (tracker attributes to set, e.g.
+    {'ball_detector': 'strip'}) and 'calibration_path'.
+
+    One capture thread grabs every table in turn with `grab(index, region,
+    out)`, writing straight into a free shared-memory slot of that table;
+    only (slot, seq, timestamp) is queued to the worker. A table whose
+    slots are all busy drops the frame.
+
+    With union=True (tables on the same monitor) the capture thread instead
+    grabs the rect covering every region once per tick, as `grab(None,
+    union, out)`, and each worker slices its table out of that shared slot:
+    one grab and one timestamp for all tables. The slot is reused once every
+    table has answered, so the slowest table sets the pace and a tick with
+    no free slot is dropped for all of them. A worker that dies is reported
+    and its slots are released, so the other tables keep going without it.
+    A grab that raises counts as a grab error of every table it was for;
+    each distinct error is logged once. Results and spin summaries from all
+    workers come back on one queue and are merged into a single event
+    stream: get() returns {'type': 'frame' | 'spin', 'table': index, ...}.
+    """
+
+    def __init__(self, tables, grab=None, fps=CAPTURE_FPS, event_queue_size=EVENT_QUEUE_SIZE, union=False):
+        # fps=0: no pacing, each table is grabbed again as soon as it has a free slot (nothing dropped)
+        self.tables = tables
+        self.union = union_region([t['region'] for t in tables]) if union else None
+        self.union_slots = None
+        self.grab = grab if grab is not None else screen_grabber()
+        self.interval = 1.0 / fps if fps else 0.0
+        # spawn: the supervisor runs threads, which fork does not mix well with
+        self._context = multiprocessing.get_context('spawn')
+        self.channels = []
+        self._results = None
+        self._events = queue.Queue(event_queue_size)
+        self.events_dropped = 0
+        self._grab_errors_logged = set()
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        if self._running:
+            return
+        self._results = self._context.Queue()
+        try:
+            if self.union is not None:
+                self.union_slots = FrameSlots(self.union)
+            for index, table in enumerate(self.tables):
+                channel = TableChannel(index, table, self._context, self.union_slots)
+                self.channels.append(channel)
+                channel.process = self._context.Process(
+                    target=table_worker, name=f'table-{index}', daemon=True,
+                    args=(index, table, channel.slots.shm.name, channel.slots.shape, channel.offset,
+                          channel.tasks, self._results))
+                channel.process.start()
+        except:
+            self.stop()
+            raise
+        self._running = True
+        for target, name in [(self._capture_loop, 'table-capture'), (self._collect_loop, 'table-results')]:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"[TABLES] Tracking {len(self.channels)} tables")
+
+    def stop(self):
+        self._running = False
+        capture, collect = (self._threads + [None, None])[:2]
+        if capture is not None:
+            capture.join()
+        for channel in self.channels:
+            if channel.process is not None and channel.process.is_alive():
+                channel.tasks.put(None)
+        for channel in self.channels:
+            if channel.process is not None:
+                channel.process.join(WORKER_JOIN_TIMEOUT)
+                if channel.process.is_alive():
+                    channel.process.terminate()
+        # Every worker has flushed its results by now: the collector drains them, then stops
+        if self._results is not None:
+            self._results.put(None)
+        if collect is not None:
+            collect.join()
+        self._threads = []
+        for channel in self.channels:
+            channel.close()
+        self.channels = []
+        if self.union_slots is not None:
+            self.union_slots.close()
+            self.union_slots = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get(self, timeout=None):
+        """Next event from any table, or None on timeout"""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stats(self):
+        """Per-table counters plus the totals"""
+        with self._lock:
+            tables = [{'table': c.index, 'captured': c.captured, 'dropped': c.dropped, 'processed': c.processed,
+                       'failed': c.failed, 'grab_errors': c.grab_errors, 'spins': c.spins, 'over_budget': c.over_budget,
+                       'alive': c.process is not None and c.process.is_alive(),
+                       'mean_latency': c.latency_sum / c.processed if c.processed else 0.0,
+                       'max_latency': c.latency_max} for c in self.channels]
+        totals = {key: sum(t[key] for t in tables)
+                  for key in ('captured', 'dropped', 'processed', 'failed', 'grab_errors', 'spins', 'over_budget')}
+        totals['events_dropped'] = self.events_dropped
+        return {'tables': tables, 'totals': totals, 'dead_workers': [t['table'] for t in tables if not t['alive']]}
+
+    def _capture_loop(self):
+        next_grab = time.monotonic()
+        while self._running:
+            self._reap_dead_workers()
+            live = [channel for channel in self.channels if not channel.dead]
+            if self.union_slots is not None:
+                grabbed_any = bool(live) and self._grab(self.union_slots, None, live)
+            else:
+                grabbed_any = False
+                for channel in live:
+                    grabbed_any |= self._grab(channel.slots, channel.index, [channel])
+
+            if not self.interval:
+                if not grabbed_any:
+                    with self._slot_freed:
+                        self._slot_freed.wait(0.1)
+                continue
+            # Fixed cadence, as in FrameCapture
+            next_grab += self.interval
+            delay = next_grab - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_grab = time.monotonic()
+
+    def _reap_dead_workers(self):
+        """Release the slots of workers that exited on their own; they will never answer for them"""
+        for channel in self.channels:
+            if channel.dead or channel.process is None or channel.process.is_alive():
+                continue
+            with self._lock:
+                channel.dead = True
+                held, channel.held = channel.held, []
+                for slot in held:
+                    channel.slots.release(slot)
+                self._slot_freed.notify_all()
+            print(f"[TABLES] Table {channel.index} worker exited (code {channel.process.exitcode}), "
+                  f"released {len(held)} slots")
+
+    def _grab(self, slots, index, channels):
+        """One grab into a free slot of `slots`, queued to every channel in `channels`"""
+        with self._lock:
+            slot = slots.free.pop() if slots.free else None
+            if slot is None:
+                # Paced capture drops the frame; unpaced capture just waits for the workers
+                for channel in channels:
+                    channel.dropped += self.interval > 0
+                return False
+        try:
+            grabbed = self.grab(index, slots.region, slots.frames[slot])
+        except Exception as e:
+            grabbed = False
+            with self._lock:
+                for channel in channels:
+                    channel.grab_errors += 1
+            # A bad region fails every tick: say so once, the count is in stats()
+            if (index, str(e)) not in self._grab_errors_logged:
+                self._grab_errors_logged.add((index, str(e)))
+                print(f"[TABLES] Grab failed for {'the union' if index is None else f'table {index}'}: {e}")
+        timestamp = time.monotonic()
+        with self._lock:
+            if not grabbed:
+                slots.free.append(slot)
+                return False
+            slots.pending[slot] = len(channels)
+            tasks = []
+            for channel in channels:
+                channel.captured += 1
+                channel.held.append(slot)
+                tasks.append((channel, channel.captured))
+        for channel, seq in tasks:
+            channel.tasks.put((slot, seq, timestamp))
+        return True
+
+    def _collect_loop(self):
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+            if message[0] == 'frame':
+                _, index, slot, seq, timestamp, latency, result = message
+                channel = self.channels[index]
+                with self._lock:
+                    # Not held any more when the worker died and its slots were already released
+                    if slot in channel.held:
+                        channel.held.remove(slot)
+                        channel.slots.release(slot)
+                        self._slot_freed.notify_all()
+                    if result is None:
+                        channel.failed += 1
+                        continue
+                    channel.processed += 1
+                    channel.latency_sum += latency
+                    channel.latency_max = max(channel.latency_max, latency)
+                    channel.over_budget += result['over_budget']
+                event = {'type': 'frame', 'table': index, 'seq': seq, 'timestamp': timestamp, 'latency': latency}
+                event.update(result)
+            else:
+                _, index, summary = message
+                with self._lock:
+                    self.channels[index].spins += 1
+                event = {'type': 'spin', 'table': index}
+                event.update(summary)
+            self._publish(event)
+
+    def _publish(self, event):
+        # A slow consumer loses the oldest events, never stalls the workers
+        while True:
+            try:
+                self._events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._events.get_nowait()
+                    self.events_dropped += 1
+                except queue.Empty:
+                    pass
+
+
+def parse_region(text):
+    left, top, width, height = (int(v) for v in text.split(','))
+    return {'top': top, 'left': left, 'width': width, 'height': height}
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != '--union']
+    if not args:
+        print("Usage: python multi_table.py [--union] LEFT,TOP,WIDTH,HEIGHT [LEFT,TOP,WIDTH,HEIGHT ...]")
+        sys.exit(1)
+
+    supervisor = MultiTableSupervisor([{'region': parse_region(arg)} for arg in args], union='--union' in sys.argv)
+    supervisor.start()
+    last_stats = time.monotonic()
+    try:
+        while True:
+            event = supervisor.get(timeout=0.5)
+            if event is not None and event['type'] == 'spin':
+                print(f"[TABLES] Table {event['table']}: spin {event['spin']} predicted {event['prediction']}, "
+                      f"number {event['number']}")
+            if time.monotonic() - last_stats > 5.0:
+                last_stats = time.monotonic()
+                for table in supervisor.stats()['tables']:
+                    print(f"[TABLES] Table {table['table']}: {table['processed']} processed, {table['dropped']} dropped, "
+                          f"latency {table['mean_latency'] * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
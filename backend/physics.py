@@ -0,0 +1,459 @@
+import math
+import numpy as np
+
+POCKETS = [0, 28, 9, 26, 30, 11, 7, 20, 32, 17, 5, 22, 34, 15, 3, 24, 36, 13, 1, 37, 27, 10, 25, 29, 12, 8, 19, 31, 18, 6, 21, 33, 16, 4, 23, 35, 14, 2]
+WHEEL_FRICTION, BALL_FRICTION, GRAVITY = 0.9985, 0.996, 0.012
+
+# Simulation parameters shared by the stepwise reference and the closed-form engine
+MAX_STEPS = 5000
+START_DIST = 5.1
+MIN_DIST = 4.0
+LOCK_DIST = 4.3
+LOCK_SPEED_DIFF = 0.008
+CENTRIFUGAL = 0.0008
+
+# The closed-form lock step matches the stepwise loop exactly except for float
+# rounding right at the LOCK_DIST boundary, where it may differ by one step.
+# Ball and wheel speeds differ by less than LOCK_SPEED_DIFF at lock, so the
+# final relative angle always agrees to within this many radians.
+ANGLE_TOLERANCE = LOCK_SPEED_DIFF
+
+TWO_PI = math.pi * 2
+POCKET_ANGLE = TWO_PI / 38
+
+_LN_WHEEL = -math.log(WHEEL_FRICTION)
+_LN_BALL = -math.log(BALL_FRICTION)
+_BETA = BALL_FRICTION * BALL_FRICTION
+
+# The closed form needs the ball to lose height on every step (centrifugal lift
+# below gravity). lock_step hands faster balls to the stepwise loop; lock_steps
+# solves them with fast_ball_distance.
+MAX_CLOSED_FORM_BALL_SPEED = math.sqrt(GRAVITY / (CENTRIFUGAL * _BETA * START_DIST))
+
+
+def simulate_stepwise(w_speed, b_speed):
+    """
+    Reference step-by-step simulation (the original predict loop).
+    Returns (steps, wheel_travel, ball_travel) until the ball locks.
+    """
+    sw, sb = abs(w_speed), abs(b_speed)
+    wa, ba = 0.0, 0.0
+    dist = START_DIST
+    steps = 0
+
+    for _ in range(MAX_STEPS):
+        wa += sw
+        ba += sb
+        steps += 1
+
+        sw *= WHEEL_FRICTION
+        sb *= BALL_FRICTION
+
+        centrifugal = sb * sb * dist * CENTRIFUGAL
+        dist += centrifugal - GRAVITY
+        dist = max(dist, MIN_DIST)
+
+        # Lock when speeds match and ball is close to wheel
+        if dist < LOCK_DIST and abs(sb - sw) < LOCK_SPEED_DIFF:
+            break
+
+    return steps, wa, ba
+
+
+def ball_distance(k, sb):
+    """
+    Ball distance after k steps, ignoring the MIN_DIST clamp.
+
+    dist_k = a_k * dist_{k-1} - GRAVITY with a_k = 1 + q * beta^k unrolls to
+    P_k * (START_DIST - GRAVITY * sum(1 / P_j)). ln P_k is a geometric series
+    and the sum is expanded to second order in ln P_j.
+    Works on Python floats and NumPy arrays alike.
+    """
+    q = CENTRIFUGAL * sb * sb
+    bk = _BETA ** k
+    a = q * _BETA / (1 - _BETA)
+    geo1 = _BETA * (1 - bk) / (1 - _BETA)
+    geo2 = _BETA * _BETA * (1 - bk * bk) / (1 - _BETA * _BETA)
+
+    log_p = a * (1 - bk) - 0.5 * q * q * geo2
+    sum_l = a * (k - geo1)
+    sum_l2 = a * a * (k - 2 * geo1 + geo2)
+    return (START_DIST - GRAVITY * (k - sum_l + 0.5 * sum_l2)) * math.e ** log_p
+
+
+def speed_diff(k, sw, sb):
+    """Ball speed minus wheel speed after k steps (floats or arrays)"""
+    return sb * BALL_FRICTION ** k - sw * WHEEL_FRICTION ** k
+
+
+def speed_turning_step(sw, sb):
+    """
+    Step where speed_diff turns from decreasing to increasing.
+    0 when it only increases, MAX_STEPS when it only decreases.
+    """
+    if sw == 0:
+        return MAX_STEPS
+    if sb == 0:
+        return 0
+    turn = math.log((_LN_BALL * sb) / (_LN_WHEEL * sw)) / (_LN_BALL - _LN_WHEEL)
+    return int(min(max(math.floor(turn), 0), MAX_STEPS))
+
+
+def _first_step(predicate, lo, hi):
+    """First integer k in [lo, hi] where a monotone False->True predicate holds, else hi + 1"""
+    hi += 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if predicate(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def lock_step(w_speed, b_speed):
+    """
+    Closed-form number of steps until the ball locks into the wheel.
+
+    The ball locks at the first step k where ball_distance(k) < LOCK_DIST and
+    |speed_diff(k)| < LOCK_SPEED_DIFF. The distance is monotone and the speed
+    difference is monotone on either side of its turning step, so each boundary
+    is found by bisection in O(log MAX_STEPS) instead of walking every step.
+    """
+    sw, sb = abs(w_speed), abs(b_speed)
+    if sb >= MAX_CLOSED_FORM_BALL_SPEED:
+        return simulate_stepwise(sw, sb)[0]
+
+    k_drop = _first_step(lambda k: ball_distance(k, sb) < LOCK_DIST, 1, MAX_STEPS)
+    split = speed_turning_step(sw, sb)
+
+    # Decreasing side [1, split]: |diff| < eps on [first diff < eps, last diff > -eps]
+    dec_lo = _first_step(lambda k: speed_diff(k, sw, sb) < LOCK_SPEED_DIFF, 1, split)
+    dec_hi = _first_step(lambda k: speed_diff(k, sw, sb) <= -LOCK_SPEED_DIFF, 1, split) - 1
+    start = max(k_drop, dec_lo)
+    if start <= dec_hi:
+        return start
+
+    # Increasing side (split, MAX_STEPS]: diff stays negative and rises towards 0
+    inc_lo = _first_step(lambda k: speed_diff(k, sw, sb) > -LOCK_SPEED_DIFF, split + 1, MAX_STEPS)
+    return min(max(k_drop, inc_lo), MAX_STEPS)
+
+
+def travel(speed, friction, steps):
+    """Total angle covered by `steps` geometrically decaying increments"""
+    return abs(speed) * (1 - friction ** steps) / (1 - friction)
+
+
+def pocket_from_angle(rel_angle):
+    """Pocket number for a ball angle relative to the wheel (nearest pocket)"""
+    rel_angle = rel_angle % TWO_PI
+    return POCKETS[int(rel_angle / POCKET_ANGLE + 0.5) % 38]
+
+
+def final_relative_angle(w_speed, b_speed, w_angle, b_angle):
+    """Ball angle relative to the wheel once the ball has locked"""
+    steps = lock_step(w_speed, b_speed)
+    wa = w_angle + travel(w_speed, WHEEL_FRICTION, steps)
+    ba = b_angle + travel(b_speed, BALL_FRICTION, steps)
+    return (ba - wa) % TWO_PI
+
+
+
+# Batched engine: the same closed form evaluated for arrays of speeds at once
+
+_STEP_INDEX = np.arange(MAX_STEPS + 2)
+_WHEEL_POW = WHEEL_FRICTION ** _STEP_INDEX
+_BALL_POW = BALL_FRICTION ** _STEP_INDEX
+# travel() per unit speed for every step count
+_WHEEL_TRAVEL = (1 - _WHEEL_POW) / (1 - WHEEL_FRICTION)
+_BALL_TRAVEL = (1 - _BALL_POW) / (1 - BALL_FRICTION)
+_POCKET_ARRAY = np.array(POCKETS)
+
+# The ball drops at most GRAVITY per step, so it can never reach LOCK_DIST sooner
+_MIN_DROP_STEP = int((START_DIST - LOCK_DIST) // GRAVITY) + 1
+_SEARCH_WINDOW = 4
+_NEWTON_ITERATIONS = 3
+# Drop steps are scanned rather than bisected over ranges up to this many steps
+_DROP_SCAN_WIDTH = 16
+_RNG = np.random.default_rng()
+
+# Default Monte Carlo batch, sized to cost less than one stepwise predict
+DISTRIBUTION_SAMPLES = 256
+
+# One turn per frame. A measured speed never gets here (angles wrap); slower noise samples do
+MAX_SERIES_BALL_SPEED = TWO_PI
+
+
+def _lift_series(tolerance=1e-16):
+    """
+    Power series coefficients (in y, from y^1) of prod_i (1 + y beta^i) and of
+    the sum of its tail over the steps, cut off where the terms drop below
+    `tolerance` at the fastest series ball.
+    """
+    y_max = CENTRIFUGAL * MAX_SERIES_BALL_SPEED ** 2
+    lift, tail = [], []
+    coeff, n = 1.0, 0
+    while n < 4 or tail[-1] * y_max ** n >= tolerance:
+        n += 1
+        beta_n = _BETA ** n
+        coeff *= beta_n / (1 - beta_n)
+        lift.append(coeff)
+        tail.append(coeff * beta_n / (1 - beta_n))
+    return np.array([lift, tail]).T
+
+
+_LIFT_SERIES = _lift_series()
+
+
+def fast_ball_distance(sb):
+    """
+    Exact unclamped ball distance for arrays of ball speeds, including the
+    balls too fast for ball_distance (they rise before they fall). Returns
+    a function of the step k.
+
+    With y = q * beta^k, P_k = G(q) / G(y) where G(y) = prod_i (1 + y beta^i)
+    has the q-binomial series sum_n beta^(n(n+1)/2) y^n / prod_(j<=n) (1 - beta^j),
+    and sum_j 1/P_j = (k + H(q) - H(y)) / G(q) with H summing the tail of G.
+    Both series have fixed coefficients, so each evaluation is a matrix product.
+    """
+    q = CENTRIFUGAL * sb * sb
+
+    def series(y):
+        powers = np.cumprod(np.repeat(y[..., None], len(_LIFT_SERIES), axis=-1), axis=-1)
+        lift, tail = np.moveaxis(powers @ _LIFT_SERIES, -1, 0)
+        return 1 + lift, tail
+
+    lift_q, tail_q = series(q)
+
+    def distance(k):
+        lift, tail = series(q * _BETA ** k)
+        return (START_DIST * lift_q - GRAVITY * (k + tail_q - tail)) / lift
+
+    return distance
+
+
+def _first_steps(predicate, lo, hi):
+    """Vectorized _first_step over arrays of bounds"""
+    hi = hi + 1
+    for _ in range(int((hi - lo).max(initial=0)).bit_length()):
+        mid = (lo + hi) >> 1
+        hit = predicate(mid) & (lo < hi)
+        hi = np.where(hit, mid, hi)
+        lo = np.where(hit | (lo >= hi), lo, mid + 1)
+    return lo
+
+
+def _diff_predicate(sw, sb, sign, threshold):
+    """Monotone test sign * speed_diff(k) < threshold using the power tables"""
+    return lambda k: sign * (sb * _BALL_POW[k] - sw * _WHEEL_POW[k]) < threshold
+
+
+def _seeded_first_steps(make_predicate, params, lo, hi, estimate):
+    """
+    _first_steps seeded with an estimate of the continuous root. The step
+    right after the estimate is checked directly; rows where that is not
+    the first hit are bisected in a small window around the estimate, and
+    rows the window does not bracket over their full range. make_predicate
+    builds the predicate from the row arrays in params (or a subset of them);
+    lo may be a scalar.
+    """
+    # fmax/fmin also map NaN estimates (no real root) to lo
+    guess = np.fmin(np.fmax(np.floor(estimate) + 1, lo), hi + 1).astype(np.int64)
+    predicate = make_predicate(*params)
+    hit = predicate(np.minimum(guess, hi))
+    # Past hi: right when nothing in [lo, hi] hits, or the range is empty
+    ok = np.where(guess > hi, ~hit | (guess == lo), hit & ((guess == lo) | ~predicate(np.maximum(guess - 1, lo))))
+    if ok.all():
+        return guess
+
+    bad = np.flatnonzero(~ok)
+    lo = np.broadcast_to(lo, guess.shape)
+    wlo = np.maximum(np.minimum(guess[bad] - _SEARCH_WINDOW, hi[bad]), lo[bad])
+    whi = np.minimum(wlo + 2 * _SEARCH_WINDOW, hi[bad])
+    predicate = make_predicate(*(p[bad] for p in params))
+    steps = _first_steps(predicate, wlo, whi)
+    bracketed = ((steps > wlo) | (wlo == lo[bad]) | ~predicate(wlo - 1)) & ((steps <= whi) | (whi == hi[bad]))
+    if not bracketed.all():
+        miss = ~bracketed
+        rows = bad[miss]
+        steps[miss] = _first_steps(make_predicate(*(p[rows] for p in params)), lo[rows], hi[rows])
+    guess[bad] = steps
+    return guess
+
+
+def _drop_bound(sb):
+    """
+    Step by which a slow ball is surely below LOCK_DIST (capped at MAX_STEPS):
+    it loses at least GRAVITY - q * beta * START_DIST per step.
+    """
+    min_drop = np.maximum(GRAVITY - CENTRIFUGAL * sb * sb * _BETA * START_DIST, 0.0)
+    with np.errstate(divide='ignore'):
+        return np.minimum((START_DIST - LOCK_DIST) // min_drop + 2, MAX_STEPS).astype(np.int64)
+
+
+def _slow_drop_predicate(sb):
+    return lambda k: ball_distance(k, sb) < LOCK_DIST
+
+
+def _fast_drop_predicate(sb):
+    distance = fast_ball_distance(sb)
+    return lambda k: distance(k) < LOCK_DIST
+
+
+def _drop_estimate(distance, hi):
+    """
+    Continuous step where the distance falls through LOCK_DIST, from Newton
+    steps (on the step-to-step slope) started at hi. Past its peak the distance
+    is concave and falling, so starting right of the crossing they close in
+    from the right.
+    """
+    k = hi.astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(_NEWTON_ITERATIONS):
+            here = distance(k)
+            k += (here - LOCK_DIST) / (distance(k - 1) - here)
+    return k
+
+
+def _drop_steps(sb, lo, hi):
+    """
+    First step in [lo, hi] where a slow ball is below LOCK_DIST (hi + 1 if
+    none), for rows of ball speeds. Narrow ranges are evaluated at every
+    step in one go; wider ones are seeded with _drop_estimate.
+    """
+    width = int((hi - lo).max(initial=0)) + 1
+    if width > _DROP_SCAN_WIDTH:
+        estimate = _drop_estimate(lambda k: ball_distance(k, sb), hi)
+        return _seeded_first_steps(_slow_drop_predicate, (sb,), lo, hi, estimate)
+    k = lo[:, None] + np.arange(width + 1)
+    below = (ball_distance(k, sb[:, None]) < LOCK_DIST) | (k > hi[:, None])
+    return lo + below.argmax(axis=1)
+
+
+def lock_steps(w_speeds, b_speeds):
+    """
+    Vectorized lock_step for arrays of wheel and ball speeds.
+
+    Same boundaries as lock_step, but the first speed match comes from a few
+    Newton steps on the continuous root of speed_diff(x) = eps and is only
+    checked at the integer step after it; bisection is left for the samples
+    where that check fails. The remaining boundaries are only searched for
+    the samples that actually need them, balls too fast for the closed-form
+    distance included (see fast_ball_distance).
+    """
+    sw = np.abs(np.asarray(w_speeds, dtype=np.float64))
+    sb = np.abs(np.asarray(b_speeds, dtype=np.float64))
+    if sw.shape != sb.shape:
+        sw, sb = np.broadcast_arrays(sw, sb)
+    shape = sw.shape
+    sw, sb = sw.ravel(), sb.ravel()
+    top = float(sb.max(initial=0))
+    delta = _LN_BALL - _LN_WHEEL
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        turn = np.log((_LN_BALL * sb) / (_LN_WHEEL * sw)) / delta
+        # sb == 0 gives -inf, clipped to 0 below
+        turn = np.where(sw == 0, MAX_STEPS, turn)
+        split = np.fmin(np.fmax(np.floor(turn), 0), MAX_STEPS).astype(np.int64)
+
+        # speed_diff(x) = eps  <=>  F(x) = ln(sb) - delta * x - ln(sw + eps * e^(ln_w * x)) = 0.
+        # F is concave and decreasing, so Newton from the zero crossing of speed_diff
+        # (right of the root) closes in without overshooting
+        estimate = np.log(sb / sw) / delta
+        log_sb = np.log(sb)
+        for _ in range(_NEWTON_ITERATIONS):
+            lift = LOCK_SPEED_DIFF * np.exp(_LN_WHEEL * estimate)
+            total = sw + lift
+            estimate += (log_sb - delta * estimate - np.log(total)) / (delta + _LN_WHEEL * lift / total)
+
+    # Decreasing side [1, split]: first step with diff < eps
+    dec_lo = _seeded_first_steps(lambda w, b: _diff_predicate(w, b, 1, LOCK_SPEED_DIFF),
+                                 (sw, sb), 1, split, estimate)
+
+    # Since the distance is monotone, the drop step only needs solving where the first
+    # speed match comes before _drop_bound and the ball is still high. The loosest bound
+    # (fastest slow ball) is checked first: usually every sample is past it already.
+    k_drop = np.zeros_like(dec_lo)
+    top_slow = top if top < MAX_CLOSED_FORM_BALL_SPEED else float(sb[sb < MAX_CLOSED_FORM_BALL_SPEED].max(initial=0))
+    loosest = GRAVITY - CENTRIFUGAL * top_slow * top_slow * _BETA * START_DIST
+    if loosest <= 0 or dec_lo.min(initial=MAX_STEPS) < (START_DIST - LOCK_DIST) // loosest + 2:
+        slow = sb < MAX_CLOSED_FORM_BALL_SPEED
+        sb_slow = sb * slow
+        drop_hi = _drop_bound(sb_slow)
+        early = np.flatnonzero(slow & (dec_lo < drop_hi))
+        if early.size:
+            # Where the ball is already low at dec_lo, k_drop <= dec_lo and does not change the answer
+            k_drop[early] = _drop_steps(sb_slow[early], np.full(early.size, _MIN_DROP_STEP, dtype=np.int64),
+                                        drop_hi[early])
+
+    # Fast balls rise first, then fall for good: the drop below LOCK_DIST is still a single crossing
+    if top >= MAX_CLOSED_FORM_BALL_SPEED:
+        fast = np.flatnonzero((sb >= MAX_CLOSED_FORM_BALL_SPEED) & (sb < MAX_SERIES_BALL_SPEED))
+        if fast.size:
+            sb_fast = sb[fast]
+            hi = np.full(fast.size, MAX_STEPS, dtype=np.int64)
+            estimate = _drop_estimate(fast_ball_distance(sb_fast), hi)
+            k_drop[fast] = _seeded_first_steps(_fast_drop_predicate, (sb_fast,),
+                                               np.full(fast.size, _MIN_DROP_STEP, dtype=np.int64), hi, estimate)
+    steps = np.maximum(k_drop, dec_lo)
+
+    # Still on the decreasing side and diff > -eps: inside the lock band
+    at = np.minimum(steps, MAX_STEPS)
+    late = (steps > split) | (sb * _BALL_POW[at] - sw * _WHEEL_POW[at] <= -LOCK_SPEED_DIFF)
+
+    # Increasing side (split, MAX_STEPS]: diff stays negative and rises towards 0
+    if late.any():
+        sw_late, sb_late = sw[late], sb[late]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # -speed_diff(x) = eps  <=>  H(x) = ln(sw) - ln_w * x - ln(eps + sb * e^(-ln_b * x)) = 0,
+            # Newton from where the wheel alone slows to eps
+            estimate = np.log(sw_late / LOCK_SPEED_DIFF) / _LN_WHEEL
+            log_sw = np.log(sw_late)
+            for _ in range(_NEWTON_ITERATIONS):
+                ball = sb_late * np.exp(-_LN_BALL * estimate)
+                total = LOCK_SPEED_DIFF + ball
+                estimate += (log_sw - _LN_WHEEL * estimate - np.log(total)) / (_LN_WHEEL - _LN_BALL * ball / total)
+        inc_lo = _seeded_first_steps(lambda w, b: _diff_predicate(w, b, -1, LOCK_SPEED_DIFF),
+                                     (sw_late, sb_late), split[late] + 1,
+                                     np.full(sw_late.size, MAX_STEPS, dtype=np.int64), estimate)
+        steps[late] = np.maximum(k_drop[late], inc_lo)
+
+    steps = np.minimum(steps, MAX_STEPS)
+    if top >= MAX_SERIES_BALL_SPEED:
+        for i in np.flatnonzero(sb >= MAX_SERIES_BALL_SPEED):
+            steps[i] = simulate_stepwise(sw[i], sb[i])[0]
+    return steps.reshape(shape)
+
+
+def lock_offsets(w_speeds, b_speeds):
+    """Ball travel minus wheel travel until lock (unwrapped, radians) for arrays of speeds"""
+    sw, sb = np.abs(w_speeds), np.abs(b_speeds)
+    steps = lock_steps(sw, sb)
+    return sb * _BALL_TRAVEL[steps] - sw * _WHEEL_TRAVEL[steps]
+
+
+def predict_distribution(w_speeds, b_speeds, w_angles, b_angles, w_noise=0.0, b_noise=0.0,
+                         samples=DISTRIBUTION_SAMPLES, rng=None):
+    """
+    Monte Carlo pocket probabilities.
+
+    Every (wheel, ball) state is perturbed with Gaussian speed noise (standard
+    deviations w_noise / b_noise in rad/frame) and `samples` perturbed spins are
+    simulated in one lock_steps batch, split evenly across the given states.
+    Returns a 38-element array where entry i is the probability of POCKETS[i].
+    """
+    # One row of perturbed samples per state
+    states = np.zeros(np.broadcast(w_speeds, b_speeds, w_angles, b_angles, w_noise, b_noise).shape)
+    w_speeds, b_speeds, w_angles, b_angles, w_noise, b_noise = (
+        np.add(a, states).ravel() for a in (w_speeds, b_speeds, w_angles, b_angles, w_noise, b_noise))
+    shape = (states.size, max(samples // states.size, 1))
+    rng = rng if rng is not None else _RNG
+
+    def perturb(values, noise):
+        perturbed = np.abs(values)[:, None] + noise[:, None] * rng.standard_normal(shape)
+        return np.maximum(perturbed, 0.0, out=perturbed)
+
+    offsets = lock_offsets(perturb(w_speeds, w_noise), perturb(b_speeds, b_noise))
+    rel_angle = (b_angles - w_angles)[:, None] + offsets
+    idx = np.floor(rel_angle / POCKET_ANGLE + 0.5).astype(np.int64) % 38
+    return np.bincount(idx.ravel(), minlength=38) / idx.size
@@ -0,0 +1,166 @@
+import os
+import tempfile
+import cv2
+import numpy as np
+
+try:
+    from .physics import POCKETS, POCKET_ANGLE
+except ImportError:
+    from physics import POCKETS, POCKET_ANGLE
+
+# Band of the warped wheel (in radii) holding the pocket numbers
+TEMPLATE_INNER, TEMPLATE_OUTER = 0.62, 0.9
+# Each template is a polar (radius x angle) patch one pocket wide. In polar
+# coordinates a pocket looks the same at any wheel rotation.
+TEMPLATE_ROWS, TEMPLATE_COLS = 12, 8
+# The whole band is unwrapped once at the template's angular resolution
+RING_COLS = len(POCKETS) * TEMPLATE_COLS
+COL_ANGLE = POCKET_ANGLE / TEMPLATE_COLS
+# Samples per strip pixel (each way), averaged down so thin digit strokes do not alias
+SUPERSAMPLE = 3
+# Correlations below this are treated as no match
+MIN_MATCH_SCORE = 0.5
+
+# Saved calibrations only count as the same setup if every clicked point is this close (px)
+POINT_TOLERANCE = 3.0
+
+DEFAULT_CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration', 'calibration.npz')
+
+
+def ring_maps(center, radius):
+    """
+    cv2.remap tables unwrapping the number band at SUPERSAMPLE x the strip
+    resolution; unwrap_ring averages that down to (TEMPLATE_ROWS, RING_COLS)
+    with column c centered on angle c * COL_ANGLE.
+    """
+    cx, cy = center
+    rows, cols = TEMPLATE_ROWS * SUPERSAMPLE, RING_COLS * SUPERSAMPLE
+    radii = np.linspace(radius * TEMPLATE_INNER, radius * TEMPLATE_OUTER, rows)
+    theta = (np.arange(cols) - (SUPERSAMPLE - 1) / 2) * (COL_ANGLE / SUPERSAMPLE)
+    map_x = (cx + np.outer(radii, np.cos(theta))).astype(np.float32)
+    map_y = (cy + np.outer(radii, np.sin(theta))).astype(np.float32)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+def ring_patches(ring, first_cols):
+    """
+    Normalized one-pocket patches of the unwrapped ring starting at each of
+    `first_cols` (any shape), as rows of a (first_cols.size, TEMPLATE_ROWS * TEMPLATE_COLS)
+    float32 array with zero mean and unit norm.
+    """
+    cols = (np.asarray(first_cols).reshape(-1, 1) + np.arange(TEMPLATE_COLS)) % RING_COLS
+    patches = ring[:, cols].transpose(1, 0, 2).reshape(len(cols), -1).astype(np.float32)
+    patches -= patches.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(patches, axis=1, keepdims=True)
+    np.divide(patches, norms, out=patches, where=norms > 0)
+    return patches
+
+
+def unwrap_ring(frame, maps):
+    ring = cv2.remap(frame, maps[0], maps[1], cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+    if ring.ndim == 3:
+        ring = cv2.cvtColor(ring, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(ring, (RING_COLS, TEMPLATE_ROWS), interpolation=cv2.INTER_AREA)
+
+
+def angle_col(angle):
+    """Column of the unwrapped ring where a patch centered on `angle` starts"""
+    return int(round(angle / COL_ANGLE)) - TEMPLATE_COLS // 2
+
+
+class PocketTemplateBank:
+    """
+    One normalized template per pocket, cut from the warped wheel once the
+    zero marker's angle is known. A read correlates the whole number ring,
+    starting at the ball, against all 38 templates in one matrix product.
+    Each hypothesis "the ball is in pocket k" is then scored by how well the
+    entire ring lines up. A single pocket's digits (possibly covered by the
+    ball) are never enough to decide on their own.
+    """
+
+    def __init__(self, templates):
+        self.templates = np.asarray(templates, dtype=np.float32)
+        n = len(self.templates)
+        # Template column c of every pocket stacked: (TEMPLATE_COLS * n, TEMPLATE_ROWS)
+        self._columns = np.ascontiguousarray(
+            self.templates.reshape(n, TEMPLATE_ROWS, TEMPLATE_COLS).transpose(2, 0, 1).reshape(-1, TEMPLATE_ROWS))
+        # _ring_index[j, k]: template expected j pockets after the ball when it sits in pocket k
+        self._ring_index = (np.arange(n)[:, None] + np.arange(n)[None, :]) % n
+        self._maps = None
+        self._maps_key = None
+
+    @classmethod
+    def build(cls, frame, center, radius, wheel_angle):
+        """Cut the 38 templates; pocket i sits i pockets from the zero marker, as in pocket_from_angle"""
+        ring = unwrap_ring(frame, ring_maps(center, radius))
+        return cls(ring_patches(ring, angle_col(wheel_angle) + np.arange(len(POCKETS)) * TEMPLATE_COLS))
+
+    def correlate(self, ring):
+        """
+        Normalized correlation of every template with the patch starting at
+        every ring column: (38, RING_COLS). The templates are zero-mean, so
+        only the patch norms need computing, from windowed column sums.
+        """
+        n, width = len(self.templates), TEMPLATE_COLS
+        ring = ring.astype(np.float32)
+        wrapped = np.concatenate([ring, ring[:, :width]], axis=1)
+        per_column = (self._columns @ wrapped).reshape(width, n, RING_COLS + width)
+        corr = per_column[0, :, :RING_COLS].copy()
+        for c in range(1, width):
+            corr += per_column[c, :, c:c + RING_COLS]
+
+        window = np.ones(width)
+        sums = np.convolve(wrapped.sum(axis=0), window, 'valid')[:RING_COLS]
+        squares = np.convolve((wrapped * wrapped).sum(axis=0), window, 'valid')[:RING_COLS]
+        norms = np.sqrt(np.maximum(squares - sums * sums / (TEMPLATE_ROWS * width), 1e-6))
+        return corr / norms.astype(np.float32)
+
+    def match(self, frame, center, radius, ball_angle):
+        """Returns (pocket number, mean correlation) for the pocket under the ball, number -1 if nothing matches"""
+        key = (tuple(center), radius)
+        if key != self._maps_key:
+            self._maps, self._maps_key = ring_maps(center, radius), key
+        corr = self.correlate(unwrap_ring(frame, self._maps))
+
+        # Alignments within half a pocket of the ball; pocket j after the ball starts j * TEMPLATE_COLS further on
+        n = len(self.templates)
+        starts = angle_col(ball_angle) + np.arange(-(TEMPLATE_COLS // 2), TEMPLATE_COLS - TEMPLATE_COLS // 2)
+        cols = (starts[:, None, None] + TEMPLATE_COLS * np.arange(n)[None, :, None]) % RING_COLS
+        scores = corr[self._ring_index[None], cols].mean(axis=1)
+        shift, idx = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        score = float(scores[shift, idx])
+        if score < MIN_MATCH_SCORE:
+            return -1, score
+        return POCKETS[idx], score
+
+
+def save_calibration(path, points, M, bank=None):
+    """Write the clicked points, homography and template bank atomically"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    templates = bank.templates if bank is not None else np.zeros((0, TEMPLATE_ROWS * TEMPLATE_COLS), np.float32)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, points=np.asarray(points, np.float32), M=np.asarray(M, np.float64), templates=templates)
+        os.replace(tmp_path, path)
+    except:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_template_bank(path, points):
+    """The saved bank if it was built for (nearly) the same calibration points, else None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as saved:
+            saved_points, templates = saved['points'], saved['templates']
+    except Exception as e:
+        print(f"[TEMPLATES] Could not read {path}: {e}")
+        return None
+    if saved_points.shape != np.shape(points) or len(templates) != len(POCKETS):
+        return None
+    if np.abs(saved_points - np.asarray(points, np.float32)).max() > POINT_TOLERANCE:
+        return None
+    return PocketTemplateBank(templates)
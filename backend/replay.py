@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+import cv2
+
+try:
+    from .main import ProfessionalRouletteTracker
+    from .auto_calibration import AutoCalibrator
+    from .result_reader import ResultReader
+    from .clock import FrameClock
+except ImportError:
+    from main import ProfessionalRouletteTracker
+    from auto_calibration import AutoCalibrator
+    from result_reader import ResultReader
+    from clock import FrameClock
+
+# Decoded frames buffered ahead of process_frame
+REPLAY_QUEUE_SIZE = 8
+# Frame rate assumed when the container does not report one
+DEFAULT_VIDEO_FPS = 30.0
+
+
+def headless_tracker(width, height):
+    """
+    Tracker for offline footage: no screen capture, spin timing on a
+    FrameClock, and Hough calibration and result reads run inline, so a
+    replay gives the same results however fast it runs.
+    """
+    tracker = ProfessionalRouletteTracker(monitor={'top': 0, 'left': 0, 'width': width, 'height': height})
+    tracker.clock = FrameClock()
+    tracker.auto_calibrator = AutoCalibrator(threaded=False)
+    tracker.result_reader = ResultReader(processes=False)
+    return tracker
+
+
+def decode_frames(capture, max_frames=None, queue_size=REPLAY_QUEUE_SIZE):
+    """
+    Yields (index, frame) from a cv2.VideoCapture. Decoding runs on its own
+    thread a few frames ahead, so it overlaps with processing; the bounded
+    queue blocks it rather than dropping frames.
+    """
+    frames = queue.Queue(queue_size)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def decode():
+        index = 0
+        try:
+            while max_frames is None or index < max_frames:
+                ok, frame = capture.read()
+                if not ok or not put((index, frame)):
+                    break
+                index += 1
+        except Exception as e:
+            print(f"[REPLAY] Decoding failed at frame {index}: {e}")
+        finally:
+            put(None)
+
+    thread = threading.Thread(target=decode, name='replay-decode', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class SpinRecorder:
+    """Folds per-frame results into one summary dict per spin"""
+
+    def __init__(self):
+        self.spins = []
+        self._current = None
+
+    def add(self, index, timestamp, result):
+        """Returns the spin summary when this frame ends one, else None"""
+        spin = self._current
+        if spin is None:
+            if not result.is_spinning:
+                return None
+            spin = self._current = {'spin': len(self.spins), 'start_frame': index, 'start_time': timestamp,
+                                    'frames': 0, 'ball_frames': 0, 'confidence_sum': 0.0,
+                                    'prediction': -1, 'prediction_frame': None}
+        spin['frames'] += 1
+        spin['ball_frames'] += bool(result.ball_found)
+        spin['confidence_sum'] += result.confidence
+        if result.prediction != -1 and spin['prediction'] == -1:
+            spin['prediction'], spin['prediction_frame'] = int(result.prediction), index
+        if result.spin_finished is not None or not result.is_spinning:
+            return self._finish(index, timestamp, result.spin_finished)
+        return None
+
+    def close(self, index, timestamp):
+        """Summary of a spin the footage ended in the middle of, or None"""
+        return self._finish(index, timestamp, None) if self._current is not None else None
+
+    def _finish(self, index, timestamp, finished):
+        spin, self._current = self._current, None
+        frames = spin['frames']
+        summary = {
+            'spin': spin['spin'],
+            'start_frame': spin['start_frame'],
+            'end_frame': index,
+            'start_time': round(spin['start_time'], 3),
+            'end_time': round(timestamp, 3),
+            'frames': frames,
+            'ball_found_rate': spin['ball_frames'] / frames,
+            'mean_confidence': spin['confidence_sum'] / frames,
+            'prediction': spin['prediction'],
+            'prediction_frame': spin['prediction_frame'],
+            'finished': finished is not None,
+            'number': finished['number'] if finished else -1,
+            'actual': finished['actual'] if finished else -1,
+        }
+        self.spins.append(summary)
+        return summary
+
+
+class VideoReplay:
+    """
+    Streams a video file through process_frame as fast as the CPU allows,
+    with no GUI and no screen capture. Iterating yields ('frame', index,
+    timestamp, FrameResult) for every frame and ('spin', summary) whenever a
+    spin ends. Timestamps are the frame's position in the video (index / fps)
+    and process_frame gets the video's frame interval as dt. A tracker with a
+    FrameClock has it set to each frame's timestamp before processing.
+    """
+
+    def __init__(self, path, tracker=None, points=None, max_frames=None):
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise IOError(f"Could not open video: {path}")
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else DEFAULT_VIDEO_FPS
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.tracker = tracker if tracker is not None else headless_tracker(width, height)
+        if points is not None:
+            # Templates saved for this footage are looked for next to it, not in the live calibration
+            self.tracker.calibration_path = os.path.splitext(path)[0] + '.calibration.npz'
+            self.tracker.set_calibration_points(points)
+        self.max_frames = max_frames
+        self.spins = SpinRecorder()
+        self.frames = 0
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        dt = 1.0 / self.fps
+        index, timestamp = -1, 0.0
+        start = time.perf_counter()
+        try:
+            for index, frame in decode_frames(self.capture, self.max_frames):
+                timestamp = index * dt
+                if isinstance(self.tracker.clock, FrameClock):
+                    self.tracker.clock.set(timestamp)
+                result = self.tracker.process_frame(frame, dt, seq=index)
+                self.frames += 1
+                yield 'frame', index, timestamp, result
+                summary = self.spins.add(index, timestamp, result)
+                if summary is not None:
+                    yield 'spin', summary
+            summary = self.spins.close(index, timestamp)
+            if summary is not None:
+                yield 'spin', summary
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.capture.release()
+            self.tracker.shutdown_workers()
+
+    def run(self, out=None):
+        """Replay the whole video, writing JSON lines to `out` if given; returns the summary"""
+        for event in self:
+            if out is None:
+                continue
+            if event[0] == 'frame':
+                _, index, timestamp, result = event
+                record = {'type': 'frame', 'frame': index, 'time': round(timestamp, 3)}
+                record.update(result.to_dict())
+            else:
+                record = {'type': 'spin'}
+                record.update(event[1])
+            out.write(json.dumps(record) + '\n')
+        return self.summary()
+
+    def summary(self):
+        video_seconds = self.frames / self.fps
+        summary = {
+            'video': self.path,
+            'frames': self.frames,
+            'video_seconds': video_seconds,
+            'elapsed_seconds': self.elapsed,
+            'fps': self.frames / self.elapsed if self.elapsed > 0 else 0.0,
+            'realtime_factor': video_seconds / self.elapsed if self.elapsed > 0 else 0.0,
+            'spins': self.spins.spins,
+        }
+        if self.tracker.timers.enabled:
+            summary['stages'] = self.tracker.timers.summary()
+        return summary
+
+
+def parse_points(text):
+    values = [float(v) for v in text.split(',')]
+    if len(values) != 8:
+        raise argparse.ArgumentTypeError("expected 8 comma-separated numbers: x1,y1,...,x4,y4")
+    return [values[i:i + 2] for i in range(0, 8, 2)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded roulette footage through the tracker, headless")
+    parser.add_argument('video')
+    parser.add_argument('--out', help="write per-frame results and spin summaries here as JSON lines")
+    parser.add_argument('--max-frames', type=int)
+    parser.add_argument('--points', type=parse_points, help="calibration points x1,y1,...,x4,y4 (top, right, bottom, left)")
+    parser.add_argument('--detector', choices=['mog2', 'strip'], default='mog2')
+    parser.add_argument('--timings', action='store_true', help="time each process_frame stage and print p50/p95/p99")
+    args = parser.parse_args()
+
+    replay = VideoReplay(args.video, points=args.points, max_frames=args.max_frames)
+    replay.tracker.ball_detector = args.detector
+    replay.tracker.timers.enabled = args.timings
+    if args.out:
+        with open(args.out, 'w') as f:
+            summary = replay.run(f)
+    else:
+        summary = replay.run()
+
+    print(f"\n[REPLAY] {summary['frames']} frames ({summary['video_seconds']:.1f} s of video) in "
+          f"{summary['elapsed_seconds']:.1f} s: {summary['fps']:.0f} fps, {summary['realtime_factor']:.1f}x realtime")
+    for spin in summary['spins']:
+        print(f"[REPLAY] Spin {spin['spin']}: {spin['start_time']:.1f}-{spin['end_time']:.1f} s, "
+              f"ball found {spin['ball_found_rate']:.0%}, predicted {spin['prediction']}, "
+              f"number {spin['number']}{'' if spin['finished'] else ' (unfinished)'}")
+    if args.timings:
+        print(replay.tracker.timers.report())
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import cv2
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+    print("Warning: pytesseract not available")
+
+# Where reads save their input images for checking by hand, when asked to (debug mode)
+DEBUG_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'debug_output')
+
+
+def save_debug_image(directory, name, image):
+    """Write image to directory/name for manual verification; a no-op without a directory"""
+    if directory is None:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+        cv2.imwrite(os.path.join(directory, name), image)
+    except Exception as e:
+        print(f"[RESULT] Could not save {name}: {e}")
+
+
+def ocr_on_image(img):
+    """Run OCR on a preprocessed image, returning every reading that is a valid pocket number"""
+    detected = []
+    if TESSERACT_AVAILABLE:
+        try:
+            # Try different PSM modes for number recognition
+            for psm in [7, 8, 10, 13]:
+                text = pytesseract.image_to_string(img, config=f'--psm {psm} -c tessedit_char_whitelist=0123456789')
+                text = text.strip().replace(' ', '').replace('\n', '')
+                if text.isdigit():
+                    num = int(text)
+                    if 0 <= num <= 37:
+                        detected.append(num)
+        except:
+            pass
+    return detected
+
+
+def read_pocket_number(roi, debug_dir=None):
+    """Most common OCR reading of the pocket region over four thresholdings, or -1"""
+    save_debug_image(debug_dir, 'pocket_roi.jpg', roi)
+
+    # Convert to grayscale
+    roi_gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+    # Try multiple preprocessing approaches
+    detected_numbers = []
+
+    # Approach 1: Look for white text on dark background
+    _, thresh1 = cv2.threshold(roi_gray, 180, 255, cv2.THRESH_BINARY)
+    detected_numbers.extend(ocr_on_image(thresh1))
+
+    # Approach 2: Look for dark text on white background
+    _, thresh2 = cv2.threshold(roi_gray, 100, 255, cv2.THRESH_BINARY_INV)
+    detected_numbers.extend(ocr_on_image(thresh2))
+
+    # Approach 3: Adaptive threshold
+    thresh3 = cv2.adaptiveThreshold(roi_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    detected_numbers.extend(ocr_on_image(thresh3))
+
+    # Approach 4: Enhanced contrast
+    enhanced = cv2.equalizeHist(roi_gray)
+    _, thresh4 = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    detected_numbers.extend(ocr_on_image(thresh4))
+
+    # Find the most common detected number
+    if detected_numbers:
+        return Counter(detected_numbers).most_common(1)[0][0]
+    return -1
+
+
+def read_spin_result(roi, frame=None, debug_dir=None):
+    """Worker entry point: read the winning pocket (-1 if unreadable); with a debug_dir, save the ROI and final frame there"""
+    number = read_pocket_number(roi, debug_dir) if roi is not None else -1
+    if frame is not None:
+        save_debug_image(debug_dir, 'last_spin_result.jpg', frame)
+    return number
+
+
+class ResultReader:
+    """
+    Runs winning-number reads in a single worker process so the Tesseract
+    subprocess calls never stall the frame loop. submit() returns a Future
+    the state machine polls. With processes=False the read runs inline and
+    the returned Future is already done. threads=True reads on a worker
+    thread instead, for hosts that may not start child processes (the
+    daemonic table workers); Tesseract itself is a subprocess either way.
+    Images are only saved when submit() is given a debug_dir.
+    """
+
+    def __init__(self, processes=True, threads=False):
+        self.processes = processes
+        self.threads = threads
+        self._pool = None
+
+    def submit(self, roi, frame=None, debug_dir=None):
+        if not self.processes:
+            future = Future()
+            try:
+                future.set_result(read_spin_result(roi, frame, debug_dir))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if self._pool is None:
+            if self.threads:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-reader')
+            else:
+                # spawn: the frame loop already runs threads, which fork does not mix well with
+                self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool.submit(read_spin_result, roi, frame, debug_dir)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity history of `width`-column float rows, oldest dropped first.
+    Every row is stored twice (slots i and i + capacity), so the rows in
+    order are always one contiguous slice: view() is a NumPy view, never a
+    copy, and append() is two row writes. Column sums and sums of squares
+    are kept up to date on append, so mean/var/std cost O(1); they are
+    re-summed from the rows once per `capacity` appends to stop rounding
+    drift from building up.
+
+    Indexing follows lists: buf[-1] is the newest row as a tuple (a float
+    when width == 1); slices and other NumPy indices go to view(). The rows
+    are also kept as tuples, so single-row reads never touch NumPy.
+    """
+
+    def __init__(self, capacity, width=1):
+        self.capacity = int(capacity)
+        self.width = int(width)
+        self._data = np.zeros((2 * self.capacity, self.width), np.float64)
+        # Running sums as plain floats: for a handful of columns that beats small-array NumPy ops
+        self._rows = [None] * self.capacity
+        self._sum = [0.0] * self.width
+        self._sumsq = [0.0] * self.width
+        self._next = 0
+        self._len = 0
+        self._since_resum = 0
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return self._len > 0
+
+    def append(self, value):
+        row = (float(value),) if self.width == 1 else tuple(map(float, value))
+        slot = self._next
+        total, squares = self._sum, self._sumsq
+        if self._len == self.capacity:
+            for i, v in enumerate(self._rows[slot]):
+                total[i] -= v
+                squares[i] -= v * v
+        else:
+            self._len += 1
+        for i, v in enumerate(row):
+            total[i] += v
+            squares[i] += v * v
+        self._rows[slot] = row
+        self._data[slot] = row
+        self._data[slot + self.capacity] = row
+        self._next = (slot + 1) % self.capacity
+
+        self._since_resum += 1
+        if self._since_resum >= self.capacity:
+            self._resum()
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self._sum = [0.0] * self.width
+        self._sumsq = [0.0] * self.width
+        self._next = 0
+        self._len = 0
+        self._since_resum = 0
+
+    def view(self):
+        """The rows oldest to newest, as a read-only (len, width) view"""
+        end = self._next + self.capacity
+        rows = self._data[end - self._len:end]
+        rows.flags.writeable = False
+        return rows
+
+    def column(self, i=0):
+        return self.view()[:, i]
+
+    def __getitem__(self, index):
+        if not isinstance(index, (int, np.integer)):
+            return self.view()[index]
+        if not -self._len <= index < self._len:
+            raise IndexError('RingBuffer index out of range')
+        row = self._rows[(self._next - self._len + index % self._len) % self.capacity]
+        return row[0] if self.width == 1 else row
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        rows = self.view()
+        rows = rows[:, 0] if self.width == 1 else rows
+        return np.array(rows, dtype=dtype)
+
+    def mean(self):
+        """Per-column mean (a float when width == 1, else a tuple); 0 when empty"""
+        n = self._len or 1
+        mean = tuple(s / n for s in self._sum)
+        return mean[0] if self.width == 1 else mean
+
+    def var(self):
+        """Per-column population variance, like np.var"""
+        n = self._len or 1
+        var = tuple(max(sq / n - (s / n) ** 2, 0.0) for s, sq in zip(self._sum, self._sumsq))
+        return var[0] if self.width == 1 else var
+
+    def std(self):
+        std = tuple(v ** 0.5 for v in ((self.var(),) if self.width == 1 else self.var()))
+        return std[0] if self.width == 1 else std
+
+    def shift(self, offset):
+        """Add `offset` to every stored row (e.g. re-basing coordinates)"""
+        offset = np.broadcast_to(offset, self.width).tolist()
+        self._data += offset
+        self._rows = [None if row is None else tuple(v + o for v, o in zip(row, offset)) for row in self._rows]
+        self._resum()
+
+    def _resum(self):
+        rows = self.view()
+        self._sum = rows.sum(axis=0).tolist()
+        self._sumsq = (rows * rows).sum(axis=0).tolist()
+        self._since_resum = 0
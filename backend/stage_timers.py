@@ -0,0 +1,119 @@
+import contextlib
+import time
+import numpy as np
+
+# Samples kept per stage for the rolling percentiles
+STAGE_WINDOW = 1024
+
+_DISABLED = contextlib.nullcontext()
+
+
+class StageSamples:
+    """The last `window` durations of one stage (seconds), plus lifetime count, sum and max"""
+
+    __slots__ = ('samples', 'next', 'count', 'sum', 'max')
+
+    def __init__(self, window):
+        self.samples = [0.0] * window
+        self.next = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.samples[self.next] = seconds
+        self.next = (self.next + 1) % len(self.samples)
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def window(self):
+        return np.array(self.samples[:min(self.count, len(self.samples))])
+
+
+class _Stage:
+    __slots__ = ('timers', 'name', 'start')
+
+    def __init__(self, timers, name):
+        self.timers = timers
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timers.record(self.name, time.perf_counter() - self.start)
+
+
+class StageTimers:
+    """
+    Rolling latency of each stage of the frame loop (warp, HSV, MOG2, ...),
+    for telling which one a lagging table is stuck in. Disabled by default;
+    callers check `enabled` once per frame and skip timing altogether, so a
+    disabled timer costs an attribute read.
+
+    Inside process_frame, begin() starts a frame and lap(name) charges the
+    time since the previous lap to `name` (a stage hit twice in one frame
+    adds up); end() records every stage of the frame plus 'total'. Work
+    outside that sequence uses `with timers.stage(name):` or record(name,
+    seconds), which are safe from other threads (capture, Hough, OCR).
+
+    summary() gives count, mean and p50/p95/p99/max per stage in ms over
+    the last `window` samples; report() formats it for the log.
+    """
+
+    def __init__(self, enabled=False, window=STAGE_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._stages = {}
+        self._frame = {}
+        self._start = 0.0
+        self._last = 0.0
+
+    def begin(self):
+        self._frame.clear()
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self._frame[name] = self._frame.get(name, 0.0) + now - self._last
+        self._last = now
+
+    def end(self):
+        for name, seconds in self._frame.items():
+            self.record(name, seconds)
+        self._frame.clear()
+        self.record('total', self._last - self._start)
+
+    def stage(self, name):
+        """Context manager timing its body as `name`; a no-op while disabled"""
+        return _Stage(self, name) if self.enabled else _DISABLED
+
+    def record(self, name, seconds):
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages.setdefault(name, StageSamples(self.window))
+        stage.add(seconds)
+
+    def reset(self):
+        self._stages = {}
+
+    def summary(self):
+        """{stage: {'count', 'mean', 'p50', 'p95', 'p99', 'max', 'sum'}}, times in ms; count, max and sum are lifetime"""
+        summary = {}
+        for name, stage in list(self._stages.items()):
+            samples = stage.window() * 1000
+            if not len(samples):
+                continue
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            summary[name] = {'count': stage.count, 'mean': float(samples.mean()), 'p50': float(p50),
+                             'p95': float(p95), 'p99': float(p99), 'max': stage.max * 1000, 'sum': stage.sum * 1000}
+        return summary
+
+    def report(self):
+        lines = []
+        for name, s in sorted(self.summary().items(), key=lambda item: -item[1]['mean']):
+            lines.append(f"[TIMING] {name:<16} n={s['count']:<7} mean {s['mean']:7.3f}  p50 {s['p50']:7.3f}  "
+                         f"p95 {s['p95']:7.3f}  p99 {s['p99']:7.3f}  max {s['max']:7.3f} ms")
+        return '\n'.join(lines) if lines else "[TIMING] No stage timings recorded"
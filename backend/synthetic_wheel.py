@@ -0,0 +1,32 @@
+import numpy as np
+import cv2
+
+
+def wheel_frame(ball_angle=None, width=1280, height=720, center=None, radius=200, rim=4, ball_size=7,
+                marker_angle=None, marker_size=9, clutter=None):
+    """
+    Synthetic table view for the tests and the benchmark: a green wheel of
+    `radius` around `center` (the middle of the frame by default) with a
+    `rim`-pixel outline (0 for none), the white ball at 0.85 radius and the
+    green zero marker at 0.6 radius. `clutter` (0 or 1) draws the table
+    chrome flickering in the top-left corner, outside the ring.
+    """
+    cx, cy = center if center is not None else (width // 2, height // 2)
+    frame = np.full((height, width, 3), 40, np.uint8)
+    cv2.circle(frame, (cx, cy), radius, (20, 60, 20), -1)
+    if rim:
+        cv2.circle(frame, (cx, cy), radius, (200, 200, 200), rim)
+    if ball_angle is not None:
+        bx, by = cx + 0.85 * radius * np.cos(ball_angle), cy + 0.85 * radius * np.sin(ball_angle)
+        cv2.circle(frame, (int(bx), int(by)), ball_size, (255, 255, 255), -1)
+    if marker_angle is not None:
+        mx, my = cx + 0.6 * radius * np.cos(marker_angle), cy + 0.6 * radius * np.sin(marker_angle)
+        cv2.circle(frame, (int(mx), int(my)), marker_size, (0, 200, 0), -1)
+    if clutter is not None:
+        cv2.rectangle(frame, (20, 20), (220, 120), (0, 180, 0) if clutter else (255, 255, 255), -1)
+    return frame
+
+
+def spin_frame(i, width=640, height=480, radius=150, **kwargs):
+    """Frame `i` of a spin: the ball laps at 0.15 rad/frame, the wheel's zero marker at 0.05"""
+    return wheel_frame(i * 0.15, width, height, radius=radius, marker_angle=i * 0.05, **kwargs)
@@ -0,0 +1,224 @@
+import asyncio
+import time
+from collections import deque
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Results buffered between the vision loop and the broadcaster; the oldest are dropped.
+# One-shot events (spin_finished, board_detected) are queued separately and never dropped
+TELEMETRY_QUEUE_SIZE = 8
+# Default per-client cap on prediction updates per second
+TELEMETRY_MAX_HZ = 60
+# Delta streams resend every field after this many updates, so a client that lost one catches up
+KEYFRAME_INTERVAL = 60
+
+_MISSING = object()
+
+
+def _point(x, y):
+    return [int(x), int(y)] if x is not None and y is not None else None
+
+
+def telemetry_payload(result, calibrated):
+    """
+    The prediction_update fields for one FrameResult: plain Python types
+    (JSON- and MessagePack-ready), with readings rounded so that a value
+    that has not really changed compares equal for delta encoding.
+    """
+    probabilities = result.pocket_probabilities
+    return {
+        'seq': result.seq,
+        'ball_coords': _point(result.ball_x, result.ball_y),
+        'zero_coords': _point(result.zero_x, result.zero_y),
+        'confidence': round(float(result.confidence), 1),
+        'prediction': int(result.prediction),
+        'wheel_rpm': round(float(result.wheel_rpm), 1),
+        'ball_rpm': round(float(result.ball_rpm), 1),
+        'is_spinning': bool(result.is_spinning),
+        'pocket_probabilities': [round(p, 4) for p in probabilities.tolist()] if probabilities is not None else None,
+        'ball_found': bool(result.ball_found),
+        'wheel_found': bool(result.wheel_found),
+        'calibrated': bool(calibrated),
+        'latency_ms': round(result.latency * 1000, 1) if result.latency is not None else None,
+    }
+
+
+class TelemetryClient:
+    """One Socket.IO client's stream settings and what it was last sent"""
+
+    __slots__ = ('sid', 'format', 'delta', 'interval', 'last_sent', 'last_result', 'last_payload', 'since_keyframe')
+
+    def __init__(self, sid):
+        self.sid = sid
+        self.format = 'json'
+        self.delta = False
+        self.interval = 1.0 / TELEMETRY_MAX_HZ
+        self.last_sent = 0.0
+        self.last_result = None
+        self.last_payload = None
+        self.since_keyframe = 0
+
+
+class TelemetryHub:
+    """
+    Carries results from the vision loop to the Socket.IO clients without
+    the vision loop ever waiting on the network. publish() is safe from
+    any thread, the loop's own included: it appends the result to a bounded
+    deque (dropping the oldest), any one-shot event it carries to an
+    unbounded one, and wakes the broadcaster on the event loop, at most
+    once per batch. The broadcaster (run(), a task on the server's loop) does everything else.
+
+    Every client gets 'prediction_update' with the newest result, no more
+    often than its rate limit. A client can ask (the 'telemetry_options'
+    event, see configure()) for MessagePack instead of JSON and for delta
+    encoding: then only the fields that changed since its last update go
+    out, as 'prediction_delta', with a full 'prediction_update' every
+    KEYFRAME_INTERVAL updates. 'spin_finished' and 'board_detected' go to
+    everyone, unthrottled and in order, however far behind the broadcaster
+    is; `board_info()` is asked for the latter's payload when calibration
+    locks.
+    """
+
+    def __init__(self, sio, queue_size=TELEMETRY_QUEUE_SIZE, board_info=None):
+        self.sio = sio
+        self.board_info = board_info
+        self.clients = {}
+        self._pending = deque(maxlen=queue_size)
+        self._oneshot = deque()
+        self._loop = None
+        self._wake = None
+        self._wake_scheduled = False
+        self._latest = None
+        self._calibrated = False
+        self.board = None
+
+        self.published = 0
+        self.dropped = 0
+        self.sent = 0
+        self.throttled = 0
+
+    def bind(self, loop):
+        """Attach to the event loop the broadcaster runs on; publish() is a no-op until then"""
+        self._loop = loop
+        self._wake = asyncio.Event()
+
+    def publish(self, result, calibrated):
+        """Called by the vision loop for every frame, from any thread; never blocks"""
+        if self._loop is None:
+            return
+        if calibrated and not self._calibrated and self.board_info is not None:
+            self.board = self.board_info()
+            if self.board is not None:
+                self._oneshot.append(('board_detected', self.board))
+        self._calibrated = calibrated
+        if result.spin_finished is not None:
+            self._oneshot.append(('spin_finished', result.spin_finished))
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append((result, calibrated))
+        self.published += 1
+        if not self._wake_scheduled:
+            self._wake_scheduled = True
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # Loop closed: the server is gone
+                self._loop = None
+
+    def add_client(self, sid):
+        self.clients[sid] = TelemetryClient(sid)
+        # A new client gets the latest result straight away
+        if self._wake is not None:
+            self._wake.set()
+
+    def remove_client(self, sid):
+        self.clients.pop(sid, None)
+
+    def configure(self, sid, options):
+        """Apply a client's {'format': 'json' | 'msgpack', 'delta': bool, 'max_hz': float}; returns what is in effect"""
+        client = self.clients.get(sid)
+        if client is None:
+            client = self.clients[sid] = TelemetryClient(sid)
+        options = options or {}
+        if 'format' in options:
+            client.format = 'msgpack' if options['format'] == 'msgpack' and MSGPACK_AVAILABLE else 'json'
+        if 'delta' in options:
+            client.delta = bool(options['delta'])
+        if options.get('max_hz'):
+            client.interval = 1.0 / min(max(float(options['max_hz']), 0.1), TELEMETRY_MAX_HZ)
+        # The next update is a full one
+        client.last_result, client.last_payload = None, None
+        if self._wake is not None:
+            self._wake.set()
+        return {'format': client.format, 'delta': client.delta, 'max_hz': round(1.0 / client.interval, 3)}
+
+    def stats(self):
+        return {'clients': len(self.clients), 'published': self.published, 'dropped': self.dropped,
+                'sent': self.sent, 'throttled': self.throttled}
+
+    async def run(self):
+        """Broadcast until cancelled"""
+        if self._loop is None:
+            self.bind(asyncio.get_running_loop())
+        while True:
+            # Wake for new results, or when a throttled client is due the latest one
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._next_due())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._wake_scheduled = False
+            while self._oneshot:
+                await self.sio.emit(*self._oneshot.popleft())
+            while self._pending:
+                self._latest = self._pending.popleft()
+            if self._latest is not None and self.clients:
+                await self.broadcast(*self._latest)
+
+    def _next_due(self):
+        if self._latest is None or not self.clients:
+            return None
+        now = time.monotonic()
+        waiting = [c.last_sent + c.interval - now for c in self.clients.values() if c.last_result is not self._latest[0]]
+        return max(min(waiting), 0.001) if waiting else None
+
+    async def broadcast(self, result, calibrated):
+        """Send `result` to every client that is due one and has not had it yet"""
+        now = time.monotonic()
+        payload = None
+        encoded = {}
+        for client in list(self.clients.values()):
+            if client.last_result is result:
+                continue
+            if now - client.last_sent < client.interval:
+                self.throttled += 1
+                continue
+            if payload is None:
+                payload = telemetry_payload(result, calibrated)
+
+            if client.delta and client.last_payload is not None and client.since_keyframe < KEYFRAME_INTERVAL:
+                last = client.last_payload
+                message = {k: v for k, v in payload.items() if last.get(k, _MISSING) != v}
+                event, data = 'prediction_delta', self._encode(message, client.format)
+                client.since_keyframe += 1
+            else:
+                # Full updates are the same for every client in a format: encode once
+                if client.format not in encoded:
+                    encoded[client.format] = self._encode(payload, client.format)
+                event, data = 'prediction_update', encoded[client.format]
+                client.since_keyframe = 0
+
+            client.last_result, client.last_payload, client.last_sent = result, payload, now
+            try:
+                await self.sio.emit(event, data, to=client.sid)
+                self.sent += 1
+            except Exception as e:
+                print(f"[TELEMETRY] Send to {client.sid} failed: {e}")
+
+    @staticmethod
+    def _encode(message, fmt):
+        return msgpack.packb(message) if fmt == 'msgpack' else message
@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from auto_calibration import AutoCalibrator, CALIBRATION_SIZE, find_wheel_circles
+from synthetic_wheel import wheel_frame
+
+
+# A large wheel off the middle of a 1080p frame
+WHEEL = {'width': 1920, 'height': 1080, 'center': (900, 560), 'radius': 330, 'rim': 6}
+
+
+class TestFindWheelCircles:
+    def test_downscaled_search_in_full_coordinates(self):
+        frame = wheel_frame(**WHEEL)
+        scale = CALIBRATION_SIZE / 1920
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+        samples, best = find_wheel_circles(small, scale)
+        assert best == samples[0]
+        cx, cy, r = best
+        assert abs(cx - 900) < 8 and abs(cy - 560) < 8 and abs(r - 330) < 10
+
+    def test_nothing_found(self):
+        assert find_wheel_circles(np.full((360, 640, 3), 40, np.uint8), 1.0, fallback=True) == ([], None)
+
+
+class TestAutoCalibrator:
+    def test_submit_does_not_wait(self):
+        calibrator = AutoCalibrator()
+        assert calibrator.submit(wheel_frame(**WHEEL), epoch=3)
+        assert not calibrator.submit(wheel_frame(**WHEEL)) or calibrator.result is not None
+        assert calibrator.wait(5)
+        seq, epoch, samples, best = calibrator.result
+        assert seq == 1 and epoch == 3 and best is not None
+
+    def test_shutdown_joins_worker(self):
+        calibrator = AutoCalibrator()
+        calibrator.shutdown()
+        calibrator.submit(wheel_frame(**WHEEL))
+        worker = calibrator._thread
+        calibrator.shutdown(5)
+        assert not worker.is_alive() and not calibrator.busy
+        # The next search starts a new worker
+        assert calibrator.submit(wheel_frame(**WHEEL), epoch=2)
+        assert calibrator.wait(5) and calibrator.result[1] == 2
+        calibrator.shutdown(5)
+
+    def test_inline_mode(self):
+        calibrator = AutoCalibrator(threaded=False)
+        calibrator.submit(wheel_frame(**WHEEL))
+        assert calibrator.result[3] is not None
+
+
+class TestTrackerCalibration:
+    def test_locks_from_background_results(self, tracker):
+        frame = wheel_frame(**WHEEL)
+        for _ in range(50):
+            tracker.process_frame(frame, 1 / 60)
+            if tracker.calibrated:
+                break
+            tracker.auto_calibrator.wait(5)
+        assert tracker.calibrated
+        cx, cy, r = tracker.last_wheel_circle
+        assert np.hypot(cx - 900, cy - 560) < 8 and abs(r - 330) < 10
+
+    def test_stale_epoch_discarded(self, tracker):
+        tracker.auto_calibrator = AutoCalibrator(threaded=False)
+        tracker.auto_calibrator.submit(wheel_frame(**WHEEL), epoch=tracker.calibration_epoch - 1)
+        tracker.apply_auto_calibration()
+        assert tracker.center_samples == []
+        assert tracker.last_wheel_circle is None
+
+    def test_frame_thread_not_blocked(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (900, 560), 330
+        frame = wheel_frame(**WHEEL)
+        tracker.frame_count = 60
+        start = time.perf_counter()
+        tracker.process_frame(frame, 1 / 60)
+        # Hough itself is left running on the worker
+        assert tracker.auto_calibrator.busy or tracker.auto_calibrator.result is not None
+        assert time.perf_counter() - start < 0.2
+        tracker.auto_calibrator.wait(5)
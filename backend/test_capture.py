@@ -0,0 +1,265 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import CAPTURE_MARGIN
+from auto_calibration import AutoCalibrator
+from synthetic_wheel import wheel_frame
+
+
+@pytest.fixture
+def monitor_size():
+    return 1280, 720
+
+
+@pytest.fixture
+def tracker(tracker):
+    # The Hough search runs inline, so its fix is in place by the next frame
+    tracker.auto_calibrator = AutoCalibrator(threaded=False)
+    return tracker
+
+
+def grab(frame, tracker):
+    rect = tracker.capture_rect()
+    return frame[rect['top']:rect['top'] + rect['height'], rect['left']:rect['left'] + rect['width']]
+
+
+class TestCaptureRegion:
+    def test_full_source_before_calibration(self, tracker):
+        tracker.update_capture_region()
+        assert tracker.capture_roi is None
+        assert tracker.capture_rect() == tracker.monitor
+
+    def test_region_shrinks_to_wheel(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+        tracker.update_capture_region()
+        x, y, w, h = tracker.capture_roi
+        pad = int(400 * CAPTURE_MARGIN)
+        assert (x, y, w, h) == (440 - pad, 160 - pad, 400 + 2 * pad, 400 + 2 * pad)
+        assert tracker.capture_offset == (x, y)
+        # Tracker state now lives in region coordinates
+        assert tracker.center == (640 - x, 360 - y)
+        assert tracker.capture_rect() == {'top': y, 'left': x, 'width': w, 'height': h}
+
+    def test_region_offset_by_window(self, tracker):
+        tracker.window_rect = {'top': 100, 'left': 50, 'width': 1280, 'height': 720}
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+        tracker.update_capture_region()
+        x, y, _, _ = tracker.capture_roi
+        assert tracker.capture_rect()['left'] == 50 + x
+        assert tracker.capture_rect()['top'] == 100 + y
+
+    def test_coordinates_mapped_back(self, tracker):
+        full = [wheel_frame(i * 0.12) for i in range(40)]
+        for i, frame in enumerate(full[:10]):
+            tracker.process_frame(grab(frame, tracker), 1 / 60)
+            tracker.update_capture_region()
+        assert tracker.calibrated
+        assert tracker.capture_roi is not None
+
+        found = 0
+        for i, frame in enumerate(full[10:], start=10):
+            cropped = grab(frame, tracker)
+            assert cropped.shape[0] < frame.shape[0]
+            result = tracker.process_frame(cropped, 1 / 60)
+            tracker.update_capture_region()
+            if result['ball_found']:
+                found += 1
+                expected = (640 + 0.85 * 200 * np.cos(i * 0.12), 360 + 0.85 * 200 * np.sin(i * 0.12))
+                assert np.hypot(result['ball_coords'][0] - expected[0], result['ball_coords'][1] - expected[1]) < 12
+        assert found > 10
+
+    def test_drift_widens_region(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+        tracker.update_capture_region()
+        _, _, w, _ = tracker.capture_roi
+        cx, cy = tracker.center
+        tracker.last_wheel_circle = (cx + 60, cy, 200)
+        tracker.update_capture_region()
+        assert tracker.capture_margin == CAPTURE_MARGIN * 2
+        assert not tracker.calibrated
+        assert tracker.capture_roi[2] > w
+
+    def test_homography_follows_region(self, tracker):
+        tracker.set_calibration_points([[640, 160], [840, 360], [640, 560], [440, 360]])
+        full_M = tracker.M.copy()
+        tracker.update_capture_region()
+        x, y, _, _ = tracker.capture_roi
+        point = np.array([[[700.0, 300.0]]], dtype=np.float32)
+        expected = cv2.perspectiveTransform(point, full_M)
+        actual = cv2.perspectiveTransform(point - np.array([x, y], dtype=np.float32), tracker.M)
+        assert np.allclose(expected, actual, atol=1e-3)
+
+
+class TestDetectionRing:
+    def test_no_ring_before_calibration(self, tracker):
+        assert tracker.detection_ring((720, 1280, 3)) is None
+
+    def test_ring_cached_per_calibration(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+        x0, y0, x1, y1, mask = tracker.detection_ring((720, 1280, 3))
+        assert (x0, y0) == (640 - 360, 0) and y1 == 720
+        assert mask.shape == (y1 - y0, x1 - x0)
+        assert mask[360 - y0, 640 - x0] == 0
+        assert mask[360 - y0, 640 + 170 - x0] == 255
+        assert tracker.detection_ring((720, 1280, 3))[4] is mask
+        tracker.radius = 150
+        assert tracker.detection_ring((720, 1280, 3))[4] is not mask
+
+    def test_clutter_outside_ring_ignored(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 150
+        for i in range(40):
+            frame = wheel_frame(i * 0.12, radius=150)
+            # Flickering white blob in the corner, well outside 1.8 radii
+            cv2.circle(frame, (60, 60), 8, (255, 255, 255) if i % 2 else (40, 40, 40), -1)
+            result = tracker.process_frame(frame, 1 / 60)
+            if result['ball_found']:
+                x, y = result['ball_coords']
+                assert np.hypot(x - 640, y - 360) < 150 * 1.8
+
+
+class TestWarpMaps:
+    def test_remap_matches_warp_perspective(self, tracker):
+        tracker.set_calibration_points([[640, 160], [840, 360], [640, 560], [440, 360]])
+        frame = wheel_frame(1.0)
+        expected = cv2.warpPerspective(frame, tracker.M, (500, 500))
+        diff = np.abs(tracker.preprocess_frame(frame).astype(int) - expected.astype(int))
+        assert diff.mean() < 0.1 and diff.max() <= 8
+
+    def test_maps_cached_until_homography_changes(self, tracker):
+        tracker.set_calibration_points([[640, 160], [840, 360], [640, 560], [440, 360]])
+        maps = tracker._warp_maps
+        tracker.preprocess_frame(wheel_frame(0.0))
+        assert tracker._warp_maps is maps
+        tracker.update_capture_region()
+        assert tracker._warp_maps is not maps
+        assert tracker._warp_maps_for is tracker.M
+
+
+class TestPointsMode:
+    POINTS = [[640, 160], [840, 360], [640, 560], [440, 360]]
+
+    def test_source_ring_matches_warped_ring(self, tracker):
+        tracker.warp_mode = 'points'
+        tracker.set_calibration_points(self.POINTS)
+        tracker.process_frame(wheel_frame(0.0), 1 / 60)
+        x0, y0, x1, y1, mask = tracker.detection_ring((720, 1280, 3))
+        # The wheel (radius 200) fills the flat square: the ring's preimage is the 400x400 box around it
+        assert abs(x0 - 440) <= 1 and abs(y0 - 160) <= 1 and abs(x1 - 840) <= 2 and abs(y1 - 560) <= 2
+        assert mask[360 - y0, 640 - x0] == 0 and mask[360 - y0, 640 + 180 - x0] == 255
+        assert tracker._area_scale == pytest.approx((500 / 400) ** 2, rel=0.01)
+
+    def test_auto_maps_points_only_for_small_wheels(self, tracker):
+        tracker.set_calibration_points(self.POINTS)
+        assert tracker.source_homography() is tracker.M
+        tracker.set_calibration_points([[640, 60], [940, 360], [640, 660], [340, 360]])
+        assert tracker.source_homography() is None
+        tracker.warp_mode = 'points'
+        assert tracker.source_homography() is tracker.M
+
+    @pytest.mark.parametrize('detector', ['mog2', 'strip'])
+    def test_same_fixes_as_warping(self, make_tracker, detector):
+        results = {}
+        for mode in ['frame', 'points']:
+            t = make_tracker(1280, 720)
+            t.auto_calibrator = AutoCalibrator(threaded=False)
+            t.warp_mode, t.ball_detector = mode, detector
+            t.set_calibration_points(self.POINTS)
+            results[mode] = [t.process_frame(wheel_frame(i * 0.12), 1 / 60) for i in range(30)]
+
+        matched = 0
+        for warped, points in zip(results['frame'], results['points']):
+            assert warped['ball_found'] == points['ball_found']
+            if warped['ball_found']:
+                assert np.hypot(warped['ball_coords'][0] - points['ball_coords'][0],
+                                warped['ball_coords'][1] - points['ball_coords'][1]) <= 3
+                matched += 1
+        assert matched > 20
+
+
+def reference_arc_check(points, center, radius):
+    """The original loop-based check_consistent_arc_with_declining_velocity"""
+    if len(points) < 10:
+        return False
+    recent_points = points[-10:]
+    velocities = [np.sqrt((x2 - x1)**2 + (y2 - y1)**2) for (x1, y1), (x2, y2) in zip(recent_points, recent_points[1:])]
+    velocity_diffs = [b - a for a, b in zip(velocities, velocities[1:])]
+    is_declining = sum(1 for diff in velocity_diffs if diff < 0) >= len(velocity_diffs) * 0.6
+    angles = [np.arctan2(y - center[1], x - center[0]) for x, y in recent_points]
+    radii = [np.sqrt((x - center[0])**2 + (y - center[1])**2) for x, y in recent_points]
+    is_consistent_arc = np.std(radii) < (radius * 0.08 if radius else 30)
+    angle_diffs = [(b - a + np.pi) % (np.pi * 2) - np.pi for a, b in zip(angles, angles[1:])]
+    same_direction = all(d > 0 for d in angle_diffs) or all(d < 0 for d in angle_diffs)
+    return is_declining and is_consistent_arc and same_direction
+
+
+class TestArcCheck:
+    def test_matches_reference_loop(self, tracker):
+        tracker.center, tracker.radius = (250, 250), 240
+        rng = np.random.default_rng(1)
+        decisions = []
+        for trial in range(40):
+            tracker.ball_history.clear()
+            points = []
+            angle, speed, noise = rng.uniform(-np.pi, np.pi), rng.uniform(0.05, 0.3), rng.choice([0.0, 2.0, 15.0])
+            decay = rng.choice([0.9, 1.0, 1.05]) * rng.choice([1, -1], p=[0.8, 0.2])
+            for i in range(30):
+                angle += speed
+                speed *= decay
+                x = int(250 + 200 * np.cos(angle) + rng.normal(0, noise))
+                y = int(250 + 200 * np.sin(angle) + rng.normal(0, noise))
+                points.append((x, y))
+                tracker.add_history_point(x, y)
+                expected = reference_arc_check(points[-30:], tracker.center, tracker.radius)
+                assert tracker.check_consistent_arc_with_declining_velocity() == expected
+                decisions.append(expected)
+        assert any(decisions) and not all(decisions)
+
+    def test_center_change_rederives_polar_coordinates(self, tracker):
+        tracker.center, tracker.radius = (250, 250), 240
+        points = [(int(250 + 200 * np.cos(0.3 * 0.97 ** i * i)), int(250 + 200 * np.sin(0.3 * 0.97 ** i * i))) for i in range(12)]
+        for x, y in points:
+            tracker.add_history_point(x, y)
+        tracker.center = (300, 200)
+        assert tracker.check_consistent_arc_with_declining_velocity() == reference_arc_check(points, (300, 200), 240)
+
+    def test_points_after_center_change_match_reference(self, tracker):
+        # The ball circles (300, 200); calibration only finds that center after a few frames
+        tracker.center, tracker.radius = (250, 250), 240
+        points = [(int(300 + 150 * np.cos(0.3 * 0.97 ** i * i)), int(200 + 150 * np.sin(0.3 * 0.97 ** i * i))) for i in range(25)]
+        decisions = []
+        for i, (x, y) in enumerate(points):
+            if i == 6:
+                tracker.center = (300, 200)
+            tracker.add_history_point(x, y)
+            expected = reference_arc_check(points[:i + 1], tracker.center, tracker.radius)
+            assert tracker.check_consistent_arc_with_declining_velocity() == expected
+            decisions.append(expected)
+        assert any(decisions)
+
+
+class TestFrameIdentity:
+    def test_sequence_and_latency_carried_into_result(self, tracker):
+        captured = time.monotonic()
+        result = tracker.process_frame(wheel_frame(0.0), 1 / 60, seq=42, capture_time=captured)
+        assert result.seq == 42 and result.capture_time == captured
+        assert 0 <= result.latency < 5.0
+        d = result.to_dict()
+        assert d['seq'] == 42 and d['latency'] == result.latency
+        assert tracker.frame_latency.summary()['capture_to_result']['count'] == 1
+
+        # Frames without a capture timestamp have no latency
+        result = tracker.process_frame(wheel_frame(0.0), 1 / 60)
+        assert result.seq is None and result.latency is None
+
+    def test_frames_over_budget_are_flagged(self, tracker):
+        tracker.frame_budget = 0.0
+        assert tracker.process_frame(wheel_frame(0.0), 1 / 60).over_budget
+        tracker.frame_budget = 10.0
+        assert not tracker.process_frame(wheel_frame(0.0), 1 / 60).over_budget
+        assert tracker.frames_over_budget == 1
@@ -0,0 +1,190 @@
+import pytest
+import sys
+import asyncio
+import os
+import time
+from unittest.mock import Mock, patch
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from frame_capture import FrameCapture
+
+
+def counting_grab():
+    count = [0]
+
+    def grab(out):
+        count[0] += 1
+        if out is None:
+            out = np.empty((4, 4, 3), np.uint8)
+        out[:] = count[0] % 255
+        return out, 'rect'
+    return grab
+
+
+class TestQueuePolicy:
+    def test_drop_oldest(self):
+        capture = FrameCapture(counting_grab(), capacity=3, drop_policy='oldest')
+        for i in range(5):
+            capture._put(i, 'rect', float(i))
+        assert capture.dropped == 2
+        assert [p[2] for p in capture._queue] == [2, 3, 4]
+        assert capture.get(timeout=0, latest=False)[2] == 2
+
+    def test_drop_newest(self):
+        capture = FrameCapture(counting_grab(), capacity=3, drop_policy='newest')
+        for i in range(5):
+            capture._put(i, 'rect', float(i))
+        assert capture.dropped == 2
+        assert [p[2] for p in capture._queue] == [0, 1, 2]
+
+    def test_latest_discards_backlog(self):
+        capture = FrameCapture(counting_grab(), capacity=4)
+        for i in range(3):
+            capture._put(i, 'rect', float(i))
+        seq, timestamp, frame, tag = capture.get(timeout=0)
+        assert (seq, timestamp, frame, tag) == (3, 2.0, 2, 'rect')
+        assert capture.stats() == {'captured': 3, 'dropped': 2, 'processed': 1, 'queued': 0, 'errors': 0}
+
+    def test_get_times_out(self):
+        capture = FrameCapture(counting_grab())
+        capture._running = True
+        assert capture.get(timeout=0.01) is None
+
+    def test_buffers_recycled(self):
+        capture = FrameCapture(counting_grab(), capacity=2)
+        capture.start()
+        try:
+            seen = set()
+            for _ in range(20):
+                packet = capture.get(timeout=1)
+                seen.add(id(packet[2]))
+        finally:
+            capture.stop()
+        assert len(seen) <= 4
+
+    def test_buffers_recycled_when_grab_raises(self):
+        count = [0]
+        allocated = []
+
+        def grab(out):
+            count[0] += 1
+            if count[0] % 2:
+                raise RuntimeError('window moved')
+            if out is None:
+                out = np.empty((4, 4, 3), np.uint8)
+                allocated.append(out)
+            return out, 'rect'
+
+        # Nobody consumes: once the queue is full every grab gets the evicted oldest buffer
+        capture = FrameCapture(grab, capacity=2, fps=0)
+        capture.start()
+        time.sleep(0.6)
+        capture.stop()
+        assert capture.errors >= 4
+        assert len(allocated) <= 4
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            FrameCapture(counting_grab(), drop_policy='middle')
+
+
+class TestCaptureThread:
+    def test_cadence_independent_of_consumer(self):
+        capture = FrameCapture(counting_grab(), capacity=2, fps=100)
+        capture.start()
+        try:
+            timestamps = []
+            start = time.monotonic()
+            while time.monotonic() - start < 0.5:
+                packet = capture.get(timeout=1)
+                timestamps.append(packet[1])
+                time.sleep(0.05)  # slow processing
+        finally:
+            capture.stop()
+        assert capture.captured >= 35
+        assert capture.processed <= 12
+        assert capture.captured == capture.processed + capture.dropped + len(capture._queue)
+        assert all(b > a for a, b in zip(timestamps, timestamps[1:]))
+
+    def test_grab_errors_counted(self):
+        capture = FrameCapture(Mock(side_effect=RuntimeError('gone')), fps=100)
+        capture.start()
+        time.sleep(0.05)
+        capture.stop()
+        assert capture.errors >= 1
+        assert capture.captured == 0
+
+
+class TestTrackerGrabber:
+    def test_grabber_tags_rect(self, make_tracker):
+        tracker = make_tracker(8, 6)
+        tracker.sct.grab.return_value = np.zeros((6, 8, 4), np.uint8)
+        # The grabber opens its own mss handle on the capture thread
+        with patch('main.mss.mss', return_value=tracker.sct):
+            frame, rect = tracker.frame_grabber()(None)
+        assert frame.shape == (6, 8, 3)
+        assert rect == tracker.monitor
+
+    def test_grabber_converts_into_recycled_buffer(self, make_tracker):
+        from main import screenshot_view
+        shot = Mock(width=8, height=6, raw=bytearray(np.arange(6 * 8 * 4, dtype=np.uint8).tobytes()))
+        tracker = make_tracker(8, 6)
+        tracker.sct.grab.return_value = shot
+        with patch('main.mss.mss', return_value=tracker.sct):
+            grab = tracker.frame_grabber()
+            buffer = np.empty((6, 8, 3), np.uint8)
+            frame, _ = grab(buffer)
+        assert frame is buffer
+        view = screenshot_view(shot)
+        assert np.shares_memory(view, np.frombuffer(shot.raw, np.uint8))
+        assert np.array_equal(frame, view[:, :, :3])
+
+    def test_run_processes_captured_frames(self, make_tracker):
+        from main import ProfessionalRouletteTracker
+        tracker = make_tracker(320, 240)
+
+        grabber = lambda self: (lambda out: (np.zeros((240, 320, 3), np.uint8), tracker.capture_rect()))
+        keys = iter([255] * 5 + [ord('q')])
+        # The tracker is slotted: methods are patched on the class
+        with patch.object(ProfessionalRouletteTracker, 'frame_grabber', grabber), \
+             patch.object(ProfessionalRouletteTracker, 'show_tracking_view'), \
+             patch('main.cv2.waitKey', side_effect=lambda _: next(keys)), \
+             patch('main.cv2.destroyAllWindows'):
+            asyncio.run(tracker.run())
+        assert tracker.frame_capture.processed == 6
+        assert tracker.frame_count == 6
+
+    def test_async_run_keeps_the_event_loop_free_and_cancels_cleanly(self):
+        from main import ProfessionalRouletteTracker
+        from replay import headless_tracker
+        tracker = headless_tracker(320, 240)
+        grabber = lambda self: (lambda out: (np.zeros((240, 320, 3), np.uint8), tracker.capture_rect()))
+        real_process_frame = ProfessionalRouletteTracker.process_frame
+
+        def slow_process_frame(self, *args):
+            # A blocking 20 ms frame, as OpenCV work would be
+            time.sleep(0.02)
+            return real_process_frame(self, *args)
+
+        async def scenario():
+            task = asyncio.create_task(tracker.run(headless=True))
+            ticks = 0
+            started = time.monotonic()
+            while time.monotonic() - started < 0.3:
+                await asyncio.sleep(0.005)
+                ticks += 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return ticks
+
+        with patch.object(ProfessionalRouletteTracker, 'frame_grabber', grabber), \
+             patch.object(ProfessionalRouletteTracker, 'process_frame', slow_process_frame):
+            ticks = asyncio.run(scenario())
+        # The loop kept ticking at about its 5 ms pace while frames were processed
+        assert tracker.frame_count >= 5
+        assert ticks >= 30
+        assert not tracker.running
+        assert tracker.frame_capture._thread is None
@@ -0,0 +1,42 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from frame_result import FrameResult
+
+
+def make_result(**overrides):
+    fields = dict(ball_x=11, ball_y=21, zero_x=None, zero_y=None, confidence=55.5, prediction=np.int64(17),
+                  wheel_rpm=np.float64(3.0), ball_rpm=np.float64(30.0), is_spinning=True, spin_finished=None,
+                  pocket_probabilities=np.full(38, 1 / 38), ball_found=True, wheel_found=False)
+    fields.update(overrides)
+    return FrameResult(**fields)
+
+
+class TestFrameResult:
+    def test_to_dict_matches_old_format(self):
+        d = make_result().to_dict()
+        assert list(d) == list(FrameResult.KEYS)
+        assert d['ball_coords'] == (11, 21) and d['zero_coords'] == (None, None)
+        assert type(d['prediction']) is int and d['prediction'] == 17
+        assert type(d['ball_rpm']) is float and type(d['confidence']) is float
+        assert isinstance(d['pocket_probabilities'], list) and len(d['pocket_probabilities']) == 38
+        assert make_result(pocket_probabilities=None).to_dict()['pocket_probabilities'] is None
+        assert d['seq'] is None and d['latency'] is None and d['over_budget'] is False
+
+    def test_dict_style_access(self):
+        result = make_result()
+        assert result['ball_found'] and not result['wheel_found']
+        assert result['ball_coords'] == (11, 21)
+        assert result.get('missing', 'x') == 'x'
+        with pytest.raises(KeyError):
+            result['missing']
+
+    def test_slotted(self):
+        result = make_result()
+        assert not hasattr(result, '__dict__')
+        with pytest.raises(AttributeError):
+            result.extra = 1
@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lookup import PredictionTable, TABLE_SHAPE, TABLE_TOLERANCE, table_path
+from physics import lock_offsets, final_relative_angle, pocket_from_angle
+
+
+@pytest.fixture(scope="module")
+def table_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("lut"))
+    PredictionTable.open(directory, build=True)
+    return directory
+
+
+class TestPredictionTable:
+    def test_missing_table_not_built_by_default(self, tmp_path):
+        assert PredictionTable.open(str(tmp_path)) is None
+        assert not os.listdir(tmp_path)
+
+    def test_table_is_memory_mapped(self, table_dir):
+        table = PredictionTable.open(table_dir)
+        assert table.offsets.shape == TABLE_SHAPE
+        assert isinstance(table.offsets.base, np.memmap) or isinstance(table.offsets.base.base, np.memmap)
+
+    def test_interpolation_within_tolerance(self, table_dir):
+        table = PredictionTable.open(table_dir)
+        rng = np.random.default_rng(2)
+        w_speeds, b_speeds = rng.uniform(0, 0.3, 2000), rng.uniform(0, 1.0, 2000)
+        exact = lock_offsets(w_speeds, b_speeds)
+        answered = 0
+        for w, b, expected in zip(w_speeds, b_speeds, exact):
+            offset = table.relative_offset(w, b)
+            if offset is not None:
+                answered += 1
+                assert abs(offset - expected) < TABLE_TOLERANCE
+        assert answered > 1950
+
+    def test_outside_range_returns_none(self, table_dir):
+        table = PredictionTable.open(table_dir)
+        assert table.relative_offset(5.0, 0.1) is None
+        assert table.relative_offset(0.1, 5.0) is None
+
+    def test_key_changes_with_constants(self, table_dir):
+        original = table_path(table_dir)
+        with patch('lookup.GRAVITY', 0.013):
+            assert table_path(table_dir) != original
+            assert PredictionTable.open(table_dir) is None
+
+
+class TestTrackerWithTable:
+    def test_predict_uses_table(self, tracker, table_dir):
+        tracker.prediction_table = PredictionTable.open(table_dir)
+        with patch('main.final_relative_angle') as mock_closed_form:
+            result = tracker.predict(0.04, 0.15, 0.3, 1.2)
+            mock_closed_form.assert_not_called()
+        expected = pocket_from_angle(final_relative_angle(0.04, 0.15, 0.3, 1.2))
+        assert result == expected
+
+    def test_predict_falls_back_outside_table(self, tracker, table_dir):
+        tracker.prediction_table = PredictionTable.open(table_dir)
+        assert tracker.predict(0.05, 1.5, 0.0, 0.0) == pocket_from_angle(final_relative_angle(0.05, 1.5, 0.0, 0.0))
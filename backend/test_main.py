@@ -99,12 +99,13 @@ class TestProfessionalRouletteTracker:
 
     @pytest.mark.asyncio
     async def test_run_initialization(self, tracker):
+        # Frames come from the capture thread's grabber; the tracker is slotted, so it is patched on the class
+        grabber = lambda self: (lambda out: (np.zeros((1080, 1920, 3), dtype=np.uint8), tracker.capture_rect()))
         with patch('main.mss.mss') as mock_mss, \
              patch('main.cv2.cvtColor') as mock_cvt, \
              patch('main.cv2.HoughCircles') as mock_circles, \
-             patch.object(tracker, 'sct') as mock_sct:
+             patch.object(ProfessionalRouletteTracker, 'frame_grabber', grabber):
 
-            mock_sct.grab.return_value = np.zeros((1080, 1920, 4), dtype=np.uint8)
             mock_cvt.return_value = np.zeros((1080, 1920, 3), dtype=np.uint8)
             mock_circles.return_value = None
 
@@ -119,6 +120,20 @@ class TestProfessionalRouletteTracker:
 
             assert tracker.frame_count > 0
 
+    @pytest.mark.asyncio
+    async def test_run_stops_workers(self, tracker):
+        grabber = lambda self: (lambda out: (np.zeros((1080, 1920, 3), dtype=np.uint8), tracker.capture_rect()))
+        with patch('main.mss.mss'), \
+             patch.object(ProfessionalRouletteTracker, 'frame_grabber', grabber):
+            task = asyncio.create_task(tracker.run(headless=True))
+            while tracker.auto_calibrator._thread is None:
+                await asyncio.sleep(0.01)
+            worker = tracker.auto_calibrator._thread
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert tracker.auto_calibrator._thread is None and not worker.is_alive()
+
     @pytest.mark.asyncio
     async def test_run_calibration(self, tracker):
         with patch('main.mss.mss'), \
@@ -210,6 +225,16 @@ class TestAPIEndpoints:
             data = response.json()
             assert data["status"] == "ok"
 
+    def test_tracker_not_started(self, client):
+        # Before startup_event, or when the app is mounted without its lifespan
+        window_data = {'title': 'Test Tab', 'x': 100, 'y': 100, 'width': 800, 'height': 600}
+        with patch('main.tracker', None):
+            assert client.post("/api/select-window", json=window_data).status_code == 503
+            assert client.post("/api/reset-window").status_code == 503
+            response = client.get("/api/telemetry")
+            assert response.status_code == 503
+            assert response.json()["detail"] == "Tracker not started"
+
 class TestChromeWindows:
     def test_get_chrome_windows_macos(self):
         with patch('platform.system', return_value='Darwin'):
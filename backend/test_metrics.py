@@ -0,0 +1,77 @@
+import pytest
+import sys
+import os
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from frame_result import FrameResult
+from metrics import TrackerMetrics, MetricsServer
+from replay import headless_tracker
+
+
+def result(spinning=False, prediction=-1, finished=None, ball=True, confidence=50.0):
+    return FrameResult(1, 2, None, None, confidence, prediction, 0.0, 0.0, spinning, finished,
+                       None, ball, False)
+
+
+def samples(text):
+    """{metric line name with labels: value} from Prometheus text"""
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if line and not line.startswith('#')}
+
+
+class TestTrackerMetrics:
+    def test_counts_spins_predictions_and_transitions(self):
+        metrics = TrackerMetrics(headless_tracker(320, 240))
+        frames = ([result()] * 3 + [result(spinning=True)] * 2 + [result(spinning=True, prediction=7)] * 4
+                  + [result(finished={'number': 7, 'predicted': 7, 'actual': 7})] + [result(ball=False, confidence=10.0)])
+        for r in frames:
+            metrics.observe(r)
+        values = samples(metrics.render())
+        assert values['roulette_frames_processed_total'] == 11
+        assert values['roulette_ball_found_total'] == 10
+        assert values['roulette_spins_started_total'] == 1
+        assert values['roulette_spins_finished_total'] == 1
+        assert values['roulette_predictions_total'] == 1
+        assert values['roulette_state_transitions_total{from="IDLE",to="SPINNING"}'] == 1
+        assert values['roulette_state_transitions_total{from="SPINNING",to="IDLE"}'] == 1
+        assert values['roulette_confidence'] == 10.0
+        assert values['roulette_spinning'] == 0
+        assert values['roulette_frames_over_budget_total'] == 0
+
+    def test_stage_latencies_as_summaries(self):
+        tracker = headless_tracker(320, 240)
+        tracker.timers.enabled = True
+        tracker.process_frame(np.zeros((240, 320, 3), np.uint8), 1 / 60)
+        values = samples(TrackerMetrics(tracker).render())
+        assert 'roulette_stage_latency_seconds{stage="mog2",quantile="0.99"}' in values
+        assert values['roulette_stage_latency_seconds_count{stage="total"}'] == 1
+
+    def test_capture_latency_and_budget(self):
+        tracker = headless_tracker(320, 240)
+        tracker.frame_budget = 0.0
+        metrics = TrackerMetrics(tracker)
+        metrics.observe(tracker.process_frame(np.zeros((240, 320, 3), np.uint8), 1 / 60, 1, time.monotonic()))
+        values = samples(metrics.render())
+        assert values['roulette_frames_over_budget_total'] == 1
+        assert values['roulette_frame_latency_seconds_count{path="capture_to_result"}'] == 1
+
+
+class TestMetricsServer:
+    def test_serves_metrics_on_localhost(self):
+        metrics = TrackerMetrics(headless_tracker(320, 240))
+        metrics.observe(result())
+        server = MetricsServer(metrics, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as response:
+                assert response.headers['Content-Type'].startswith('text/plain')
+                assert samples(response.read().decode())['roulette_frames_processed_total'] == 1
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'http://127.0.0.1:{server.port}/other', timeout=5)
+        finally:
+            server.stop()
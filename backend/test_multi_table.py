@@ -0,0 +1,196 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from multi_table import MultiTableSupervisor, screen_grabber, table_calibration_path, union_region
+
+
+def synthetic_grab():
+    """Spinning wheel per table; table i's ball moves at a different speed"""
+    count = {}
+
+    def grab(index, region, out):
+        i = count[index] = count.get(index, 0) + 1
+        h, w = out.shape[:2]
+        cx, cy, r = w // 2, h // 2, min(w, h) // 3
+        out[:] = 40
+        cv2.circle(out, (cx, cy), r, (20, 60, 20), -1)
+        a = i * 0.1 * (index + 1)
+        cv2.circle(out, (int(cx + 0.85 * r * np.cos(a)), int(cy + 0.85 * r * np.sin(a))), 5, (255, 255, 255), -1)
+        return True
+
+    return grab
+
+
+def tables(tmp_path, n):
+    return [{'region': {'top': 0, 'left': 320 * i, 'width': 320, 'height': 240},
+             'calibration_path': str(tmp_path / f'table{i}.npz')} for i in range(n)]
+
+
+class TestMultiTableSupervisor:
+    def test_merges_results_from_every_table(self, tmp_path):
+        supervisor = MultiTableSupervisor(tables(tmp_path, 2), grab=synthetic_grab(), fps=30)
+        with supervisor:
+            seen = {0: [], 1: []}
+            deadline = time.monotonic() + 60
+            while min(len(v) for v in seen.values()) < 20 and time.monotonic() < deadline:
+                event = supervisor.get(timeout=1.0)
+                if event is not None and event['type'] == 'frame':
+                    seen[event['table']].append(event)
+            stats = supervisor.stats()
+            names = [c.slots.shm.name for c in supervisor.channels]
+
+        for index, events in seen.items():
+            assert len(events) >= 20
+            seqs = [e['seq'] for e in events]
+            assert seqs == sorted(seqs)
+            assert sum(e['ball_found'] for e in events) > 10
+            assert all(e['latency'] >= 0 for e in events)
+            # Capture identity survives the round trip through the worker
+            assert all(e['capture_time'] == e['timestamp'] and 'over_budget' in e for e in events)
+        assert stats['totals']['processed'] >= 40
+        assert all(t['alive'] for t in stats['tables'])
+        # Shared memory is released on stop
+        from multiprocessing import shared_memory
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+    def test_failed_grabs_release_the_slot(self, tmp_path):
+        calls = []
+
+        def grab(index, region, out):
+            calls.append(index)
+            return False
+
+        supervisor = MultiTableSupervisor(tables(tmp_path, 1), grab=grab, fps=100)
+        with supervisor:
+            time.sleep(0.3)
+            stats = supervisor.stats()
+        # Failed grabs hand the slot back instead of queueing it
+        assert calls and stats['totals']['captured'] == 0 and stats['totals']['dropped'] == 0
+
+    def test_grab_errors_are_counted_and_logged_once(self, tmp_path, capsys):
+        def grab(index, region, out):
+            raise ValueError("screenshot is 640x480, region is 320x240")
+
+        supervisor = MultiTableSupervisor(tables(tmp_path, 1), grab=grab, fps=100)
+        with supervisor:
+            time.sleep(0.3)
+            stats = supervisor.stats()
+        assert stats['totals']['grab_errors'] > 5 and stats['totals']['captured'] == 0
+        assert capsys.readouterr().out.count("Grab failed for table 0") == 1
+
+    def test_screen_grabber_rejects_mismatched_screenshot(self):
+        # e.g. HiDPI scaling: mss returns twice the pixels the region asked for
+        with patch('multi_table.mss.mss') as mock_mss:
+            mock_mss.return_value.grab.return_value = np.zeros((480, 640, 4), np.uint8)
+            grab = screen_grabber()
+            with pytest.raises(ValueError):
+                grab(0, {'top': 0, 'left': 0, 'width': 320, 'height': 240}, np.zeros((240, 320, 3), np.uint8))
+            out = np.zeros((480, 640, 3), np.uint8)
+            assert grab(0, {'top': 0, 'left': 0, 'width': 640, 'height': 480}, out)
+
+    def test_dead_worker_releases_union_slots(self, tmp_path):
+        draw = synthetic_grab()
+
+        def grab(index, region, out):
+            for i in range(2):
+                draw(i, None, out[:, 320 * i:320 * (i + 1)])
+            return True
+
+        supervisor = MultiTableSupervisor(tables(tmp_path, 2), grab=grab, fps=30, union=True)
+        with supervisor:
+            deadline = time.monotonic() + 60
+            while supervisor.stats()['tables'][1]['processed'] < 5 and time.monotonic() < deadline:
+                time.sleep(0.1)
+            supervisor.channels[1].process.kill()
+            supervisor.channels[1].process.join()
+            processed = supervisor.stats()['tables'][0]['processed']
+            deadline = time.monotonic() + 60
+            while supervisor.stats()['tables'][0]['processed'] < processed + 20 and time.monotonic() < deadline:
+                time.sleep(0.1)
+            stats = supervisor.stats()
+
+        # The shared grab goes on for the table that is left
+        assert stats['tables'][0]['processed'] >= processed + 20
+        assert stats['dead_workers'] == [1] and stats['tables'][0]['alive']
+
+    def test_union_capture_grabs_once_per_tick(self, tmp_path):
+        grabs = []
+        draw = synthetic_grab()
+
+        def grab(index, region, out):
+            grabs.append((index, region))
+            # Draw each table into its part of the union rect
+            for i in range(2):
+                draw(i, None, out[:, 320 * i:320 * (i + 1)])
+            return True
+
+        supervisor = MultiTableSupervisor(tables(tmp_path, 2), grab=grab, fps=30, union=True)
+        with supervisor:
+            seen = {0: {}, 1: {}}
+            deadline = time.monotonic() + 60
+            while min(len(v) for v in seen.values()) < 20 and time.monotonic() < deadline:
+                event = supervisor.get(timeout=1.0)
+                if event is not None and event['type'] == 'frame':
+                    seen[event['table']][event['seq']] = event
+            names = {c.slots.shm.name for c in supervisor.channels}
+
+        assert {index for index, _ in grabs} == {None}
+        assert all(region == {'top': 0, 'left': 0, 'width': 640, 'height': 240} for _, region in grabs)
+        assert len(names) == 1
+        for index, events in seen.items():
+            assert len(events) >= 20
+            # Each table only sees its own wheel, in its own coordinates
+            found = [e for e in events.values() if e['ball_found']]
+            assert len(found) > 10
+            assert all(0 <= e['ball_coords'][0] < 320 for e in found)
+        # Both tables got the same grab: same sequence number, same timestamp
+        common = set(seen[0]) & set(seen[1])
+        assert common and all(seen[0][s]['timestamp'] == seen[1][s]['timestamp'] for s in common)
+
+    def test_spin_finishes_inside_a_worker(self, tmp_path, monkeypatch):
+        # The result read runs inside the (daemonic) worker, which may not start a process pool of its own
+        monkeypatch.chdir(tmp_path)
+        start = time.monotonic()
+
+        def grab(index, region, out):
+            h, w = out.shape[:2]
+            cx, cy, r = w // 2, h // 2, 150
+            out[:] = 40
+            cv2.circle(out, (cx, cy), r, (20, 60, 20), -1)
+            # Fast laps for a second, then the ball creeps along at about 5 rpm: settled
+            elapsed = time.monotonic() - start
+            a = min(elapsed, 1.0) * 12.0 + max(elapsed - 1.0, 0.0) * 0.5
+            cv2.circle(out, (int(cx + 0.85 * r * np.cos(a)), int(cy + 0.85 * r * np.sin(a))), 6, (255, 255, 255), -1)
+            return True
+
+        table = {'region': {'top': 0, 'left': 0, 'width': 640, 'height': 480},
+                 'calibration_path': str(tmp_path / 'table0.npz')}
+        supervisor = MultiTableSupervisor([table], grab=grab, fps=30)
+        with supervisor:
+            spin = None
+            deadline = time.monotonic() + 60
+            while spin is None and time.monotonic() < deadline:
+                event = supervisor.get(timeout=1.0)
+                if event is not None and event['type'] == 'spin':
+                    spin = event
+            stats = supervisor.stats()
+
+        assert spin is not None and spin['finished']
+        assert stats['totals']['failed'] == 0
+
+    def test_union_region(self):
+        union = union_region([{'top': 100, 'left': 0, 'width': 300, 'height': 200},
+                              {'top': 50, 'left': 400, 'width': 200, 'height': 100}])
+        assert union == {'top': 50, 'left': 0, 'width': 600, 'height': 250}
+
+    def test_calibration_paths_per_table(self):
+        assert table_calibration_path(0) != table_calibration_path(1)
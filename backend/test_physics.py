@@ -0,0 +1,111 @@
+import pytest
+import sys
+import os
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from physics import (POCKETS, ANGLE_TOLERANCE, MAX_STEPS, MAX_CLOSED_FORM_BALL_SPEED, TWO_PI,
+                     simulate_stepwise, lock_step, lock_steps, final_relative_angle, pocket_from_angle,
+                     predict_distribution)
+
+
+def reference_predict(w_speed, b_speed, w_angle, b_angle):
+    """The original per-step predict loop, kept as the ground truth"""
+    _, wa, ba = simulate_stepwise(w_speed, b_speed)
+    rel_angle = ((b_angle + ba - w_angle - wa) % TWO_PI + TWO_PI) % TWO_PI
+    return POCKETS[int((rel_angle / (TWO_PI / 38)) + 0.5) % 38]
+
+
+class TestClosedFormPhysics:
+    def test_lock_step_matches_stepwise(self):
+        rng = np.random.default_rng(7)
+        speeds = np.column_stack([rng.uniform(0, 0.6, 3000), rng.uniform(0, 2.0, 3000)])
+        for sw, sb in speeds:
+            assert lock_step(sw, sb) == simulate_stepwise(sw, sb)[0]
+
+    def test_relative_angle_within_tolerance(self):
+        rng = np.random.default_rng(11)
+        for sw, sb, wa, ba in rng.uniform(0, [0.3, 0.8, TWO_PI, TWO_PI], size=(1000, 4)):
+            _, w_travel, b_travel = simulate_stepwise(sw, sb)
+            expected = (ba + b_travel - wa - w_travel) % TWO_PI
+            diff = (final_relative_angle(sw, sb, wa, ba) - expected + np.pi) % TWO_PI - np.pi
+            assert abs(diff) < ANGLE_TOLERANCE
+
+    def test_edge_speeds(self):
+        for sw, sb in [(0, 0), (0.2, 0), (0, 0.3), (-0.1, -0.15), (0.05, MAX_CLOSED_FORM_BALL_SPEED + 0.1)]:
+            assert lock_step(sw, sb) == simulate_stepwise(sw, sb)[0]
+
+    def test_no_lock_runs_full_simulation(self):
+        # Wheel much faster than the ball: speeds only converge after the step limit
+        assert lock_step(20.0, 0.0) == simulate_stepwise(20.0, 0.0)[0] == MAX_STEPS
+
+    def test_pocket_from_angle_wraps(self):
+        assert pocket_from_angle(0.0) == POCKETS[0]
+        assert pocket_from_angle(TWO_PI) == POCKETS[0]
+        assert pocket_from_angle(-TWO_PI / 38) == POCKETS[37]
+
+
+class TestBatchedPhysics:
+    def test_lock_steps_matches_scalar(self):
+        rng = np.random.default_rng(3)
+        sw = np.concatenate([rng.uniform(0, 0.6, 4000), [0, 0.2, 0, 20.0]])
+        sb = np.concatenate([rng.uniform(0, 2.0, 4000), [0, 0, 0.3, 0]])
+        expected = [lock_step(w, b) for w, b in zip(sw, sb)]
+        assert lock_steps(sw, sb).tolist() == expected
+
+    def test_lock_steps_broadcasts(self):
+        steps = lock_steps(0.05, np.array([[0.1, 0.2], [0.3, 0.4]]))
+        assert steps.shape == (2, 2)
+        assert steps[1, 0] == lock_step(0.05, 0.3)
+
+    def test_lock_steps_fast_balls_match_stepwise(self):
+        rng = np.random.default_rng(5)
+        sw = rng.uniform(0, 0.6, 1000)
+        sb = rng.uniform(MAX_CLOSED_FORM_BALL_SPEED, 7.0, 1000)
+        expected = [simulate_stepwise(w, b)[0] for w, b in zip(sw, sb)]
+        assert lock_steps(sw, sb).tolist() == expected
+
+    def test_default_batch_within_stepwise_budget(self):
+        # One default batch per SPINNING frame must cost less than the single stepwise predict it replaced
+        rng = np.random.default_rng(1)
+        for sw, sb in [(0.1, 0.5), (0.02, 1.0), (0.1, 1.5)]:
+            # Interleaved, best of several rounds, so a scheduler hiccup does not pick the winner
+            rounds = [(timeit.timeit(lambda: predict_distribution(sw, sb, 0.3, 1.2, 0.003, 0.01, rng=rng), number=10),
+                       timeit.timeit(lambda: simulate_stepwise(sw, sb), number=10)) for _ in range(9)]
+            batch, stepwise = np.min(rounds, axis=0)
+            assert batch < stepwise, (sw, sb, batch, stepwise)
+
+    def test_distribution_is_normalized(self):
+        probs = predict_distribution([0.03, 0.05], [0.1, 0.2], [0.0, 1.0], [2.0, 3.0], 0.002, 0.01,
+                                     samples=1000, rng=np.random.default_rng(0))
+        assert probs.shape == (38,)
+        assert np.isclose(probs.sum(), 1.0)
+        assert (probs >= 0).all()
+
+    def test_noise_free_distribution_matches_predict(self):
+        rel_angle = final_relative_angle(0.04, 0.15, 0.5, 2.5)
+        probs = predict_distribution(0.04, 0.15, 0.5, 2.5, samples=64)
+        assert POCKETS[int(np.argmax(probs))] == pocket_from_angle(rel_angle)
+        assert probs.max() == 1.0
+
+
+class TestTrackerPredict:
+    def test_predict_matches_reference_loop(self, tracker):
+        tracker.prediction_table = None
+        for i in range(200):
+            args = (0.02 + (i % 10) * 0.02, 0.05 + (i % 20) * 0.03, (i % 7) * 0.9, (i % 5) * 1.3)
+            assert tracker.predict(*args) == reference_predict(*args)
+
+    def test_speed_noise_tracks_variance(self, tracker):
+        assert tracker.speed_noise() == (0.0, 0.0)
+        tracker.ball_speed_var = 0.09
+        _, ball_noise = tracker.speed_noise()
+        assert np.isclose(ball_noise, 0.3 * np.sqrt(0.2 / 1.8))
+
+    def test_predict_distribution_uses_tracker_noise(self, tracker):
+        tracker.ball_speed_var = 0.01
+        probs = tracker.predict_distribution(0.04, 0.15, 0.0, 1.0, samples=512)
+        assert np.isclose(probs.sum(), 1.0)
+        assert (probs > 0).sum() > 1
@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from physics import POCKETS, POCKET_ANGLE
+from pocket_templates import PocketTemplateBank, save_calibration, load_template_bank
+
+CENTER, RADIUS = (250, 250), 240
+
+
+def wheel(rotation=0.0):
+    """Warped 500x500 wheel with every pocket number drawn; the zero pocket sits at angle 0 before rotating"""
+    img = np.full((500, 500, 3), 30, np.uint8)
+    cv2.circle(img, CENTER, RADIUS, (20, 60, 20), -1)
+    for i, number in enumerate(POCKETS):
+        a = i * POCKET_ANGLE
+        x, y = CENTER[0] + 0.76 * RADIUS * np.cos(a), CENTER[1] + 0.76 * RADIUS * np.sin(a)
+        cv2.putText(img, str(number), (int(x) - 10, int(y) + 6), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    # Image rotation by -deg turns the content by +rotation in arctan2(y, x) terms
+    R = cv2.getRotationMatrix2D(CENTER, -np.degrees(rotation), 1.0)
+    return cv2.warpAffine(img, R, (500, 500))
+
+
+@pytest.fixture
+def monitor_size():
+    return 1280, 720
+
+
+class TestPocketTemplateBank:
+    def test_build_shape(self):
+        bank = PocketTemplateBank.build(wheel(), CENTER, RADIUS, 0.0)
+        assert bank.templates.shape[0] == 38
+        assert np.allclose(np.linalg.norm(bank.templates, axis=1), 1.0, atol=1e-4)
+
+    @pytest.mark.parametrize('rotation', [0.0, 1.3, -2.4])
+    def test_reads_every_pocket_at_any_rotation(self, rotation):
+        bank = PocketTemplateBank.build(wheel(), CENTER, RADIUS, 0.0)
+        frame = wheel(rotation)
+        for i, number in enumerate(POCKETS):
+            # Ball a little off the pocket center
+            ball_angle = rotation + i * POCKET_ANGLE + 0.2 * POCKET_ANGLE
+            assert bank.match(frame, CENTER, RADIUS, ball_angle)[0] == number
+
+    def test_blank_wheel_no_match(self):
+        bank = PocketTemplateBank.build(wheel(), CENTER, RADIUS, 0.0)
+        number, _ = bank.match(np.full((500, 500, 3), 30, np.uint8), CENTER, RADIUS, 0.0)
+        assert number == -1
+
+    def test_match_is_fast(self):
+        bank = PocketTemplateBank.build(wheel(), CENTER, RADIUS, 0.0)
+        frame = wheel(0.7)
+        start = time.perf_counter()
+        for _ in range(100):
+            bank.match(frame, CENTER, RADIUS, 1.0)
+        assert (time.perf_counter() - start) / 100 < 0.002
+
+
+class TestPersistence:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / 'calibration.npz')
+        points = np.array([[640, 160], [840, 360], [640, 560], [440, 360]], np.float32)
+        bank = PocketTemplateBank.build(wheel(), CENTER, RADIUS, 0.0)
+        save_calibration(path, points, np.eye(3), bank)
+        assert np.array_equal(load_template_bank(path, points + 1).templates, bank.templates)
+        assert load_template_bank(path, points + 10) is None
+
+    def test_nothing_saved_unless_asked(self, tracker):
+        points = [[640, 160], [840, 360], [640, 560], [440, 360]]
+        tracker.set_calibration_points(points)
+        tracker.last_wheel_angle = 0.0
+        tracker.build_template_bank(wheel())
+        assert not os.path.exists(tracker.calibration_path)
+
+        tracker.save_calibration()
+        assert load_template_bank(tracker.calibration_path, points) is not None
+
+    def test_tracker_builds_and_restores(self, tracker):
+        points = [[640, 160], [840, 360], [640, 560], [440, 360]]
+        tracker.persist_calibration = True
+        tracker.set_calibration_points(points)
+        assert tracker.template_bank is None
+        tracker.last_wheel_angle = 0.0
+        tracker.build_template_bank(wheel())
+
+        tracker.template_bank = None
+        tracker.set_calibration_points(points)
+        assert tracker.template_bank is not None
+        assert tracker.detect_winning_number(wheel(0.5), 0.5 + 3 * POCKET_ANGLE) == POCKETS[3]
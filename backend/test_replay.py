@@ -0,0 +1,99 @@
+import pytest
+import sys
+import os
+import io
+import json
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay import VideoReplay, SpinRecorder, headless_tracker
+from frame_result import FrameResult
+
+
+def write_video(path, frames=40, width=320, height=240):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    cx, cy, r = width // 2, height // 2, 90
+    for i in range(frames):
+        frame = np.full((height, width, 3), 40, np.uint8)
+        cv2.circle(frame, (cx, cy), r, (20, 60, 20), -1)
+        a = i * 0.15
+        cv2.circle(frame, (int(cx + 0.85 * r * np.cos(a)), int(cy + 0.85 * r * np.sin(a))), 5, (255, 255, 255), -1)
+        wa = i * 0.05
+        cv2.circle(frame, (int(cx + 0.6 * r * np.cos(wa)), int(cy + 0.6 * r * np.sin(wa))), 5, (0, 200, 0), -1)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+def result(spinning, found=True, prediction=-1, finished=None):
+    return FrameResult(1, 2, None, None, 50.0, prediction, 0.0, 0.0, spinning, finished, None, found, False)
+
+
+class TestHeadlessTracker:
+    def test_no_screen_capture(self):
+        with patch('main.mss.mss', side_effect=RuntimeError("no display")):
+            tracker = headless_tracker(320, 240)
+        assert tracker.sct is None
+        assert tracker.capture_rect() == {'top': 0, 'left': 0, 'width': 320, 'height': 240}
+
+
+class TestSpinRecorder:
+    def test_summarizes_finished_and_unfinished_spins(self):
+        spins = SpinRecorder()
+        assert spins.add(0, 0.0, result(False)) is None
+        assert spins.add(1, 0.1, result(True, found=False)) is None
+        assert spins.add(2, 0.2, result(True, prediction=17)) is None
+        summary = spins.add(3, 0.3, result(False, finished={'number': 5, 'predicted': 17, 'actual': 5}))
+        assert summary['start_frame'] == 1 and summary['end_frame'] == 3 and summary['frames'] == 3
+        assert summary['ball_found_rate'] == pytest.approx(2 / 3)
+        assert summary['prediction'] == 17 and summary['prediction_frame'] == 2
+        assert summary['finished'] and summary['number'] == 5
+
+        spins.add(4, 0.4, result(True))
+        assert spins.close(5, 0.5)['finished'] is False
+        assert spins.close(5, 0.5) is None
+        assert [s['spin'] for s in spins.spins] == [0, 1]
+
+
+class TestVideoReplay:
+    def test_streams_every_frame(self, tmp_path):
+        video = write_video(tmp_path / 'spin.avi')
+        with patch('main.mss.mss', side_effect=RuntimeError("no display")):
+            replay = VideoReplay(video)
+        events = list(replay)
+        frames = [e for e in events if e[0] == 'frame']
+        assert [e[1] for e in frames] == list(range(40))
+        assert frames[3][2] == pytest.approx(3 / 30)
+        assert sum(e[3].ball_found for e in frames) > 20
+        assert replay.summary()['frames'] == 40 and replay.summary()['realtime_factor'] > 0
+
+    def test_run_writes_json_lines(self, tmp_path):
+        video = write_video(tmp_path / 'spin.avi', frames=10)
+        with patch('main.mss.mss', side_effect=RuntimeError("no display")):
+            replay = VideoReplay(video, max_frames=6)
+        out = io.StringIO()
+        summary = replay.run(out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        frames = [r for r in records if r['type'] == 'frame']
+        assert len(frames) == summary['frames'] == 6
+        assert set(FrameResult.KEYS) <= set(frames[0])
+
+    def test_spin_timing_follows_the_video(self, tmp_path):
+        video = write_video(tmp_path / 'spin.avi', frames=150)
+        spins = []
+        for _ in range(2):
+            with patch('main.mss.mss', side_effect=RuntimeError("no display")):
+                replay = VideoReplay(video)
+            spins.append(replay.run()['spins'])
+        spin = spins[0][0]
+        # Predictions are only made 1-3 s into a spin: 30-90 frames of 30 fps footage, however fast it replays
+        assert spin['prediction'] != -1
+        assert 30 <= spin['prediction_frame'] - spin['start_frame'] <= 90
+        assert spins[0] == spins[1]
+
+    def test_missing_video(self, tmp_path):
+        with pytest.raises(IOError):
+            VideoReplay(str(tmp_path / 'missing.mp4'))
@@ -0,0 +1,137 @@
+import pytest
+import sys
+import os
+import time
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import result_reader
+from result_reader import ResultReader, read_pocket_number
+from clock import FrameClock
+
+
+@pytest.fixture
+def monitor_size():
+    return 1280, 720
+
+
+@pytest.fixture
+def tracker(tracker):
+    tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+    return tracker
+
+
+def blank():
+    return np.full((720, 1280, 3), 40, np.uint8)
+
+
+class TestReadPocketNumber:
+    def test_majority_reading(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fake = Mock()
+        fake.image_to_string.side_effect = ['17', '17', 'x', '4'] * 4
+        with patch.object(result_reader, 'TESSERACT_AVAILABLE', True), \
+             patch.object(result_reader, 'pytesseract', fake, create=True):
+            assert read_pocket_number(np.zeros((200, 200, 3), np.uint8)) == 17
+
+    def test_unreadable(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with patch.object(result_reader, 'TESSERACT_AVAILABLE', False):
+            assert read_pocket_number(np.zeros((200, 200, 3), np.uint8)) == -1
+
+
+class TestResultReader:
+    def test_process_pool_read(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        reader = ResultReader()
+        try:
+            future = reader.submit(np.zeros((200, 200, 3), np.uint8))
+            assert future.result(timeout=60) in range(-1, 38)
+        finally:
+            reader.shutdown()
+
+    def test_thread_pool_read(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        reader = ResultReader(threads=True)
+        try:
+            assert reader.submit(None, blank()).result(timeout=10) == -1
+        finally:
+            reader.shutdown()
+
+    def test_inline_read(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        future = ResultReader(processes=False).submit(np.zeros((200, 200, 3), np.uint8), blank())
+        assert future.done() and future.result() in range(-1, 38)
+        # Nothing is saved without a debug directory
+        assert list(tmp_path.iterdir()) == []
+
+    def test_debug_dir_saves_images(self, tmp_path):
+        debug_dir = tmp_path / 'debug'
+        future = ResultReader(processes=False).submit(np.zeros((200, 200, 3), np.uint8), blank(), str(debug_dir))
+        assert future.result() in range(-1, 38)
+        assert sorted(p.name for p in debug_dir.iterdir()) == ['last_spin_result.jpg', 'pocket_roi.jpg']
+
+
+class TestSpinFinishedWhenAnswered:
+    def test_tracking_continues_while_pending(self, tracker):
+        tracker.state, tracker.spin_start_time = "SPINNING", time.time()
+        tracker.final_prediction = 26
+        pending = Future()
+        tracker.pending_result = (pending, 3)
+
+        for _ in range(3):
+            result = tracker.process_frame(blank(), 1 / 60)
+            assert result['spin_finished'] is None
+            assert result['is_spinning']
+
+        pending.set_result(17)
+        result = tracker.process_frame(blank(), 1 / 60)
+        assert result['spin_finished'] == {'number': 17, 'predicted': 26, 'actual': 17}
+        assert tracker.state == "IDLE" and tracker.pending_result is None
+
+    def test_angle_fallback_when_unreadable(self, tracker):
+        tracker.state, tracker.spin_start_time = "SPINNING", time.time()
+        pending = Future()
+        pending.set_result(-1)
+        tracker.pending_result = (pending, 3)
+        result = tracker.process_frame(blank(), 1 / 60)
+        assert result['spin_finished']['actual'] == 3
+
+    def test_settling_timed_by_frame_clock(self, tracker, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        tracker.result_reader = ResultReader(processes=False)
+        tracker.clock = FrameClock(100.0)
+        tracker.state, tracker.spin_start_time = "SPINNING", 100.0
+        # Settling starts once the spin is 1 s old; the result is read 1.5 s of frame time after that
+        for frame in range(200):
+            result = tracker.process_frame(blank(), 1 / 60)
+            if result['spin_finished'] is not None:
+                break
+            tracker.clock.advance(1 / 60)
+        assert tracker.settling_start_time == 0 and tracker.state == "IDLE"
+        assert 150 <= frame <= 152
+
+    def test_debug_mode_saves_to_output_dir(self, tracker, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr('main.DEBUG_OUTPUT_DIR', str(tmp_path / 'debug'))
+        submit = Mock(return_value=Future())
+        tracker.result_reader = Mock(submit=submit)
+        tracker.settling_ball_positions.extend([0.5, 0.52])
+        tracker.submit_result_reading(blank())
+        assert submit.call_args.args[1:] == (None, None)
+
+        tracker.debug_mode = True
+        tracker.submit_result_reading(blank())
+        _, frame, debug_dir = submit.call_args.args
+        assert frame.shape == blank().shape and debug_dir == str(tmp_path / 'debug')
+
+    def test_submit_returns_immediately(self, tracker, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        tracker.result_reader = ResultReader(processes=False)
+        tracker.settling_ball_positions.extend([0.5, 0.52])
+        future, fallback = tracker.submit_result_reading(blank())
+        assert future.done()
+        assert fallback == tracker.angle_pocket(0.51, 0)
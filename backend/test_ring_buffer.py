@@ -0,0 +1,57 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+    def test_keeps_newest_rows_in_order(self):
+        buf = RingBuffer(3, 2)
+        assert not buf and len(buf) == 0
+        for i in range(5):
+            buf.append((i, 10 * i))
+        assert len(buf) == 3
+        assert buf[-1] == (4.0, 40.0) and buf[0] == (2.0, 20.0)
+        np.testing.assert_array_equal(buf.view(), [[2, 20], [3, 30], [4, 40]])
+        assert list(buf) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+
+    def test_view_is_not_a_copy(self):
+        buf = RingBuffer(4)
+        buf.extend([1, 2, 3, 4, 5, 6])
+        view = buf.view()
+        assert np.shares_memory(view, buf._data)
+        assert not view.flags.writeable
+        np.testing.assert_array_equal(buf[-2:], [[5], [6]])
+
+    def test_running_statistics_match_numpy(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(300, 5, size=(1000, 2))
+        buf = RingBuffer(7, 2)
+        for i, value in enumerate(values):
+            buf.append(value)
+            window = values[max(0, i - 6):i + 1]
+            np.testing.assert_allclose(buf.mean(), window.mean(axis=0), rtol=1e-12)
+            np.testing.assert_allclose(buf.std(), window.std(axis=0), rtol=1e-6, atol=1e-9)
+
+    def test_scalar_buffer(self):
+        buf = RingBuffer(60)
+        assert buf.mean() == 0.0
+        buf.extend([1.0, 0.5, 0.0])
+        assert buf.mean() == pytest.approx(0.5)
+        np.testing.assert_array_equal(np.asarray(buf), [1.0, 0.5, 0.0])
+        assert buf[-1] == 0.0
+
+    def test_clear_and_shift(self):
+        buf = RingBuffer(3, 2)
+        buf.extend([(1, 1), (2, 2)])
+        buf.shift((10, -1))
+        assert buf[-1] == (12.0, 1.0)
+        np.testing.assert_allclose(buf.mean(), [11.5, 0.5])
+        buf.clear()
+        assert len(buf) == 0 and buf.view().shape == (0, 2)
+        buf.append((5, 5))
+        assert buf.mean() == (5.0, 5.0)
@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stage_timers import StageTimers
+from replay import headless_tracker
+from synthetic_wheel import spin_frame
+
+
+class TestStageTimers:
+    def test_laps_add_up_per_frame(self):
+        timers = StageTimers(enabled=True)
+        timers.begin()
+        time.sleep(0.002)
+        timers.lap('a')
+        timers.lap('b')
+        time.sleep(0.002)
+        timers.lap('a')
+        timers.end()
+        summary = timers.summary()
+        # Two laps of 'a' in one frame are one sample
+        assert summary['a']['count'] == 1 and summary['a']['p50'] >= 4.0
+        assert summary['b']['p50'] < summary['a']['p50']
+        assert summary['total']['p50'] >= summary['a']['p50']
+
+    def test_percentiles_over_the_rolling_window(self):
+        timers = StageTimers(enabled=True, window=100)
+        for ms in range(1000):
+            timers.record('x', ms / 1000)
+        x = timers.summary()['x']
+        # Only the last 100 samples (900..999 ms) count, max is lifetime
+        assert x['count'] == 1000
+        assert x['p50'] == pytest.approx(np.percentile(np.arange(900, 1000), 50))
+        assert x['p99'] == pytest.approx(np.percentile(np.arange(900, 1000), 99))
+        assert x['max'] == pytest.approx(999)
+        assert 'x' in timers.report()
+
+    def test_disabled_stage_records_nothing(self):
+        timers = StageTimers()
+        with timers.stage('x'):
+            pass
+        assert timers.summary() == {}
+        timers.enabled = True
+        with timers.stage('x'):
+            pass
+        assert timers.summary()['x']['count'] == 1
+
+    def test_process_frame_stages(self):
+        tracker = headless_tracker(640, 480)
+        for i in range(5):
+            tracker.process_frame(spin_frame(i), 1 / 60)
+        assert tracker.timers.summary() == {}
+
+        tracker.timers.enabled = True
+        for i in range(5, 25):
+            tracker.process_frame(spin_frame(i), 1 / 60)
+        summary = tracker.timers.summary()
+        for stage in ['warp', 'calibration', 'hsv', 'zero', 'mog2', 'morphology', 'ball_contours', 'tracking', 'total']:
+            assert summary[stage]['count'] == 20
+        assert summary['total']['mean'] >= summary['mog2']['mean']
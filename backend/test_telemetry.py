@@ -0,0 +1,128 @@
+import pytest
+import sys
+import os
+import asyncio
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import telemetry
+from frame_result import FrameResult
+from telemetry import TelemetryHub, telemetry_payload, KEYFRAME_INTERVAL
+
+
+def result(seq=0, ball=(100, 120), confidence=80.04, prediction=-1, finished=None):
+    return FrameResult(ball[0], ball[1], 50, 60, confidence, prediction, 12.34, 45.67, True, finished,
+                       np.full(37, 1 / 37), True, True, seq=seq, latency=0.0123)
+
+
+class FakeSio:
+    def __init__(self):
+        self.sent = []
+
+    async def emit(self, event, data, to=None):
+        self.sent.append((event, data, to))
+
+
+def hub_with(*sids, **options):
+    hub = TelemetryHub(FakeSio())
+    for sid in sids:
+        hub.add_client(sid)
+        hub.configure(sid, dict({'max_hz': 60}, **options))
+    return hub
+
+
+class TestTelemetryPayload:
+    def test_plain_rounded_fields(self):
+        payload = telemetry_payload(result(seq=5), True)
+        assert payload['seq'] == 5
+        assert payload['ball_coords'] == [100, 120]
+        assert payload['confidence'] == 80.0
+        assert payload['wheel_rpm'] == 12.3
+        assert payload['latency_ms'] == 12.3
+        assert payload['calibrated'] is True
+        assert len(payload['pocket_probabilities']) == 37
+        assert telemetry_payload(result(ball=(None, None)), False)['ball_coords'] is None
+
+
+class TestTelemetryHub:
+    def test_publish_before_bind_is_a_noop(self):
+        hub = TelemetryHub(FakeSio())
+        hub.publish(result(), False)
+        assert hub.published == 0
+
+    @pytest.mark.asyncio
+    async def test_delta_stream_with_keyframes(self, monkeypatch):
+        monkeypatch.setattr(telemetry.time, 'monotonic', iter(range(10, 10000)).__next__)
+        hub = hub_with('a', delta=True)
+        await hub.broadcast(result(seq=0), True)
+        await hub.broadcast(result(seq=1, ball=(101, 120)), True)
+        (first, full, _), (second, delta, _) = hub.sio.sent
+        assert first == 'prediction_update' and full['seq'] == 0
+        assert second == 'prediction_delta'
+        assert delta == {'seq': 1, 'ball_coords': [101, 120]}
+
+        for seq in range(2, KEYFRAME_INTERVAL + 2):
+            await hub.broadcast(result(seq=seq), True)
+        assert hub.sio.sent[-1][0] == 'prediction_update'
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_per_client(self, monkeypatch):
+        # 100 ms between frames: 'a' (60 Hz) gets each one, 'b' (1 Hz) only the first
+        monkeypatch.setattr(telemetry.time, 'monotonic', iter(np.arange(10, 20, 0.1)).__next__)
+        hub = hub_with('a', 'b')
+        hub.configure('b', {'max_hz': 1})
+        for seq in range(5):
+            await hub.broadcast(result(seq=seq), False)
+        sent_to = [to for _, _, to in hub.sio.sent]
+        assert sent_to.count('b') == 1
+        assert sent_to.count('a') == 5
+        assert hub.throttled > 0
+
+    @pytest.mark.asyncio
+    async def test_msgpack_encoded_once_per_format(self):
+        msgpack = pytest.importorskip('msgpack')
+        hub = hub_with('a', 'b', format='msgpack')
+        await hub.broadcast(result(seq=3), False)
+        (_, data_a, _), (_, data_b, _) = hub.sio.sent
+        assert data_a is data_b
+        assert msgpack.unpackb(data_a)['seq'] == 3
+
+    @pytest.mark.asyncio
+    async def test_broadcaster_drains_queue_from_another_thread(self):
+        hub = TelemetryHub(FakeSio(), queue_size=2, board_info=lambda: {'center': [1, 2]})
+        hub.bind(asyncio.get_running_loop())
+        hub.add_client('a')
+        finished = {'number': 7, 'predicted': 7, 'actual': 7}
+        # Three results into a queue of two, from the vision thread
+        await asyncio.to_thread(lambda: [hub.publish(result(seq=i, finished=finished if i == 2 else None), True)
+                                         for i in range(3)])
+        task = asyncio.create_task(hub.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        events = [event for event, _, _ in hub.sio.sent]
+        assert hub.dropped == 1
+        assert events.count('board_detected') == 1
+        assert events.count('spin_finished') == 1
+        assert hub.sio.sent[-1][1]['seq'] == 2
+
+    @pytest.mark.asyncio
+    async def test_one_shot_events_survive_dropped_frames(self):
+        hub = TelemetryHub(FakeSio(), queue_size=2, board_info=lambda: {'center': [1, 2]})
+        hub.bind(asyncio.get_running_loop())
+        hub.add_client('a')
+        finished = {'number': 7, 'predicted': 3, 'actual': 7}
+        # Calibration locks and the spin finishes on the oldest frame, which the update queue drops
+        await asyncio.to_thread(lambda: [hub.publish(result(seq=i, finished=finished if i == 0 else None), True)
+                                         for i in range(6)])
+        task = asyncio.create_task(hub.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        events = [(event, data) for event, data, _ in hub.sio.sent]
+        assert hub.dropped == 4
+        assert events[:2] == [('board_detected', {'center': [1, 2]}), ('spin_finished', finished)]
+        assert [data['seq'] for event, data in events if event == 'prediction_update'] == [5]
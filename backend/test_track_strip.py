@@ -0,0 +1,60 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from track_strip import TrackStripDetector
+from synthetic_wheel import wheel_frame
+
+
+@pytest.fixture
+def monitor_size():
+    return 1280, 720
+
+
+class TestTrackStripDetector:
+    @pytest.mark.parametrize('angle', [0.3, 2.0, -1.2, np.pi - 0.01, -np.pi + 0.01])
+    def test_angle_and_distance(self, angle):
+        detector = TrackStripDetector()
+        assert detector.detect(wheel_frame(), (640, 360), 200) is None
+        ba, dist, x, y = detector.detect(wheel_frame(angle), (640, 360), 200)
+        assert abs((ba - angle + np.pi) % (2 * np.pi) - np.pi) < 0.02
+        assert abs(dist - 170) < 3
+        assert np.hypot(x - (640 + 170 * np.cos(angle)), y - (360 + 170 * np.sin(angle))) < 4
+
+    def test_no_ball(self):
+        detector = TrackStripDetector()
+        for _ in range(3):
+            assert detector.detect(wheel_frame(), (640, 360), 200) is None
+
+    def test_maps_cached_until_calibration_changes(self):
+        detector = TrackStripDetector()
+        detector.configure((640, 360), 200, (720, 1280, 3))
+        map1 = detector.map1
+        detector.configure((640, 360), 200, (720, 1280, 3))
+        assert detector.map1 is map1
+        detector.configure((640, 360), 180, (720, 1280, 3))
+        assert detector.map1 is not map1
+
+
+class TestStripInTracker:
+    def test_strip_matches_mog2(self, tracker):
+        tracker.calibrated, tracker.center, tracker.radius = True, (640, 360), 200
+        tracker.ball_detector = 'strip'
+        found = 0
+        for i in range(30):
+            result = tracker.process_frame(wheel_frame(i * 0.12), 1 / 60)
+            if result['ball_found']:
+                found += 1
+                expected = (640 + 170 * np.cos(i * 0.12), 360 + 170 * np.sin(i * 0.12))
+                assert np.hypot(result['ball_coords'][0] - expected[0], result['ball_coords'][1] - expected[1]) < 5
+        assert found >= 28
+        assert tracker.ball_speed > 0.05
+
+    def test_uncalibrated_falls_back_to_mog2(self, tracker):
+        tracker.ball_detector = 'strip'
+        tracker.process_frame(np.full((720, 1280, 3), 40, np.uint8), 1 / 60)
+        assert not tracker.calibrated
+        assert tracker.track_strip.map1 is None
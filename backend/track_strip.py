@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+# Ball track band (in radii of the calibrated wheel) unwrapped into the strip
+STRIP_INNER, STRIP_OUTER = 0.7, 1.05
+# Angle samples around the wheel (0.5 degree each)
+STRIP_ANGLES = 720
+# Radial samples are ~1 px apart, clamped to this range
+STRIP_MIN_ROWS, STRIP_MAX_ROWS = 8, 64
+
+# Pixels must be this much brighter than the track background to count as ball
+STRIP_THRESHOLD = 40
+# ...and at least this many of them around the peak
+STRIP_MIN_PIXELS = 4
+# Columns either side of the peak used for the sub-sample centroid
+STRIP_WINDOW = 4
+# Background adaptation rate
+STRIP_ALPHA = 0.05
+
+
+class TrackStripDetector:
+    """
+    Finds the ball on a polar-unwrapped strip of the ball track.
+    Rows are radii, columns are angles, so the ball shows up as a 1-D peak
+    along the angle axis and its (angle, distance) come straight from the
+    peak's position -- no contours, arctan2 or sqrt.
+    """
+
+    def __init__(self, inner=STRIP_INNER, outer=STRIP_OUTER, n_angles=STRIP_ANGLES):
+        self.inner = inner
+        self.outer = outer
+        self.n_angles = n_angles
+        self.angles = -np.pi + np.arange(n_angles) * (2 * np.pi / n_angles)
+        self.radii = None
+        self.map1 = None
+        self.map2 = None
+        self.background = None
+        self._key = None
+
+    def configure(self, center, radius, frame_shape, homography=None):
+        """
+        Precompute the remap tables; only rebuilt when the calibration or frame size changes.
+        `center`/`radius` are in flat-wheel coordinates; with `homography` (flat -> frame
+        pixels from the frame) the strip samples the unwarped frame through it.
+        """
+        key = (tuple(center), radius, frame_shape[:2], None if homography is None else homography.tobytes())
+        if key == self._key:
+            return
+        cx, cy = center
+        r0, r1 = radius * self.inner, radius * self.outer
+        rows = int(np.clip(r1 - r0, STRIP_MIN_ROWS, STRIP_MAX_ROWS))
+        self.radii = np.linspace(r0, r1, rows)
+
+        map_x = (cx + np.outer(self.radii, np.cos(self.angles))).astype(np.float32)
+        map_y = (cy + np.outer(self.radii, np.sin(self.angles))).astype(np.float32)
+        if homography is not None:
+            src = cv2.perspectiveTransform(np.dstack([map_x, map_y]).reshape(-1, 1, 2), np.linalg.inv(homography))
+            map_x, map_y = (np.ascontiguousarray(src[:, 0, i].reshape(map_x.shape)) for i in (0, 1))
+        self.map1, self.map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        self.background = None
+        self._key = key
+
+    def unwrap(self, frame):
+        """Grayscale (radius x angle) strip of the ball track"""
+        strip = cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        if strip.ndim == 3:
+            strip = cv2.cvtColor(strip, cv2.COLOR_BGR2GRAY)
+        return strip
+
+    def detect(self, frame, center, radius, homography=None):
+        """
+        Returns (ball_angle, distance, x, y) in flat-wheel coordinates, or None.
+        The angle follows the arctan2(y - cy, x - cx) convention used elsewhere.
+        """
+        self.configure(center, radius, frame.shape, homography)
+        strip = self.unwrap(frame)
+        if self.background is None:
+            self.background = strip.astype(np.float32)
+            return None
+
+        foreground = strip - self.background
+        cv2.accumulateWeighted(strip, self.background, STRIP_ALPHA)
+        np.maximum(foreground, 0, out=foreground)
+
+        profile = foreground.max(axis=0)
+        peak = int(np.argmax(profile))
+        if profile[peak] < STRIP_THRESHOLD:
+            return None
+
+        # Window around the peak, wrapping across the -pi/pi seam
+        offsets = np.arange(-STRIP_WINDOW, STRIP_WINDOW + 1)
+        window = foreground[:, (peak + offsets) % self.n_angles]
+        window[window < STRIP_THRESHOLD] = 0
+        if np.count_nonzero(window) < STRIP_MIN_PIXELS:
+            return None
+
+        total = window.sum()
+        step = 2 * np.pi / self.n_angles
+        ba = self.angles[peak] + step * float(window.sum(axis=0) @ offsets) / total
+        ba = (ba + np.pi) % (2 * np.pi) - np.pi
+        dist = float(window.sum(axis=1) @ self.radii) / total
+
+        cx, cy = center
+        return ba, dist, cx + dist * np.cos(ba), cy + dist * np.sin(ba)